@@ -7,9 +7,12 @@ from pathlib import Path
 from textual.app import App
 
 from pelican_installer.screens import (
+    CacheScreen,
     DomainScreen,
     InstallScreen,
     MenuScreen,
+    OctaneScreen,
+    ProfileScreen,
     ProtocolScreen,
     SSLScreen,
     SummaryScreen,
@@ -79,13 +82,75 @@ class PelicanInstallerApp(App[None]):
 
     def _handle_webserver_result(self, result: str) -> None:
         """Handle result from webserver selection."""
+        if result == "profile":
+            self.push_screen(
+                ProfileScreen(self.state),
+                self._handle_profile_result,
+            )
+        elif result == "octane":
+            self.push_screen(
+                OctaneScreen(self.state),
+                self._handle_octane_result,
+            )
+        elif result == "back":
+            self._show_menu()
+
+    def _handle_octane_result(self, result: str) -> None:
+        """Handle result from Octane server selection."""
+        if result == "front":
+            self.push_screen(
+                WebserverScreen(self.state, front=True),
+                self._handle_front_result,
+            )
+        elif result == "back":
+            self.push_screen(
+                WebserverScreen(self.state),
+                self._handle_webserver_result,
+            )
+
+    def _handle_front_result(self, result: str) -> None:
+        """Handle result from selecting the webserver in front of Octane."""
+        if result == "profile":
+            self.push_screen(
+                ProfileScreen(self.state),
+                self._handle_profile_result,
+            )
+        elif result == "back":
+            self.push_screen(
+                OctaneScreen(self.state),
+                self._handle_octane_result,
+            )
+
+    def _handle_profile_result(self, result: str) -> None:
+        """Handle result from profile selection."""
+        if result == "cache":
+            self.push_screen(
+                CacheScreen(self.state),
+                self._handle_cache_result,
+            )
+        elif result == "back" and self.state.uses_octane():
+            self.push_screen(
+                WebserverScreen(self.state, front=True),
+                self._handle_front_result,
+            )
+        elif result == "back":
+            self.push_screen(
+                WebserverScreen(self.state),
+                self._handle_webserver_result,
+            )
+
+    def _handle_cache_result(self, result: str) -> None:
+        """Handle result from cache server selection."""
         if result == "protocol":
             self.push_screen(
                 ProtocolScreen(self.state),
                 self._handle_protocol_result,
             )
         elif result == "back":
-            self._show_menu()
+            self.push_screen(
+                ProfileScreen(self.state),
+                self._handle_profile_result,
+            )
 
     def _handle_protocol_result(self, result: str) -> None:
         """Handle result from protocol selection."""
@@ -96,8 +161,8 @@ class PelicanInstallerApp(App[None]):
             )
         elif result == "back":
             self.push_screen(
-                WebserverScreen(self.state),
-                self._handle_webserver_result,
+                CacheScreen(self.state),
+                self._handle_cache_result,
             )
 
     def _handle_domain_result(self, result: str) -> None:
@@ -0,0 +1,160 @@
+"""Apt transaction planning and package list freshness."""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class AptRepository:
+    """Third-party apt repository that must be added before installing."""
+
+    name: str
+    key_url: str
+    source_url: str
+
+    @property
+    def keyring(self) -> Path:
+        """Path of the dearmored signing key."""
+        return Path(f"/usr/share/keyrings/{self.name}-archive-keyring.gpg")
+
+    @property
+    def source_list(self) -> Path:
+        """Path of the apt source list for this repository."""
+        return Path(f"/etc/apt/sources.list.d/{self.name}.list")
+
+    def is_configured(self) -> bool:
+        """Check if the repository has already been added."""
+        return self.keyring.exists() and self.source_list.exists()
+
+
+CADDY_REPOSITORY = AptRepository(
+    name="caddy-stable",
+    key_url="https://dl.cloudsmith.io/public/caddy/stable/gpg.key",
+    source_url="https://dl.cloudsmith.io/public/caddy/stable/debian.deb.txt",
+)
+
+
+@dataclass
+class AptPlan:
+    """Full set of apt work for an install, resolved before anything runs."""
+
+    # Packages needed to add the repositories (installed in a separate,
+    # usually empty, bootstrap transaction)
+    prerequisites: list[str] = field(default_factory=list)
+
+    # Repositories to add before the main transaction
+    repositories: list[AptRepository] = field(default_factory=list)
+
+    # Packages installed in the single main transaction
+    packages: list[str] = field(default_factory=list)
+
+    # Commands to run once the main transaction has finished
+    post_install: list[list[str]] = field(default_factory=list)
+
+    def add(self, *packages: str) -> None:
+        """Add packages to the main transaction, keeping order and skipping duplicates."""
+        for package in packages:
+            if package not in self.packages:
+                self.packages.append(package)
+
+    def add_repository(self, repository: AptRepository) -> None:
+        """Add a repository unless it is already planned."""
+        if repository not in self.repositories:
+            self.repositories.append(repository)
+
+    def is_empty(self) -> bool:
+        """Check if the plan has no apt work left to do."""
+        return not (self.prerequisites or self.repositories or self.packages)
+
+
+class AptListsPolicy:
+    """Decide when ``apt-get update`` can be skipped.
+
+    Package lists are fresh when the last full update is younger than
+    ``max_age`` seconds and no source list was modified after it. The last
+    full update is the later of the update-success stamp and the oldest file
+    in ``/var/lib/apt/lists``: updating a single source only refreshes its
+    own lists, so the newest list says nothing about the others.
+    """
+
+    LISTS_DIR = Path("/var/lib/apt/lists")
+    UPDATE_STAMP = Path("/var/lib/apt/periodic/update-success-stamp")
+    SOURCE_LIST = Path("/etc/apt/sources.list")
+    SOURCE_PARTS = Path("/etc/apt/sources.list.d")
+
+    def __init__(self, max_age: int = 3600):
+        """
+        Initialize policy.
+
+        Args:
+            max_age: Maximum age of the package lists in seconds
+        """
+        self.max_age = max_age
+
+    def last_update(self) -> float | None:
+        """Get the time of the last full update, or None if never updated."""
+        lists = []
+        try:
+            with os.scandir(self.LISTS_DIR) as entries:
+                lists.extend(
+                    self._mtime(Path(entry.path))
+                    for entry in entries
+                    if entry.is_file(follow_symlinks=False) and entry.name != "lock"
+                )
+        except OSError:
+            pass
+        lists = [m for m in lists if m is not None]
+        mtimes = [self._mtime(self.UPDATE_STAMP), min(lists) if lists else None]
+        mtimes = [m for m in mtimes if m is not None]
+        return max(mtimes) if mtimes else None
+
+    def is_fresh(self) -> bool:
+        """Check if the package lists are recent enough to skip an update."""
+        last_update = self.last_update()
+        if last_update is None or time.time() - last_update > self.max_age:
+            return False
+        return all(
+            (self._mtime(source) or 0) <= last_update for source in self._source_files()
+        )
+
+    def stamp_time(self) -> float | None:
+        """Get the mtime of the update-success stamp, or None if there is none."""
+        return self._mtime(self.UPDATE_STAMP)
+
+    def update_command(self) -> list[str]:
+        """Command that refreshes every configured source."""
+        return ["apt-get", "update"]
+
+    def source_update_command(self, source_list: Path) -> list[str]:
+        """Command that indexes a single source list, keeping all other lists."""
+        return [
+            "apt-get",
+            "update",
+            "-o",
+            f"Dir::Etc::sourcelist={source_list}",
+            "-o",
+            "Dir::Etc::sourceparts=-",
+            "-o",
+            "APT::Get::List-Cleanup=0",
+        ]
+
+    def _source_files(self) -> list[Path]:
+        """List all apt source files."""
+        sources = [self.SOURCE_LIST]
+        if self.SOURCE_PARTS.is_dir():
+            sources.extend(
+                p for p in self.SOURCE_PARTS.iterdir() if p.suffix in (".list", ".sources")
+            )
+        return sources
+
+    @staticmethod
+    def _mtime(path: Path) -> float | None:
+        """Get a file's mtime, or None if it does not exist."""
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
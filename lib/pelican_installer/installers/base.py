@@ -2,22 +2,55 @@
 
 from __future__ import annotations
 
+import contextlib
 import os
+import shutil
 import subprocess
-from typing import Callable
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+from pelican_installer.installers.config import ConfigWriter
+from pelican_installer.installers.fileops import FileOps
+from pelican_installer.installers.process import AsyncCommandRunner
+from pelican_installer.installers.scheduler import InstallTask, TaskScheduler
+from pelican_installer.utils.cache import ArtifactCache
+from pelican_installer.utils.download import DownloadError, Downloader, DownloadResult
+from pelican_installer.utils.journal import CheckpointJournal
+from pelican_installer.utils.packages import PackageIndex
 
 
 class BaseInstaller:
     """Base class for all installers."""
 
-    def __init__(self, progress_callback: Callable[[int, str], None] | None = None):
+    # Commands that change the dpkg database and invalidate the package index
+    PACKAGE_MANAGER_COMMANDS = ("apt-get", "apt", "dpkg")
+
+    # Where downloads are staged (partial files survive for resuming)
+    DOWNLOAD_DIR = Path("/var/cache/pelican-installer/downloads")
+
+    def __init__(
+        self,
+        progress_callback: Callable[[int, str], None] | None = None,
+        output_callback: Callable[[str], None] | None = None,
+        runner: AsyncCommandRunner | None = None,
+        cache: ArtifactCache | None = None,
+    ):
         """
         Initialize installer.
 
         Args:
             progress_callback: Function to call with (progress, status_message)
+            output_callback: Function to call with each line of streamed command output
+            runner: Command runner shared between installers
+            cache: Artifact cache shared between installers
         """
         self.progress_callback = progress_callback
+        self.output_callback = output_callback
+        self.runner = runner or AsyncCommandRunner()
+        self.downloader = Downloader()
+        self.cache = cache or ArtifactCache()
+        self.files = FileOps.shared()
+        self.configs = ConfigWriter.shared()
         self._current_progress = 0
 
     def update_progress(self, progress: int, message: str) -> None:
@@ -26,6 +59,31 @@ class BaseInstaller:
         if self.progress_callback:
             self.progress_callback(progress, message)
 
+    def run_tasks(
+        self,
+        tasks: list[InstallTask],
+        journal: CheckpointJournal | None = None,
+        converge: bool = False,
+    ) -> None:
+        """
+        Run installer tasks through the scheduler, reporting progress.
+
+        Args:
+            tasks: Tasks to run
+            journal: Journal used to skip steps completed by an earlier run
+            converge: Whether to skip steps that are already satisfied
+        """
+
+        def on_update(progress: int, active: list[InstallTask]) -> None:
+            if active:
+                self.update_progress(progress, ", ".join(t.label for t in active) + "...")
+
+        TaskScheduler(tasks, on_update=on_update, journal=journal, converge=converge).run()
+
+    def apply_config_changes(self) -> None:
+        """Run the service checks and reloads queued by config changes, once each."""
+        self.configs.flush(lambda cmd: self.run_command(cmd, use_sudo=True))
+
     def run_command(
         self,
         cmd: list[str],
@@ -33,16 +91,23 @@ class BaseInstaller:
         capture: bool = True,
         check: bool = True,
         shell: bool = False,
+        stream: bool = False,
+        cwd: str | None = None,
     ) -> subprocess.CompletedProcess:
         """
         Run a system command.
 
+        Thin synchronous wrapper around run_command_async.
+
         Args:
             cmd: Command and arguments
             use_sudo: Whether to prepend sudo
             capture: Whether to capture output
             check: Whether to raise on non-zero exit
             shell: Whether to run in shell
+            stream: Whether to stream output line by line to output_callback,
+                keeping only the trailing lines (capture is ignored)
+            cwd: Working directory for the command
 
         Returns:
             CompletedProcess object
@@ -50,38 +115,185 @@ class BaseInstaller:
         Raises:
             subprocess.CalledProcessError: If command fails and check=True
         """
+        return self.runner.run_sync(
+            self.run_command_async(
+                cmd,
+                use_sudo=use_sudo,
+                capture=capture,
+                check=check,
+                shell=shell,
+                stream=stream,
+                cwd=cwd,
+            )
+        )
+
+    async def run_command_async(
+        self,
+        cmd: list[str] | str,
+        use_sudo: bool = False,
+        capture: bool = True,
+        check: bool = True,
+        shell: bool = False,
+        stream: bool = False,
+        cwd: str | None = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a system command without blocking the event loop.
+
+        run_command is built on this. Independent steps overlap as
+        scheduler tasks, and the runner bounds how many of their commands
+        run at once.
+
+        Takes the same arguments as run_command.
+        """
         if use_sudo and os.geteuid() != 0:
             if isinstance(cmd, list):
                 cmd = ["sudo"] + cmd
             else:
                 cmd = f"sudo {cmd}"
 
-        kwargs = {
-            "check": check,
-            "capture_output": capture,
-            "text": True,
-            "shell": shell,
-        }
+        try:
+            return await self.runner.run(
+                cmd,
+                capture=capture,
+                check=check,
+                shell=shell,
+                stream=stream,
+                line_sink=self.output_callback,
+                cwd=cwd,
+            )
+        finally:
+            if self._changes_packages(cmd):
+                PackageIndex.invalidate()
 
-        return subprocess.run(cmd, **kwargs)
+    def _changes_packages(self, cmd: list[str] | str) -> bool:
+        """Check if a command may modify the set of installed packages."""
+        if isinstance(cmd, str):
+            return any(tool in cmd for tool in self.PACKAGE_MANAGER_COMMANDS)
+        args = cmd[1:] if cmd and cmd[0] == "sudo" else cmd
+        return bool(args) and args[0] in self.PACKAGE_MANAGER_COMMANDS
 
-    def check_package_installed(self, package: str) -> bool:
-        """Check if a package is installed via dpkg."""
+    def download(
+        self,
+        url: str,
+        dest: Path,
+        checksum: str | None = None,
+        hash_name: str = "sha256",
+    ) -> DownloadResult:
+        """
+        Download a file in-process, resuming and verifying it.
+
+        Args:
+            url: URL to download
+            dest: Destination path
+            checksum: Expected hex digest; verification is skipped if None
+            hash_name: hashlib algorithm of the checksum
+
+        Returns:
+            Result with size and digest of the file
+
+        Raises:
+            DownloadError: If the download fails or the checksum does not match
+        """
+        return self.downloader.download(url, dest, checksum=checksum, hash_name=hash_name)
+
+    def fetch_artifact(
+        self,
+        url: str,
+        name: str,
+        key: str | None = None,
+        sha256: str | None = None,
+    ) -> Path:
+        """
+        Get a release artifact from the cache, downloading it on a miss.
+
+        Args:
+            url: URL to download from
+            name: File name used while downloading
+            key: Cache key naming the release (``repo@tag/asset``); without
+                one the artifact is downloaded but not cached
+            sha256: Expected SHA-256 digest of the artifact
+
+        Returns:
+            Path of the artifact; only files outside the cache are owned by
+            the caller
+
+        Raises:
+            DownloadError: If the download fails or the checksum does not match
+        """
+        if key is not None:
+            cached = self.cache.get(key, sha256)
+            if cached is not None:
+                return cached
+
+        result = self.download(url, self.DOWNLOAD_DIR / name, checksum=sha256)
+        if key is None:
+            return result.path
+        return self.cache.put(key, result.path, result.digest)
+
+    @contextlib.contextmanager
+    def stream_artifact(
+        self,
+        url: str,
+        name: str,
+        key: str | None = None,
+        sha256: str | None = None,
+    ) -> Iterator[tuple[BinaryIO, int | None]]:
+        """
+        Read a release artifact as a stream, from the cache or the network.
+
+        On a miss the response is copied aside while it is read. It is
+        verified and cached when the block exits; if verification fails,
+        DownloadError is raised there, so anything built from the stream
+        must only be committed after the block.
+
+        Args:
+            url: URL to download from
+            name: File name used while downloading
+            key: Cache key naming the release (``repo@tag/asset``)
+            sha256: Expected SHA-256 digest of the artifact
+
+        Yields:
+            Readable stream and its total size in bytes (None if unknown)
+
+        Raises:
+            DownloadError: If the download fails or the checksum does not match
+        """
+        if key is not None:
+            cached = self.cache.get(key, sha256)
+            if cached is not None:
+                with open(cached, "rb") as f:
+                    yield f, cached.stat().st_size
+                return
+
+        copy = self.DOWNLOAD_DIR / f"{name}.stream"
+        copy.parent.mkdir(parents=True, exist_ok=True)
         try:
-            result = self.run_command(
-                ["dpkg", "-s", package],
-                capture=True,
-                check=False,
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+            with open(copy, "wb") as sink:
+                stream = self.downloader.stream(url, sink=sink)
+                try:
+                    yield stream, stream.length
+                    stream.drain()
+                finally:
+                    stream.close()
+
+            digest = stream.hexdigest()
+            if sha256 is not None and digest != sha256.lower():
+                raise DownloadError(f"Checksum mismatch for {url}: expected {sha256}, got {digest}")
+            if key is not None:
+                self.cache.put(key, copy, digest)
+        finally:
+            copy.unlink(missing_ok=True)
+
+    def check_package_installed(self, package: str) -> bool:
+        """Check if a package is installed (answered from the dpkg status index)."""
+        return PackageIndex.is_installed(package)
+
+    def get_package_version(self, package: str) -> str | None:
+        """Get the installed version of a package, or None if not installed."""
+        return PackageIndex.version(package)
 
     def check_command_exists(self, command: str) -> bool:
         """Check if a command exists in PATH."""
-        try:
-            self.run_command(["which", command], capture=True, check=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        return shutil.which(command) is not None
 
@@ -0,0 +1,199 @@
+"""Rendering and writing of service configuration files."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import string
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable
+
+from pelican_installer.installers.fileops import FileOps
+from pelican_installer.utils.files import file_has_content, with_hash_header
+
+# Actions queued by config changes, run once by ConfigWriter.flush()
+DAEMON_RELOAD = "daemon-reload"
+
+
+def reload_action(service: str) -> str:
+    """Action reloading a service."""
+    return f"reload:{service}"
+
+
+def restart_action(service: str) -> str:
+    """Action restarting a service."""
+    return f"restart:{service}"
+
+
+class ConfigTemplate(string.Template):
+    """Config file template with ``$name`` placeholders (``$$`` for a literal ``$``).
+
+    Templates are compiled once when defined, so rendering is a single
+    substitution pass.
+    """
+
+    def render(self, **values: object) -> str:
+        """
+        Render the template.
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        return self.substitute(values)
+
+
+class ConfigWriter:
+    """Write config files only when they change and coalesce service reloads.
+
+    Each write names the actions its change requires (``daemon-reload``,
+    ``reload:<service>``, ``restart:<service>``). Unchanged files are left
+    alone and queue nothing. Queued actions are persisted, so a failed run
+    still applies them on the next attempt, and run once by :meth:`flush`.
+    Installers share one writer per process, since they share its state file.
+    """
+
+    _shared: ConfigWriter | None = None
+    _shared_lock = threading.Lock()
+
+    DEFAULT_STATE_PATH = Path("/var/lib/pelican-installer/pending-actions.json")
+
+    # Syntax checks run before a service is reloaded or restarted
+    CHECKS = {
+        "nginx": ["nginx", "-t"],
+        "apache2": ["apache2ctl", "configtest"],
+    }
+
+    def __init__(self, files: FileOps, state_path: Path = DEFAULT_STATE_PATH):
+        """
+        Initialize writer.
+
+        Args:
+            files: File operations used to write configs
+            state_path: Where queued actions are persisted
+        """
+        self.files = files
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._pending = self._load()
+
+    @classmethod
+    def shared(cls) -> ConfigWriter:
+        """Get the instance shared by all installers of this process."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(FileOps.shared())
+            return cls._shared
+
+    def write(
+        self,
+        path: Path,
+        content: str,
+        actions: tuple[str, ...] = (),
+        mode: int = 0o644,
+        header: bool = False,
+    ) -> bool:
+        """
+        Atomically write a config file if its content differs.
+
+        Args:
+            path: Config file
+            content: Rendered content
+            actions: Actions needed when the file changes
+            mode: File mode
+            header: Whether to prefix the content with its hash header
+
+        Returns:
+            True if the file was written
+        """
+        if header:
+            content = with_hash_header(content)
+        if file_has_content(path, content):
+            return False
+        self.files.write_file(path, content, mode=mode)
+        self.queue(*actions)
+        return True
+
+    def queue(self, *actions: str) -> None:
+        """Queue actions to run on flush."""
+        with self._lock:
+            new = [action for action in actions if action not in self._pending]
+            if new:
+                self._pending.extend(new)
+                self._save()
+
+    def pending(self) -> list[str]:
+        """Get the queued actions."""
+        with self._lock:
+            return list(self._pending)
+
+    def flush(self, run: Callable[[list[str]], object]) -> None:
+        """
+        Run queued actions: daemon-reload first, then each service's check
+        followed by its restart or reload.
+
+        Args:
+            run: Function running a command, raising if it fails
+        """
+        with self._lock:
+            actions = list(self._pending)
+        if not actions:
+            return
+
+        if DAEMON_RELOAD in actions:
+            run(["systemctl", "daemon-reload"])
+
+        services: dict[str, str] = {}
+        for action in actions:
+            verb, _, service = action.partition(":")
+            if service and services.get(service) != "restart":
+                services[service] = verb
+        for service, verb in services.items():
+            check = self.check_command(service)
+            if check:
+                run(check)
+            run(["systemctl", verb, service])
+
+        with self._lock:
+            self._pending = [a for a in self._pending if a not in actions]
+            self._save()
+
+    @classmethod
+    def check_command(cls, service: str) -> list[str] | None:
+        """Get the syntax check for a service's configuration, if it has one."""
+        if service in cls.CHECKS:
+            return cls.CHECKS[service]
+        # php8.3-fpm ships php-fpm8.3
+        match = re.fullmatch(r"php([\d.]+)-fpm", service)
+        if match:
+            return [f"php-fpm{match.group(1)}", "-t"]
+        return None
+
+    def _load(self) -> list[str]:
+        """Read actions queued by an earlier, failed run."""
+        try:
+            with open(self.state_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [a for a in data if isinstance(a, str)] if isinstance(data, list) else []
+
+    def _save(self) -> None:
+        """Persist queued actions atomically (removing the file when empty)."""
+        if not self._pending:
+            try:
+                self.state_path.unlink()
+            except FileNotFoundError:
+                pass
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix=".pending-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._pending, f)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
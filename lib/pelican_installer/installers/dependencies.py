@@ -2,7 +2,20 @@
 
 from __future__ import annotations
 
+import contextlib
+from pathlib import Path
+from typing import Callable
+
+from pelican_installer.installers.apt import (
+    CADDY_REPOSITORY,
+    AptListsPolicy,
+    AptPlan,
+    AptRepository,
+)
 from pelican_installer.installers.base import BaseInstaller
+from pelican_installer.installers.process import AsyncCommandRunner
+from pelican_installer.installers.scheduler import APT_LOCK, NETWORK, InstallTask
+from pelican_installer.utils.packages import PackageIndex
 from pelican_installer.utils.state import InstallState
 
 
@@ -22,6 +35,34 @@ class DependencyInstaller(BaseInstaller):
         "intl",
         "sqlite3",
     ]
+    # brotli and zstd precompress the panel's static assets
+    TOOLS = ["curl", "tar", "unzip", "git", "brotli", "zstd"]
+
+    COMPOSER_INSTALLER = "https://getcomposer.org/installer"
+    COMPOSER_INSTALLER_SIG = "https://composer.github.io/installer.sig"
+    DOCKER_INSTALL_SCRIPT = "https://get.docker.com"
+
+    # Package lists younger than this (in seconds) are not refreshed
+    APT_LISTS_MAX_AGE = 3600
+
+    def __init__(
+        self,
+        progress_callback: Callable[[int, str], None] | None = None,
+        output_callback: Callable[[str], None] | None = None,
+        runner: AsyncCommandRunner | None = None,
+        apt_lists_max_age: int = APT_LISTS_MAX_AGE,
+    ):
+        """
+        Initialize installer.
+
+        Args:
+            progress_callback: Function to call with (progress, status_message)
+            output_callback: Function to call with each line of streamed command output
+            runner: Command runner shared between installers
+            apt_lists_max_age: Maximum age of apt package lists in seconds
+        """
+        super().__init__(progress_callback, output_callback, runner)
+        self.apt_lists = AptListsPolicy(max_age=apt_lists_max_age)
 
     def install(self, state: InstallState) -> None:
         """
@@ -30,66 +71,111 @@ class DependencyInstaller(BaseInstaller):
         Args:
             state: Installation state with configuration
         """
+        self.run_tasks(self.tasks(state))
+        self.update_progress(100, "Dependencies installed successfully!")
+
+    def tasks(self, state: InstallState) -> list[InstallTask]:
+        """
+        Declare the dependency installation steps.
+
+        Args:
+            state: Installation state with configuration
+
+        Returns:
+            Tasks named ``deps.*``
+        """
         if state.component == "panel":
-            self._install_panel_dependencies(state)
+            return self._panel_tasks(state)
         elif state.component == "wings":
-            self._install_wings_dependencies()
-
-    def _install_panel_dependencies(self, state: InstallState) -> None:
-        """Install Panel dependencies."""
-        self.update_progress(5, "Checking system requirements...")
+            return self._wings_tasks(state)
+        return []
 
-        # Update package lists
-        self.update_progress(10, "Updating package lists...")
-        self.run_command(["apt-get", "update"], use_sudo=True)
+    def plan_packages(self, state: InstallState) -> AptPlan:
+        """
+        Work out every apt package and repository needed for an install.
 
-        # Install PHP and extensions
-        self.update_progress(25, f"Installing PHP {self.PHP_VERSION}...")
-        php_packages = [f"php{self.PHP_VERSION}"]
-        php_packages.extend([f"php{self.PHP_VERSION}-{ext}" for ext in self.PHP_EXTENSIONS])
+        Args:
+            state: Installation state with configuration
 
-        packages_to_install = []
-        for pkg in php_packages:
-            if not self.check_package_installed(pkg):
-                packages_to_install.append(pkg)
+        Returns:
+            Plan containing only packages that are not installed yet
+        """
+        plan = AptPlan()
 
-        if packages_to_install:
-            self.run_command(
-                ["apt-get", "install", "-y"] + packages_to_install,
-                use_sudo=True,
-            )
+        if state.component == "panel":
+            # PHP and extensions
+            plan.add(f"php{self.PHP_VERSION}")
+            plan.add(*[f"php{self.PHP_VERSION}-{ext}" for ext in self.PHP_EXTENSIONS])
+            if state.runtime == "swoole":
+                plan.add(f"php{self.PHP_VERSION}-swoole")
+            if state.cache_server != "none":
+                # Debian's redis-server and valkey-server include the CLI
+                plan.add(f"{state.cache_server}-server", f"php{self.PHP_VERSION}-redis")
 
-        # Install webserver
-        self.update_progress(50, f"Installing {state.webserver}...")
-        self._install_webserver(state.webserver)
+            # Webserver
+            self._plan_webserver(plan, state.webserver)
 
-        # Install other tools
-        self.update_progress(70, "Installing additional tools...")
-        tools = ["curl", "tar", "unzip", "git"]
-        tools_to_install = [t for t in tools if not self.check_command_exists(t)]
-        if tools_to_install:
-            self.run_command(
-                ["apt-get", "install", "-y"] + tools_to_install,
-                use_sudo=True,
-            )
+            # Other tools (package name matches the command name)
+            plan.add(*[t for t in self.TOOLS if not self.check_command_exists(t)])
 
-        # Install Composer
-        self.update_progress(80, "Installing Composer...")
-        if not self.check_command_exists("composer"):
-            self._install_composer()
+            # Certbot if HTTPS
+            if state.protocol == "https":
+                plan.add(self._certbot_package(state.webserver))
+        elif state.component == "wings":
+            if not self.check_command_exists("curl"):
+                plan.add("curl")
 
-        # Install Certbot if HTTPS
-        if state.protocol == "https":
-            self.update_progress(90, "Installing Certbot...")
-            self._install_certbot(state.webserver)
+        plan.packages = PackageIndex.missing(plan.packages)
+        return plan
 
-        self.update_progress(100, "Dependencies installed successfully!")
+    def _panel_tasks(self, state: InstallState) -> list[InstallTask]:
+        """Declare Panel dependency steps."""
+        return [
+            InstallTask(
+                name="deps.packages",
+                label="Installing system packages",
+                run=lambda: self._apply_plan(self.plan_packages(state)),
+                resources=frozenset({APT_LOCK, NETWORK}),
+                satisfied=lambda: self.plan_packages(state).is_empty(),
+            ),
+            InstallTask(
+                name="deps.composer",
+                label="Installing Composer",
+                run=self._ensure_composer,
+                after=("deps.packages",),
+                resources=frozenset({NETWORK}),
+                satisfied=lambda: self.check_command_exists("composer"),
+            ),
+        ]
 
-    def _install_wings_dependencies(self) -> None:
-        """Install Wings dependencies (Docker)."""
-        self.update_progress(10, "Checking system requirements...")
+    def _wings_tasks(self, state: InstallState) -> list[InstallTask]:
+        """Declare Wings dependency steps (Docker)."""
+        return [
+            InstallTask(
+                name="deps.kernel",
+                label="Checking system requirements",
+                run=self._check_kernel,
+            ),
+            InstallTask(
+                name="deps.packages",
+                label="Installing system packages",
+                run=lambda: self._apply_plan(self.plan_packages(state)),
+                after=("deps.kernel",),
+                resources=frozenset({APT_LOCK, NETWORK}),
+                satisfied=lambda: self.plan_packages(state).is_empty(),
+            ),
+            InstallTask(
+                name="deps.docker",
+                label="Installing Docker",
+                run=self._ensure_docker,
+                after=("deps.packages",),
+                resources=frozenset({APT_LOCK, NETWORK}),
+                satisfied=lambda: self.check_command_exists("docker"),
+            ),
+        ]
 
-        # Check kernel compatibility
+    def _check_kernel(self) -> None:
+        """Check kernel compatibility with Docker."""
         result = self.run_command(["uname", "-r"], capture=True)
         kernel = result.stdout.strip()
         if "-grs-" in kernel or "-mod-std-" in kernel:
@@ -97,104 +183,154 @@ class DependencyInstaller(BaseInstaller):
                 "Kernel not compatible with Docker. Contact your hosting provider."
             )
 
-        # Update package lists
-        self.update_progress(20, "Updating package lists...")
-        self.run_command(["apt-get", "update"], use_sudo=True)
+    def _ensure_composer(self) -> None:
+        """Install Composer unless it is already available."""
+        if not self.check_command_exists("composer"):
+            self._install_composer()
 
-        # Install Docker
-        self.update_progress(40, "Installing Docker...")
+    def _ensure_docker(self) -> None:
+        """Install Docker unless it is already available."""
         if not self.check_command_exists("docker"):
             self._install_docker()
 
-        self.update_progress(100, "Docker installed successfully!")
-
-    def _install_webserver(self, webserver: str) -> None:
-        """Install the selected webserver."""
+    def _plan_webserver(self, plan: AptPlan, webserver: str) -> None:
+        """Add the selected webserver to the plan."""
         if webserver == "nginx":
-            if not self.check_package_installed("nginx"):
-                self.run_command(["apt-get", "install", "-y", "nginx"], use_sudo=True)
+            plan.add("nginx")
         elif webserver == "apache":
-            packages = ["apache2", f"libapache2-mod-php{self.PHP_VERSION}"]
-            to_install = [p for p in packages if not self.check_package_installed(p)]
-            if to_install:
-                self.run_command(["apt-get", "install", "-y"] + to_install, use_sudo=True)
+            # PHP runs in PHP-FPM (proxy_fcgi) rather than mod_php, so
+            # Apache keeps its event MPM; PanelInstaller switches modules
+            if not PackageIndex.is_installed("apache2"):
+                plan.add("apache2")
                 # Enable required Apache modules
-                self.run_command(["a2enmod", "rewrite"], use_sudo=True, check=False)
-                self.run_command(["a2enmod", "ssl"], use_sudo=True, check=False)
+                plan.post_install.append(["a2enmod", "rewrite"])
+                plan.post_install.append(["a2enmod", "ssl"])
         elif webserver == "caddy":
-            if not self.check_package_installed("caddy"):
-                # Caddy requires special installation
-                self.run_command(
-                    ["apt-get", "install", "-y", "debian-keyring", "debian-archive-keyring", "apt-transport-https"],
-                    use_sudo=True,
-                )
-                self.run_command(
-                    [
-                        "bash",
-                        "-c",
-                        "curl -1sLf 'https://dl.cloudsmith.io/public/caddy/stable/gpg.key' | sudo gpg --dearmor -o /usr/share/keyrings/caddy-stable-archive-keyring.gpg",
-                    ],
-                    shell=False,
-                    use_sudo=False,
-                )
+            if not PackageIndex.is_installed("caddy"):
+                # Caddy comes from its own repository
+                plan.add("debian-keyring", "debian-archive-keyring", "apt-transport-https")
+                plan.add("caddy")
+                if not CADDY_REPOSITORY.is_configured():
+                    plan.add_repository(CADDY_REPOSITORY)
+                    plan.prerequisites = PackageIndex.missing(["curl", "gnupg"])
+
+    def _apply_plan(self, plan: AptPlan) -> None:
+        """
+        Execute an apt plan with a single install transaction.
+
+        Args:
+            plan: Plan produced by plan_packages
+        """
+        # Package lists are only needed to install something
+        if not plan.is_empty():
+            self._update_package_lists()
+
+        if plan.prerequisites:
+            self._apt_install(plan.prerequisites)
+
+        # Only the newly added sources need indexing; the rest are fresh
+        for repository in plan.repositories:
+            self._add_repository(repository)
+            self._update_package_lists(repository.source_list)
+
+        if plan.packages:
+            self._apt_install(plan.packages)
+
+        for cmd in plan.post_install:
+            self.run_command(cmd, use_sudo=True, check=False)
+
+    def _update_package_lists(self, source_list: Path | None = None) -> None:
+        """
+        Refresh apt package lists unless they are still fresh.
+
+        Args:
+            source_list: Update only this source instead of every source
+        """
+        stamp = self.apt_lists.UPDATE_STAMP
+        if source_list is not None:
+            # Other sources are not refreshed, but hooks such as
+            # update-notifier's touch the stamp after any successful update
+            # (they can't be cleared from the command line), so put it back
+            stamp_time = self.apt_lists.stamp_time()
+            try:
                 self.run_command(
-                    [
-                        "bash",
-                        "-c",
-                        'curl -1sLf "https://dl.cloudsmith.io/public/caddy/stable/debian.deb.txt" | sudo tee /etc/apt/sources.list.d/caddy-stable.list',
-                    ],
-                    shell=False,
-                    use_sudo=False,
+                    self.apt_lists.source_update_command(source_list), use_sudo=True, stream=True
                 )
-                self.run_command(["apt-get", "update"], use_sudo=True)
-                self.run_command(["apt-get", "install", "-y", "caddy"], use_sudo=True)
+            finally:
+                with contextlib.suppress(OSError):
+                    if stamp_time is None:
+                        self.files.remove(stamp)
+                    else:
+                        self.files.touch(stamp, mtime=stamp_time)
+            return
+        if self.apt_lists.is_fresh():
+            return
+
+        self.run_command(self.apt_lists.update_command(), use_sudo=True, stream=True)
+        with contextlib.suppress(OSError), self.files.batch():
+            self.files.mkdir(stamp.parent)
+            self.files.touch(stamp)
+
+    def _apt_install(self, packages: list[str]) -> None:
+        """Install packages in one apt transaction."""
+        self.run_command(["apt-get", "install", "-y"] + packages, use_sudo=True, stream=True)
+
+    def _add_repository(self, repository: AptRepository) -> None:
+        """Add a third-party apt repository and its signing key."""
+        key = self.DOWNLOAD_DIR / f"{repository.name}.key"
+        self.download(repository.key_url, key)
+        try:
+            self.run_command(
+                ["gpg", "--dearmor", "--yes", "-o", str(repository.keyring), str(key)],
+                use_sudo=True,
+            )
+        finally:
+            key.unlink(missing_ok=True)
+
+        response = self.downloader.open(repository.source_url)
+        self.files.write_file(repository.source_list, response.read().decode())
 
     def _install_composer(self) -> None:
         """Install Composer globally."""
-        # Download installer
-        self.run_command(
-            [
-                "curl",
-                "-sS",
-                "https://getcomposer.org/installer",
-                "-o",
-                "/tmp/composer-setup.php",
-            ],
-        )
+        # Download installer, verified against the published signature
+        installer = self.DOWNLOAD_DIR / "composer-setup.php"
+        response = self.downloader.open(self.COMPOSER_INSTALLER_SIG)
+        signature = response.read().decode().strip()
+        self.download(self.COMPOSER_INSTALLER, installer, checksum=signature, hash_name="sha384")
 
         # Install
-        self.run_command(
-            [
-                "php",
-                "/tmp/composer-setup.php",
-                "--install-dir=/usr/local/bin",
-                "--filename=composer",
-            ],
-            use_sudo=True,
-        )
-
-        # Cleanup
-        self.run_command(["rm", "/tmp/composer-setup.php"])
-
-    def _install_certbot(self, webserver: str) -> None:
-        """Install Certbot for SSL certificates."""
+        try:
+            self.run_command(
+                [
+                    "php",
+                    str(installer),
+                    "--install-dir=/usr/local/bin",
+                    "--filename=composer",
+                ],
+                use_sudo=True,
+            )
+        finally:
+            # Cleanup
+            installer.unlink(missing_ok=True)
+
+    def _certbot_package(self, webserver: str) -> str:
+        """Get the Certbot package for the selected webserver."""
         if webserver == "nginx":
-            package = "python3-certbot-nginx"
+            return "python3-certbot-nginx"
         elif webserver == "apache":
-            package = "python3-certbot-apache"
-        else:
-            package = "certbot"
-
-        if not self.check_package_installed(package):
-            self.run_command(["apt-get", "install", "-y", package], use_sudo=True)
+            return "python3-certbot-apache"
+        return "certbot"
 
     def _install_docker(self) -> None:
         """Install Docker using the official installation script."""
         # Download and run Docker installation script
-        cmd = "curl -fsSL https://get.docker.com | sh"
-        self.run_command(cmd, use_sudo=True, shell=True)
+        script = self.DOWNLOAD_DIR / "get-docker.sh"
+        self.download(self.DOCKER_INSTALL_SCRIPT, script)
+        try:
+            self.run_command(["sh", str(script)], use_sudo=True, stream=True)
+        finally:
+            script.unlink(missing_ok=True)
 
-        # Start and enable Docker service
-        self.run_command(["systemctl", "enable", "docker"], use_sudo=True, check=False)
-        self.run_command(["systemctl", "start", "docker"], use_sudo=True, check=False)
+        # Enable and start Docker service in one ordered step
+        self.run_command(["systemctl", "enable", "--now", "docker"], use_sudo=True, check=False)
 
@@ -0,0 +1,296 @@
+"""Privileged file operations without a process per operation."""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import pwd
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
+
+from pelican_installer.utils.permissions import PermissionFixer
+
+# Operation name and its keyword arguments
+Operation = tuple[str, dict[str, Any]]
+
+
+class FileOperationError(OSError):
+    """Raised when the privileged helper reports a failed operation."""
+
+
+class FileOps:
+    """Create, write and change files that need root.
+
+    When the installer already runs as root, operations are done in-process.
+    Otherwise a single helper process is started through sudo on first use;
+    it stays alive and executes operations sent to it over a pipe, so sudo
+    and process startup are paid once rather than per operation. Inside a
+    :meth:`batch` block operations are collected and sent in one round trip.
+    """
+
+    _shared: FileOps | None = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, privileged: bool | None = None):
+        """
+        Initialize file operations.
+
+        Args:
+            privileged: Whether to operate in-process; defaults to whether
+                the installer runs as root
+        """
+        self.privileged = os.geteuid() == 0 if privileged is None else privileged
+        self._helper: subprocess.Popen | None = None
+        self._helper_lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls) -> FileOps:
+        """Get the instance shared by all installers of this process."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                atexit.register(cls._shared.close)
+            return cls._shared
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Collect the operations of the calling thread and run them together on exit."""
+        if getattr(self._local, "pending", None) is not None:
+            # Nested batch: the outer one sends everything
+            yield
+            return
+        self._local.pending = []
+        try:
+            yield
+            pending = self._local.pending
+        finally:
+            self._local.pending = None
+        if pending:
+            self._execute(pending)
+
+    def write_file(
+        self, path: Path, content: str, mode: int = 0o644, owner: str | None = None
+    ) -> None:
+        """Atomically replace a file's content; optionally give it to owner."""
+        self._submit("write_file", path=str(path), content=content, mode=mode, owner=owner)
+
+    def copy_file(self, source: Path, path: Path, mode: int = 0o644) -> None:
+        """Atomically replace a file with a copy of another."""
+        self._submit("copy_file", source=str(source), path=str(path), mode=mode)
+
+    def mkdir(self, path: Path, mode: int | None = None, owner: str | None = None) -> None:
+        """Create a directory and its parents; optionally set mode and owner."""
+        self._submit("mkdir", path=str(path), mode=mode, owner=owner)
+
+    def symlink(self, target: Path, link: Path) -> None:
+        """Point link at target, replacing an existing link or file."""
+        self._submit("symlink", target=str(target), link=str(link))
+
+    def chmod(self, path: Path, mode: int) -> None:
+        """Change a path's mode."""
+        self._submit("chmod", path=str(path), mode=mode)
+
+    def chown(self, path: Path, owner: str) -> None:
+        """Give a path to a user and their primary group."""
+        self._submit("chown", path=str(path), owner=owner)
+
+    def remove(self, path: Path) -> None:
+        """Remove a file or link if it exists."""
+        self._submit("remove", path=str(path))
+
+    def touch(self, path: Path, mtime: float | None = None) -> None:
+        """Create a file and set its modification time (default: now)."""
+        self._submit("touch", path=str(path), mtime=mtime)
+
+    def fix_permissions(self, root: Path, owner: str, modes: dict[Path, int]) -> int:
+        """
+        Fix ownership and modes of a tree with PermissionFixer.
+
+        Args:
+            root: Directory to fix
+            owner: User (and primary group) every entry should belong to
+            modes: Mode for each subtree
+
+        Returns:
+            Number of entries that were changed
+        """
+        return self._submit(
+            "fix_permissions",
+            root=str(root),
+            owner=owner,
+            modes={str(path): mode for path, mode in modes.items()},
+        )
+
+    def close(self) -> None:
+        """Stop the helper process, if one was started."""
+        with self._helper_lock:
+            if self._helper is not None:
+                assert self._helper.stdin is not None
+                self._helper.stdin.close()
+                self._helper.wait()
+                self._helper = None
+
+    def _submit(self, name: str, **kwargs: Any) -> Any:
+        """Run an operation now, or queue it when inside a batch."""
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.append((name, kwargs))
+            return None
+        return self._execute([(name, kwargs)])[0]
+
+    def _execute(self, operations: list[Operation]) -> list[Any]:
+        """Run operations in-process or through the helper; returns their results."""
+        if self.privileged:
+            return [apply_operation(name, kwargs) for name, kwargs in operations]
+
+        with self._helper_lock:
+            helper = self._ensure_helper()
+            assert helper.stdin is not None and helper.stdout is not None
+            helper.stdin.write(json.dumps(operations) + "\n")
+            helper.stdin.flush()
+            line = helper.stdout.readline()
+        if not line:
+            raise FileOperationError("Privileged helper exited unexpectedly")
+        response = json.loads(line)
+        if "error" in response:
+            raise FileOperationError(response["error"])
+        return response["results"]
+
+    def _ensure_helper(self) -> subprocess.Popen:
+        """Start the helper process through sudo on first use."""
+        if self._helper is None or self._helper.poll() is not None:
+            package_root = str(Path(__file__).resolve().parents[2])
+            code = (
+                f"import sys; sys.path.insert(0, {package_root!r}); "
+                "from pelican_installer.installers.fileops import serve; serve()"
+            )
+            self._helper = subprocess.Popen(
+                ["sudo", sys.executable, "-c", code],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        return self._helper
+
+
+def serve() -> None:
+    """Helper process main loop: run batches of operations read from stdin."""
+    for line in sys.stdin:
+        results = []
+        name = "batch"
+        try:
+            for name, kwargs in json.loads(line):
+                results.append(apply_operation(name, kwargs))
+            response: dict[str, Any] = {"results": results}
+        except Exception as e:
+            response = {"error": f"{name}: {e}"}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+def apply_operation(name: str, kwargs: dict[str, Any]) -> Any:
+    """Execute a single operation in this process."""
+    if name not in _OPERATIONS:
+        raise ValueError(f"Unknown file operation: {name}")
+    return _OPERATIONS[name](**kwargs)
+
+
+def _owner_ids(owner: str) -> tuple[int, int]:
+    """Get uid and primary gid of a user."""
+    user = pwd.getpwnam(owner)
+    return user.pw_uid, user.pw_gid
+
+
+def _replace_file(
+    path: str, mode: int, write: Callable[[BinaryIO], None], owner: str | None = None
+) -> None:
+    """Write a temporary file next to path and rename it into place."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.chmod(tmp_path, mode)
+        if owner is not None:
+            os.chown(tmp_path, *_owner_ids(owner))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write_file(path: str, content: str, mode: int, owner: str | None = None) -> None:
+    _replace_file(path, mode, lambda f: f.write(content.encode()), owner)
+
+
+def _copy_file(source: str, path: str, mode: int) -> None:
+    def write(f: BinaryIO) -> None:
+        with open(source, "rb") as src:
+            shutil.copyfileobj(src, f)
+
+    _replace_file(path, mode, write)
+
+
+def _mkdir(path: str, mode: int | None, owner: str | None) -> None:
+    os.makedirs(path, exist_ok=True)
+    if mode is not None:
+        os.chmod(path, mode)
+    if owner is not None:
+        os.chown(path, *_owner_ids(owner))
+
+
+def _symlink(target: str, link: str) -> None:
+    if os.path.islink(link) and os.readlink(link) == target:
+        return
+    tmp_link = f"{link}.tmp-{os.getpid()}"
+    os.symlink(target, tmp_link)
+    os.replace(tmp_link, link)
+
+
+def _chmod(path: str, mode: int) -> None:
+    os.chmod(path, mode)
+
+
+def _chown(path: str, owner: str) -> None:
+    os.chown(path, *_owner_ids(owner))
+
+
+def _remove(path: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+def _touch(path: str, mtime: float | None = None) -> None:
+    Path(path).touch()
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def _fix_permissions(root: str, owner: str, modes: dict[str, int]) -> int:
+    fixer = PermissionFixer(
+        *_owner_ids(owner),
+        modes={Path(path): mode for path, mode in modes.items()},
+    )
+    return fixer.fix(Path(root))
+
+
+_OPERATIONS = {
+    "write_file": _write_file,
+    "copy_file": _copy_file,
+    "mkdir": _mkdir,
+    "symlink": _symlink,
+    "chmod": _chmod,
+    "chown": _chown,
+    "remove": _remove,
+    "touch": _touch,
+    "fix_permissions": _fix_permissions,
+}
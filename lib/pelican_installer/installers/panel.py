@@ -2,18 +2,178 @@
 
 from __future__ import annotations
 
+import grp
 import os
+import pwd
+import shutil
+import tempfile
+import time
 from pathlib import Path
+from typing import Callable
 
 from pelican_installer.installers.base import BaseInstaller
+from pelican_installer.installers.config import DAEMON_RELOAD, reload_action, restart_action
+from pelican_installer.installers.process import AsyncCommandRunner
+from pelican_installer.installers.scheduler import DISK, NETWORK, InstallTask, report_progress
+from pelican_installer.installers.templates import (
+    APACHE_OCTANE_SITE,
+    APACHE_SITE,
+    APACHE_TLS,
+    APACHE_TUNING,
+    CADDY_OCTANE,
+    CADDYFILE,
+    CADDYFILE_PERFORMANCE,
+    FPM_POOL,
+    NGINX_MICROCACHE,
+    NGINX_OCTANE_SITE,
+    NGINX_SITE,
+    NGINX_SITE_PERFORMANCE,
+    NGINX_TLS,
+    OCTANE_SERVICE,
+    OPCACHE_INI,
+    OPCACHE_PRELOAD,
+    REDIS_CONFIG,
+)
+from pelican_installer.installers.tuning import (
+    ApacheTuning,
+    FpmPoolTuning,
+    NginxTuning,
+    OctaneTuning,
+    OpcacheTuning,
+    RedisTuning,
+)
+from pelican_installer.utils.archive import extract_tar_stream
+from pelican_installer.utils.cache import ArtifactCache
+from pelican_installer.utils.files import (
+    exchange_paths,
+    file_has_content,
+    file_hash,
+    has_hash_header,
+    set_env_values,
+    with_hash_header,
+)
+from pelican_installer.utils.hardware import HardwareDetector
+from pelican_installer.utils.manifest import (
+    Manifest,
+    apply_update,
+    load_manifest,
+    save_manifest,
+)
+from pelican_installer.utils.precompress import Precompressor, PrecompressResult
+from pelican_installer.utils.releases import latest_release, latest_release_tag
 from pelican_installer.utils.state import InstallState
+from pelican_installer.utils.vendor import VendorCache
 
 
 class PanelInstaller(BaseInstaller):
     """Install Pelican Panel."""
 
     PANEL_DIR = Path("/var/www/pelican")
+    GITHUB_REPO = "pelican-dev/panel"
     GITHUB_RELEASE = "https://github.com/pelican-dev/panel/releases/latest/download/panel.tar.gz"
+    RELEASE_ASSET = "panel.tar.gz"
+
+    NGINX_CONFIG = Path("/etc/nginx/sites-available/pelican.conf")
+    APACHE_CONFIG = Path("/etc/apache2/sites-available/pelican.conf")
+    # Certificates issued by Certbot, one directory per domain
+    LETSENCRYPT_LIVE = Path("/etc/letsencrypt/live")
+    # Certbot's Apache plugin puts the HTTPS vhost into a copy of the site
+    APACHE_SSL_CONFIG = Path("/etc/apache2/sites-available/pelican-le-ssl.conf")
+    APACHE_TUNING_CONFIG = Path("/etc/apache2/conf-available/pelican-performance.conf")
+    APACHE_MODS_ENABLED = Path("/etc/apache2/mods-enabled")
+    # mod_php needs the prefork MPM; PHP is served by PHP-FPM instead
+    APACHE_MODULES = ("mpm_event", "proxy", "proxy_fcgi", "setenvif", "http2", "rewrite")
+    APACHE_OCTANE_MODULES = ("proxy_http", "headers")
+    APACHE_CONFLICTING_MODULES = ("php8.3", "mpm_prefork", "mpm_worker")
+    CADDY_CONFIG = Path("/etc/caddy/Caddyfile")
+
+    # TLS profile, written once Certbot has issued the certificate
+    NGINX_TLS_CONFIG = Path("/etc/nginx/snippets/pelican-tls.conf")
+    APACHE_TLS_CONFIG = Path("/etc/apache2/conf-available/pelican-tls.conf")
+    # Tells browsers the site is reachable over HTTP/3 for a day
+    ALT_SVC = 'h3=":443"; ma=86400'
+
+    # Nginx performance profile
+    NGINX_MAIN_CONFIG = Path("/etc/nginx/nginx.conf")
+    NGINX_MODULES_DIR = Path("/etc/nginx/modules-enabled")
+    NGINX_MICROCACHE_CONFIG = Path("/etc/nginx/conf.d/pelican-microcache.conf")
+    NGINX_MICROCACHE_DIR = Path("/var/cache/nginx/pelican")
+    COMPRESSIBLE_TYPES = (
+        "text/css text/plain text/xml application/javascript application/json "
+        "application/xml application/manifest+json image/svg+xml font/ttf"
+    )
+
+    # Requests carrying this cookie (or credentials) bypass the microcache
+    SESSION_COOKIE = "pelican_session"
+
+    # Markers recording the installed release and the composer.lock
+    # the vendor directory was installed from
+    RELEASE_MARKER = PANEL_DIR / ".installer-release"
+    VENDOR_MARKER = PANEL_DIR / "vendor" / ".installer-lock-hash"
+
+    # Files of the installed release, for incremental updates
+    MANIFEST = PANEL_DIR / ".installer-manifest.json"
+
+    # Kept from an existing installation when a new release is installed
+    PRESERVED_PATHS = (".env", "storage", "vendor")
+
+    # Dedicated PHP-FPM pool; should match DependencyInstaller.PHP_VERSION
+    PHP_FPM_SERVICE = "php8.3-fpm"
+    PHP_FPM_PROCESS = "php-fpm8.3"
+    PHP_FPM_POOL = Path("/etc/php/8.3/fpm/pool.d/pelican.conf")
+    PHP_FPM_SOCKET = "/run/php/php8.3-fpm-pelican.sock"
+    # The distro's default pool, disabled in favour of the panel's
+    PHP_FPM_DISTRO_POOL = Path("/etc/php/8.3/fpm/pool.d/www.conf")
+
+    # OPcache settings of PHP-FPM and the script preloading the framework
+    OPCACHE_INI = Path("/etc/php/8.3/fpm/conf.d/90-pelican-opcache.ini")
+    OPCACHE_PRELOAD = Path("/etc/php/8.3/fpm/pelican-preload.php")
+
+    # Octane application server, behind the webserver
+    OCTANE_SERVICE = "pelican-octane"
+    OCTANE_UNIT = Path("/etc/systemd/system/pelican-octane.service")
+    OCTANE_PORT = 8000
+    # Server binaries downloaded into the panel directory by octane:install
+    OCTANE_BINARIES = {"frankenphp": "frankenphp", "roadrunner": "rr"}
+    # Composer packages needed besides laravel/octane
+    OCTANE_PACKAGES = {"roadrunner": ("spiral/roadrunner-cli", "spiral/roadrunner-http")}
+
+    # The panel's environment, holding its cache, session and queue drivers
+    PANEL_ENV = PANEL_DIR / ".env"
+
+    # Laravel's cached config, routes, views and events
+    CONFIG_CACHE = PANEL_DIR / "bootstrap" / "cache" / "config.php"
+
+    # Paths the panel writes to at runtime
+    WRITABLE_PATHS = ("storage", "bootstrap/cache")
+
+    # Composer's download cache, kept across runs
+    COMPOSER_CACHE_DIR = Path("/var/cache/pelican-installer/composer")
+
+    def __init__(
+        self,
+        progress_callback: Callable[[int, str], None] | None = None,
+        output_callback: Callable[[str], None] | None = None,
+        runner: AsyncCommandRunner | None = None,
+        cache: ArtifactCache | None = None,
+        vendor_cache: VendorCache | None = None,
+    ):
+        """
+        Initialize installer.
+
+        Args:
+            progress_callback: Function to call with (progress, status_message)
+            output_callback: Function to call with each line of streamed command output
+            runner: Command runner shared between installers
+            cache: Artifact cache shared between installers
+            vendor_cache: Snapshots of installed vendor/ directories
+        """
+        super().__init__(progress_callback, output_callback, runner, cache)
+        self.vendor_cache = vendor_cache or VendorCache()
+        self.hardware = HardwareDetector.detect()
+        self._fpm_pool: FpmPoolTuning | None = None
+        # Outcome of the last precompression, for the summary
+        self.precompress_result: PrecompressResult | None = None
 
     def install(self, state: InstallState) -> None:
         """
@@ -23,55 +183,616 @@ class PanelInstaller(BaseInstaller):
             state: Installation state with configuration
         """
         self.update_progress(5, "Preparing installation...")
+        self.run_tasks(self.tasks(state))
+        self.update_progress(100, "Panel installed successfully!")
 
-        # Create panel directory
-        self.update_progress(10, "Creating panel directory...")
-        self._create_directory()
+    def tasks(self, state: InstallState) -> list[InstallTask]:
+        """
+        Declare the Panel installation steps.
 
-        # Download and extract panel files
-        self.update_progress(20, "Downloading panel files...")
-        self._download_panel()
+        Steps depend on the ``deps.*`` tasks of DependencyInstaller; when
+        those are not scheduled alongside, they are assumed to be done.
 
-        # Install PHP dependencies via Composer
-        self.update_progress(50, "Installing PHP dependencies...")
-        self._install_php_dependencies()
+        Args:
+            state: Installation state with configuration
 
-        # Configure webserver
-        self.update_progress(70, "Configuring webserver...")
-        self._configure_webserver(state)
+        Returns:
+            Tasks named ``panel.*``
+        """
+        tasks = [
+            InstallTask(
+                name="panel.directory",
+                label="Creating panel directory",
+                run=self._create_directory,
+                resources=frozenset({DISK}),
+                satisfied=self.PANEL_DIR.is_dir,
+            ),
+            InstallTask(
+                name="panel.download",
+                label="Downloading panel files",
+                run=lambda: self._download_panel(state.webserver),
+                after=("panel.directory",),
+                resources=frozenset({NETWORK, DISK}),
+                satisfied=self._is_latest_release,
+            ),
+            InstallTask(
+                name="panel.precompress",
+                label="Precompressing static assets",
+                run=self._precompress_assets,
+                # Composer scripts publish package assets into public/
+                after=("panel.composer", "deps.packages"),
+                resources=frozenset({DISK}),
+                satisfied=lambda: Precompressor().pending(self.PANEL_DIR / "public") == 0,
+            ),
+            InstallTask(
+                name="panel.composer",
+                label="Installing PHP dependencies",
+                run=lambda: self._install_php_dependencies(state.webserver),
+                after=("panel.download", "deps.packages", "deps.composer"),
+                resources=frozenset({NETWORK, DISK}),
+                satisfied=self._are_php_dependencies_installed,
+            ),
+            InstallTask(
+                name="panel.webserver",
+                label="Configuring webserver",
+                run=lambda: self._configure_webserver(state),
+                after=("deps.packages", "panel.fpm"),
+                satisfied=lambda: self._is_webserver_configured(state),
+            ),
+        ]
+
+        # Octane replaces PHP-FPM as the application runtime
+        if state.uses_octane():
+            tasks.append(
+                InstallTask(
+                    name="panel.octane",
+                    label="Setting up Octane",
+                    run=lambda: self._setup_octane(state),
+                    after=("panel.composer",),
+                    resources=frozenset({NETWORK, DISK}),
+                    satisfied=lambda: self._is_octane_configured(state),
+                )
+            )
+        else:
+            tasks.append(
+                InstallTask(
+                    name="panel.fpm",
+                    label="Sizing PHP-FPM pool",
+                    run=lambda: self._configure_fpm(state.webserver),
+                    after=("deps.packages",),
+                    satisfied=lambda: self._is_fpm_configured(state.webserver),
+                )
+            )
 
         # Setup SSL if HTTPS
         if state.protocol == "https" and state.ssl_email:
-            self.update_progress(85, "Setting up SSL certificate...")
-            self._setup_ssl(state)
+            tasks.append(
+                InstallTask(
+                    name="panel.ssl",
+                    label="Setting up SSL certificate",
+                    run=lambda: self._setup_ssl(state),
+                    after=("panel.webserver",),
+                    resources=frozenset({NETWORK}),
+                    satisfied=lambda: self._is_ssl_configured(state),
+                )
+            )
+        if state.webserver in ("nginx", "apache"):
+            tasks.append(
+                InstallTask(
+                    name="panel.tls",
+                    label="Tuning TLS",
+                    run=lambda: self._configure_tls(state),
+                    after=("panel.webserver", "panel.ssl"),
+                    satisfied=lambda: self._is_tls_configured(state),
+                )
+            )
 
-        # Set permissions
-        self.update_progress(95, "Setting permissions...")
-        self._set_permissions(state.webserver)
+        # Redis or Valkey for the panel's cache, sessions and queue
+        if state.cache_server != "none":
+            tasks.append(
+                InstallTask(
+                    name="panel.cache",
+                    label=f"Setting up {state.cache_server_name()}",
+                    run=lambda: self._setup_cache_server(state),
+                    after=("panel.download", "deps.packages"),
+                    satisfied=lambda: self._is_cache_server_configured(state),
+                )
+            )
 
-        self.update_progress(100, "Panel installed successfully!")
+        tasks.append(
+            InstallTask(
+                name="panel.permissions",
+                label="Setting permissions",
+                run=lambda: self._set_permissions(state.webserver),
+                after=("panel.composer", "panel.octane", "panel.precompress", "panel.cache"),
+                resources=frozenset({DISK}),
+                satisfied=lambda: self._has_permissions(state.webserver),
+            )
+        )
+        tasks.append(
+            InstallTask(
+                name="panel.optimize",
+                label="Optimizing PHP",
+                run=lambda: self._optimize(state.webserver),
+                after=("panel.permissions", "panel.fpm", "panel.octane"),
+                satisfied=lambda: self._is_optimized(state.webserver),
+            )
+        )
+
+        # Reload services once, after every config is written
+        tasks.append(
+            InstallTask(
+                name="panel.services",
+                label="Reloading services",
+                run=self.apply_config_changes,
+                after=tuple(task.name for task in tasks),
+                satisfied=lambda: not self.configs.pending(),
+            )
+        )
+        if state.cache_server != "none":
+            tasks.append(
+                InstallTask(
+                    name="panel.cache_check",
+                    label=f"Checking {state.cache_server_name()} connection",
+                    run=lambda: self._check_cache_server(state),
+                    after=("panel.services",),
+                )
+            )
+        return tasks
 
     def _create_directory(self) -> None:
         """Create panel directory."""
-        self.run_command(["mkdir", "-p", str(self.PANEL_DIR)], use_sudo=True)
+        self.files.mkdir(self.PANEL_DIR)
 
-    def _download_panel(self) -> None:
+    def _download_panel(self, webserver: str) -> None:
         """Download and extract panel files."""
-        cmd = f"curl -L {self.GITHUB_RELEASE} | tar -xz -C {self.PANEL_DIR}"
-        self.run_command(cmd, use_sudo=True, shell=True)
+        release = latest_release(self.GITHUB_REPO)
+        tag = release.tag if release else None
+        asset = release.assets.get(self.RELEASE_ASSET) if release else None
+
+        # Extract while downloading (or reading the cached archive) into a
+        # staging directory
+        manifest: Manifest = {}
+        staging = Path(
+            tempfile.mkdtemp(dir=self.PANEL_DIR.parent, prefix=f".{self.PANEL_DIR.name}-")
+        )
+        try:
+            with self.stream_artifact(
+                asset.url if asset else self.GITHUB_RELEASE,
+                f"panel-{tag or 'latest'}.tar.gz",
+                key=f"{self.GITHUB_REPO}@{tag}/{self.RELEASE_ASSET}" if tag else None,
+                sha256=asset.sha256 if asset else None,
+            ) as (archive, size):
+                extract_tar_stream(
+                    archive,
+                    staging,
+                    self._extract_progress(size),
+                    manifest=manifest,
+                    owner=self._web_owner(webserver),
+                )
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if (self.PANEL_DIR / "artisan").exists():
+            # Existing installation: only write what differs from the new release
+            try:
+                result = apply_update(
+                    staging,
+                    self.PANEL_DIR,
+                    manifest,
+                    load_manifest(self.MANIFEST),
+                    protected=self.PRESERVED_PATHS,
+                )
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            report_progress(1, result.summary())
+            changed = bool(result.added or result.changed or result.removed)
+        else:
+            self._swap_in(staging, self._web_owner(webserver))
+            changed = True
+        save_manifest(self.MANIFEST, manifest)
 
-    def _install_php_dependencies(self) -> None:
-        """Install PHP dependencies via Composer."""
-        # Change to panel directory and run composer
-        original_dir = os.getcwd()
+        # OPcache doesn't check timestamps, so new code needs a PHP-FPM reload
+        if changed:
+            self._reload_php()
+
+        # Record the release so converge mode can tell if it is current
+        if tag:
+            self.files.write_file(self.RELEASE_MARKER, f"{tag}\n")
+
+    def _extract_progress(self, size: int | None) -> Callable[[int, int], None]:
+        """Build a progress callback for extract_tar_stream."""
+        last_report = 0.0
+
+        def report(received: int, files: int) -> None:
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report < 0.2:
+                return
+            last_report = now
+            received_mb = received / (1024 * 1024)
+            if size:
+                report_progress(
+                    received / size,
+                    f"{received_mb:.1f}/{size / (1024 * 1024):.1f} MB, {files} files",
+                )
+            else:
+                report_progress(0, f"{received_mb:.1f} MB, {files} files")
+
+        return report
+
+    def _precompress_assets(self) -> None:
+        """Write compressed siblings of the panel's static assets."""
+
+        def report(done: int, total: int) -> None:
+            report_progress(done / total, f"{done}/{total} files")
+
+        self.precompress_result = Precompressor().run(self.PANEL_DIR / "public", report)
+        report_progress(1, self.precompress_result.summary())
+
+    def _swap_in(self, staging: Path, owner: tuple[int, int] | None = None) -> None:
+        """Replace the panel directory with an extracted release."""
+        if self.PANEL_DIR.exists():
+            try:
+                # The panel directory is never missing, even after a crash
+                exchange_paths(staging, self.PANEL_DIR)
+                retired = staging
+            except OSError:
+                # No RENAME_EXCHANGE: the directory is briefly missing
+                retired = staging.with_name(staging.name + ".old")
+                os.replace(self.PANEL_DIR, retired)
+                os.replace(staging, self.PANEL_DIR)
+
+            for name in self.PRESERVED_PATHS:
+                old = retired / name
+                if not (old.exists() or old.is_symlink()):
+                    continue
+                new = self.PANEL_DIR / name
+                if new.is_dir() and not new.is_symlink():
+                    shutil.rmtree(new)
+                elif new.exists() or new.is_symlink():
+                    new.unlink()
+                os.replace(old, new)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, self.PANEL_DIR)
+
+        # mkdtemp creates the directory with mode 0700
+        self.PANEL_DIR.chmod(0o755)
+        if owner is not None:
+            os.chown(self.PANEL_DIR, *owner)
+
+    def _is_latest_release(self) -> bool:
+        """Check if the installed panel is the latest release."""
         try:
-            os.chdir(self.PANEL_DIR)
+            installed = self.RELEASE_MARKER.read_text().strip()
+        except OSError:
+            return False
+        return installed == latest_release_tag(self.GITHUB_REPO)
+
+    def _install_php_dependencies(self, webserver: str) -> None:
+        """Install PHP dependencies via Composer, or restore them from a snapshot."""
+        vendor_dir = self.PANEL_DIR / "vendor"
+        lock_hash = file_hash(self.PANEL_DIR / "composer.lock")
+        php_version = self._php_version()
+        key = self.vendor_cache.key(lock_hash, php_version) if lock_hash and php_version else None
+        exclude = (self.VENDOR_MARKER.name,)
+        web_user = self._web_user(webserver)
+
+        # Composer runs as the web user, so its files need no fixing later
+        self.files.mkdir(self.COMPOSER_CACHE_DIR, owner=web_user)
+
+        if key and self.vendor_cache.restore(key, vendor_dir, exclude=exclude, owner=web_user):
+            # Same lock file and PHP version: only the autoloader and the
+            # package scripts (such as Laravel's package discovery) need to run
             self.run_command(
-                ["composer", "install", "--no-dev", "--optimize-autoloader"],
+                self._composer_command(
+                    web_user, "dump-autoload", "--no-dev", "--classmap-authoritative"
+                ),
                 use_sudo=True,
+                stream=True,
+                cwd=str(self.PANEL_DIR),
             )
-        finally:
-            os.chdir(original_dir)
+        else:
+            # Run composer in the panel directory (without chdir, which would
+            # affect steps running in parallel)
+            self.run_command(
+                self._composer_command(
+                    web_user,
+                    "install",
+                    "--no-dev",
+                    "--optimize-autoloader",
+                    "--classmap-authoritative",
+                ),
+                use_sudo=True,
+                stream=True,
+                cwd=str(self.PANEL_DIR),
+            )
+            if key:
+                self.vendor_cache.save(key, vendor_dir, exclude=exclude)
+        self._reload_php()
+
+        if lock_hash:
+            self.files.write_file(self.VENDOR_MARKER, f"{lock_hash}\n")
+
+    def _optimize(self, webserver: str) -> None:
+        """Size OPcache, enable preloading if possible, and build Laravel's caches."""
+        self.configs.write(
+            self.OPCACHE_PRELOAD,
+            OPCACHE_PRELOAD.render(panel_dir=self.PANEL_DIR),
+            actions=(reload_action(self.PHP_FPM_SERVICE),),
+        )
+        self.configs.write(
+            self.OPCACHE_INI,
+            self._opcache_config(webserver),
+            actions=(reload_action(self.PHP_FPM_SERVICE),),
+        )
+
+        if not self._is_panel_configured():
+            # Caching the config now would hide the settings written by
+            # the panel's web installer
+            report_progress(1, "Laravel caches are built once the panel is configured")
+            return
+        self.run_command(
+            ["runuser", "-u", self._web_user(webserver), "--", "php", "artisan", "optimize"],
+            use_sudo=True,
+            stream=True,
+            cwd=str(self.PANEL_DIR),
+        )
+        self._reload_php()
+
+    def _reload_php(self) -> None:
+        """Queue reloads so PHP workers pick up changed code and caches."""
+        self.configs.queue(reload_action(self.PHP_FPM_SERVICE))
+        if self.OCTANE_UNIT.exists():
+            self.configs.queue(reload_action(self.OCTANE_SERVICE))
+
+    def _is_optimized(self, webserver: str) -> bool:
+        """Check the OPcache settings and that Laravel's caches are newer than the code."""
+        if not (
+            file_has_content(self.OPCACHE_PRELOAD, OPCACHE_PRELOAD.render(panel_dir=self.PANEL_DIR))
+            and file_has_content(self.OPCACHE_INI, self._opcache_config(webserver))
+        ):
+            return False
+        if not self._is_panel_configured():
+            return True
+        try:
+            cached = self.CONFIG_CACHE.stat().st_mtime
+        except OSError:
+            return False
+        sources = (self.PANEL_DIR / ".env", self.RELEASE_MARKER, self.VENDOR_MARKER)
+        return all(not path.exists() or path.stat().st_mtime <= cached for path in sources)
+
+    def _opcache_config(self, webserver: str) -> str:
+        """Render the OPcache settings, sized to the panel's code."""
+        tuning = OpcacheTuning.for_host(self.hardware, self._count_php_files())
+        preload = ""
+        # Preloading can only be set for all pools, so only when the panel's
+        # is the only one
+        if (
+            self.PANEL_DIR / "vendor" / "composer" / "autoload_classmap.php"
+        ).exists() and self._is_only_fpm_pool():
+            preload = (
+                f"opcache.preload = {self.OPCACHE_PRELOAD}\n"
+                f"opcache.preload_user = {self._web_user(webserver)}\n"
+            )
+        return OPCACHE_INI.render(
+            memory_consumption=tuning.memory_consumption,
+            interned_strings_buffer=tuning.interned_strings_buffer,
+            max_accelerated_files=tuning.max_accelerated_files,
+            jit_buffer_size=tuning.jit_buffer_size,
+            preload=preload,
+        )
+
+    def _is_only_fpm_pool(self) -> bool:
+        """Check if no PHP-FPM pool besides the panel's is configured."""
+        pools = self.PHP_FPM_POOL.parent.glob("*.conf")
+        return all(path == self.PHP_FPM_POOL for path in pools)
+
+    def _count_php_files(self) -> int:
+        """Count the panel's PHP files."""
+        count = 0
+        for _, _, files in os.walk(self.PANEL_DIR):
+            count += sum(1 for name in files if name.endswith(".php"))
+        return count
+
+    def _is_panel_configured(self) -> bool:
+        """Check if the panel has been set up (its .env has an application key)."""
+        try:
+            with open(self.PANEL_DIR / ".env") as f:
+                return any(
+                    line.startswith("APP_KEY=") and line.strip() != "APP_KEY=" for line in f
+                )
+        except OSError:
+            return False
+
+    def _setup_octane(self, state: InstallState) -> None:
+        """Install Octane and its server, and run it as a systemd service."""
+        web_user = self._web_user(state.webserver)
+        server = state.runtime
+
+        packages = ("laravel/octane", *self.OCTANE_PACKAGES.get(server, ()))
+        if not all((self.PANEL_DIR / "vendor" / package).is_dir() for package in packages):
+            self.run_command(
+                self._composer_command(
+                    web_user, "require", *packages, "--update-no-dev", "--no-interaction"
+                ),
+                use_sudo=True,
+                stream=True,
+                cwd=str(self.PANEL_DIR),
+            )
+            # Keep vendor/ recorded as matching the changed composer.lock
+            lock_hash = file_hash(self.PANEL_DIR / "composer.lock")
+            if lock_hash:
+                self.files.write_file(self.VENDOR_MARKER, f"{lock_hash}\n")
+
+        if not self._is_octane_server_installed(server):
+            # Publishes config/octane.php and downloads the server binary
+            self.run_command(
+                [
+                    "runuser",
+                    "-u",
+                    web_user,
+                    "--",
+                    "php",
+                    "artisan",
+                    "octane:install",
+                    f"--server={server}",
+                    "--no-interaction",
+                ],
+                use_sudo=True,
+                stream=True,
+                cwd=str(self.PANEL_DIR),
+            )
+
+        changed = self.configs.write(
+            self.OCTANE_UNIT,
+            self._octane_unit(state),
+            actions=(DAEMON_RELOAD, restart_action(self.OCTANE_SERVICE)),
+            header=True,
+        )
+        if changed or not self._is_octane_enabled():
+            self.run_command(["systemctl", "enable", self.OCTANE_SERVICE], use_sudo=True)
+            self.configs.queue(restart_action(self.OCTANE_SERVICE))
+
+    def _is_octane_configured(self, state: InstallState) -> bool:
+        """Check if Octane, its server and the current service unit are installed."""
+        return (
+            (self.PANEL_DIR / "vendor" / "laravel" / "octane").is_dir()
+            and all(
+                (self.PANEL_DIR / "vendor" / package).is_dir()
+                for package in self.OCTANE_PACKAGES.get(state.runtime, ())
+            )
+            and self._is_octane_server_installed(state.runtime)
+            and file_has_content(self.OCTANE_UNIT, with_hash_header(self._octane_unit(state)))
+            and self._is_octane_enabled()
+        )
+
+    def _is_octane_server_installed(self, server: str) -> bool:
+        """Check if octane:install has run for a server."""
+        if not (self.PANEL_DIR / "config" / "octane.php").exists():
+            return False
+        binary = self.OCTANE_BINARIES.get(server)
+        return binary is None or (self.PANEL_DIR / binary).exists()
+
+    def _is_octane_enabled(self) -> bool:
+        """Check if the Octane service starts at boot."""
+        return Path(
+            f"/etc/systemd/system/multi-user.target.wants/{self.OCTANE_SERVICE}.service"
+        ).exists()
+
+    def _octane_unit(self, state: InstallState) -> str:
+        """Render the systemd unit running Octane."""
+        tuning = OctaneTuning.for_host(self.hardware)
+        return OCTANE_SERVICE.render(
+            server=state.runtime,
+            user=self._web_user(state.webserver),
+            panel_dir=self.PANEL_DIR,
+            port=self.OCTANE_PORT,
+            workers=tuning.workers,
+            max_requests=tuning.max_requests,
+        )
+
+    def _composer_command(self, user: str, *args: str) -> list[str]:
+        """Build a composer command run as user, using the persistent cache."""
+        # runuser resets the environment, so the variables are passed through env
+        return [
+            "runuser",
+            "-u",
+            user,
+            "--",
+            "env",
+            f"COMPOSER_HOME={self.COMPOSER_CACHE_DIR}",
+            f"COMPOSER_CACHE_DIR={self.COMPOSER_CACHE_DIR}",
+            "composer",
+            *args,
+        ]
+
+    def _php_version(self) -> str | None:
+        """Get the major.minor version of the PHP CLI."""
+        try:
+            result = self.run_command(
+                ["php", "-r", 'echo PHP_MAJOR_VERSION . "." . PHP_MINOR_VERSION;'],
+                check=False,
+            )
+        except OSError:
+            return None
+        version = (result.stdout or "").strip()
+        return version if result.returncode == 0 and version else None
+
+    def _are_php_dependencies_installed(self) -> bool:
+        """Check if vendor/ was installed from the current composer.lock."""
+        if not (self.PANEL_DIR / "vendor" / "autoload.php").exists():
+            return False
+        try:
+            installed = self.VENDOR_MARKER.read_text().strip()
+        except OSError:
+            return False
+        return installed == file_hash(self.PANEL_DIR / "composer.lock")
+
+    def fpm_pool(self) -> FpmPoolTuning:
+        """
+        Size the panel's PHP-FPM pool for this host.
+
+        Sized once per installer, so the pool and the webserver configs
+        that depend on it agree.
+
+        Returns:
+            Pool settings
+        """
+        if self._fpm_pool is None:
+            self._fpm_pool = FpmPoolTuning.for_host(
+                self.hardware,
+                HardwareDetector.worker_memory_mb(
+                    self.PHP_FPM_PROCESS, title="pool pelican", min_cpu_seconds=1
+                ),
+            )
+        return self._fpm_pool
+
+    def _configure_fpm(self, webserver: str) -> None:
+        """
+        Write the panel's PHP-FPM pool and disable the distro's ``www`` pool.
+
+        The ``www`` pool would only keep idle workers around, and as long as
+        it exists OPcache preloading can't be enabled. It is renamed rather
+        than deleted, so it can be restored. PHP-FPM is reloaded with the
+        other services.
+        """
+        reload = reload_action(self.PHP_FPM_SERVICE)
+        self.configs.write(self.PHP_FPM_POOL, self._fpm_pool_config(webserver), actions=(reload,))
+        if self.PHP_FPM_DISTRO_POOL.exists():
+            with self.files.batch():
+                self.files.copy_file(
+                    self.PHP_FPM_DISTRO_POOL,
+                    self.PHP_FPM_DISTRO_POOL.with_name(f"{self.PHP_FPM_DISTRO_POOL.name}.disabled"),
+                )
+                self.files.remove(self.PHP_FPM_DISTRO_POOL)
+            self.configs.queue(reload)
+        report_progress(1, self.fpm_pool().describe()[0])
+
+    def _is_fpm_configured(self, webserver: str) -> bool:
+        """Check if the pool config matches the sizing for this host and is the only one."""
+        return not self.PHP_FPM_DISTRO_POOL.exists() and file_has_content(
+            self.PHP_FPM_POOL, self._fpm_pool_config(webserver)
+        )
+
+    def _fpm_pool_config(self, webserver: str) -> str:
+        """Render the PHP-FPM pool config for Panel."""
+        pool = self.fpm_pool()
+        user = self._web_user(webserver)
+        return FPM_POOL.render(
+            user=user,
+            socket=self.PHP_FPM_SOCKET,
+            # Caddy runs as its own user and connects to the socket directly
+            listen_owner="caddy" if webserver == "caddy" else user,
+            pm=pool.pm,
+            max_children=pool.max_children,
+            start_servers=pool.start_servers,
+            min_spare_servers=pool.min_spare_servers,
+            max_spare_servers=pool.max_spare_servers,
+            max_requests=pool.max_requests,
+        )
 
     def _configure_webserver(self, state: InstallState) -> None:
         """Configure the webserver for Panel."""
@@ -82,203 +803,618 @@ class PanelInstaller(BaseInstaller):
         elif state.webserver == "caddy":
             self._configure_caddy(state)
 
+    def _webserver_config(self, state: InstallState) -> tuple[Path, str] | None:
+        """Get the config file path and rendered content (without header) for the webserver."""
+        if state.webserver == "nginx":
+            return self.NGINX_CONFIG, self._nginx_config(state)
+        elif state.webserver == "apache":
+            return self.APACHE_CONFIG, self._apache_config(state)
+        elif state.webserver == "caddy":
+            return self.CADDY_CONFIG, self._caddy_config(state)
+        return None
+
+    def _is_webserver_configured(self, state: InstallState) -> bool:
+        """Check if the webserver config on disk matches the rendered one."""
+        config = self._webserver_config(state)
+        if config is None:
+            return False
+        path, content = config
+        if not file_has_content(path, with_hash_header(content)):
+            # Certbot adds its TLS directives to the site config; accept
+            # that as long as the file was generated from this content
+            if not (self._uses_certbot(state) and has_hash_header(path, content)):
+                return False
+        if state.webserver == "nginx":
+            return (
+                Path("/etc/nginx/sites-enabled/pelican.conf").exists()
+                and self._is_nginx_tuned(state)
+            )
+        elif state.webserver == "apache":
+            return (
+                Path("/etc/apache2/sites-enabled/pelican.conf").exists()
+                and self._apache_module_changes(state) == ([], [])
+                and self._is_apache_tuned(state)
+            )
+        return True
+
     def _configure_nginx(self, state: InstallState) -> None:
         """Configure Nginx for Panel."""
-        config_path = "/etc/nginx/sites-available/pelican.conf"
-        protocol = "https" if state.protocol == "https" else "http"
-        port = 443 if protocol == "https" else 80
-        php_version = "8.3"  # Should match DependencyInstaller.PHP_VERSION
-
-        config = f"""server {{
-    listen {port};
-    {'listen [::]:' + str(port) + ';' if port == 80 else 'listen [::]:443 ssl http2;'}
-    server_name {state.domain};
-    root /var/www/pelican/public;
-    index index.php;
-
-    access_log /var/log/nginx/pelican.app-access.log;
-    error_log  /var/log/nginx/pelican.app-error.log error;
-
-    client_max_body_size 100M;
-    client_body_timeout 120s;
-
-    sendfile off;
-
-    location / {{
-        try_files $uri $uri/ /index.php?$query_string;
-    }}
-
-    location ~ \\.php$ {{
-        fastcgi_split_path_info ^(.+\\.php)(/.+)$;
-        fastcgi_pass unix:/run/php/php{php_version}-fpm.sock;
-        fastcgi_index index.php;
-        include fastcgi_params;
-        fastcgi_param PHP_VALUE "upload_max_filesize = 100M \\n post_max_size=100M";
-        fastcgi_param SCRIPT_FILENAME $document_root$fastcgi_script_name;
-        fastcgi_param HTTP_PROXY "";
-        fastcgi_intercept_errors off;
-        fastcgi_buffer_size 16k;
-        fastcgi_buffers 4 16k;
-        fastcgi_connect_timeout 300;
-        fastcgi_send_timeout 300;
-        fastcgi_read_timeout 300;
-        include /etc/nginx/fastcgi_params;
-    }}
-
-    location ~ /\\.ht {{
-        deny all;
-    }}
-}}
-"""
-
-        # Write config file
-        self.run_command(
-            ["bash", "-c", f"echo '{config}' > {config_path}"],
-            use_sudo=True,
-            shell=False,
+        # Write config file and enable site; Nginx is tested and reloaded
+        # once all configs are written
+        self.configs.write(
+            self.NGINX_CONFIG,
+            self._nginx_config(state),
+            actions=(reload_action("nginx"),),
+            header=True,
         )
+        self.files.symlink(self.NGINX_CONFIG, Path("/etc/nginx/sites-enabled/pelican.conf"))
 
-        # Enable site
-        self.run_command(
-            ["ln", "-sf", config_path, "/etc/nginx/sites-enabled/pelican.conf"],
-            use_sudo=True,
-            check=False,
+        if state.profile == "performance":
+            main_config = self._tuned_nginx_main_config()
+            if main_config is not None:
+                self.configs.write(
+                    self.NGINX_MAIN_CONFIG, main_config, actions=(reload_action("nginx"),)
+                )
+        if self._uses_microcache(state):
+            self.configs.write(
+                self.NGINX_MICROCACHE_CONFIG,
+                NGINX_MICROCACHE.render(cache_dir=self.NGINX_MICROCACHE_DIR),
+                actions=(reload_action("nginx"),),
+                header=True,
+            )
+        elif self.NGINX_MICROCACHE_CONFIG.exists():
+            self.files.remove(self.NGINX_MICROCACHE_CONFIG)
+            self.configs.queue(reload_action("nginx"))
+
+    def _is_nginx_tuned(self, state: InstallState) -> bool:
+        """Check the main config and microcache zone match the profile."""
+        if self._uses_microcache(state):
+            content = NGINX_MICROCACHE.render(cache_dir=self.NGINX_MICROCACHE_DIR)
+            if not file_has_content(self.NGINX_MICROCACHE_CONFIG, with_hash_header(content)):
+                return False
+        elif self.NGINX_MICROCACHE_CONFIG.exists():
+            return False
+        if state.profile != "performance":
+            return True
+        main_config = self._tuned_nginx_main_config()
+        return main_config is None or file_has_content(self.NGINX_MAIN_CONFIG, main_config)
+
+    def _uses_microcache(self, state: InstallState) -> bool:
+        """Check if PHP responses are microcached (performance profile on PHP-FPM)."""
+        return state.microcache and state.profile == "performance" and not state.uses_octane()
+
+    def _nginx_config(self, state: InstallState) -> str:
+        """Render the Nginx site config for Panel."""
+        port = 443 if state.protocol == "https" else 80
+        listen_v6 = "listen [::]:80;" if port == 80 else "listen [::]:443 ssl http2;"
+        if state.uses_octane():
+            return NGINX_OCTANE_SITE.render(
+                port=port,
+                listen_v6=listen_v6,
+                domain=state.domain,
+                octane_port=self.OCTANE_PORT,
+                compressible_types=self.COMPRESSIBLE_TYPES,
+                alt_svc=self._nginx_alt_svc(state),
+            )
+        if state.profile == "compatible":
+            return NGINX_SITE.render(
+                port=port,
+                listen_v6=listen_v6,
+                domain=state.domain,
+                php_socket=self.PHP_FPM_SOCKET,
+            )
+
+        tuning = self._nginx_tuning()
+        keepalive = tuning.upstream_keepalive
+        return NGINX_SITE_PERFORMANCE.render(
+            port=port,
+            listen_v6=listen_v6,
+            domain=state.domain,
+            php_socket=self.PHP_FPM_SOCKET,
+            upstream_keepalive=f"\n    keepalive {keepalive};" if keepalive else "",
+            fastcgi_keep_conn="\n        fastcgi_keep_conn on;" if keepalive else "",
+            open_file_cache=tuning.open_file_cache,
+            fastcgi_buffers=tuning.fastcgi_buffers,
+            compressible_types=self.COMPRESSIBLE_TYPES,
+            brotli=self._nginx_brotli() if self._nginx_has_brotli() else "",
+            microcache=self._nginx_microcache(state) if self._uses_microcache(state) else "",
+            alt_svc=self._nginx_alt_svc(state),
         )
 
-        # Test and reload Nginx
-        self.run_command(["nginx", "-t"], use_sudo=True)
-        self.run_command(["systemctl", "reload", "nginx"], use_sudo=True)
+    def _nginx_tuning(self) -> NginxTuning:
+        """Size the Nginx performance profile for this host."""
+        return NginxTuning.for_host(self.hardware, self.fpm_pool().max_children)
+
+    def _tuned_nginx_main_config(self) -> str | None:
+        """Get nginx.conf with tuned worker limits, or None if there is no nginx.conf."""
+        try:
+            config = self.NGINX_MAIN_CONFIG.read_text()
+        except OSError:
+            return None
+        return self._nginx_tuning().apply_to_main_config(config)
+
+    def _nginx_has_brotli(self) -> bool:
+        """Check if the Nginx brotli module is enabled."""
+        try:
+            return any("brotli" in path.name for path in self.NGINX_MODULES_DIR.iterdir())
+        except OSError:
+            return False
+
+    def _nginx_brotli(self) -> str:
+        """Server directives enabling brotli compression."""
+        return (
+            "\n\n    brotli on;"
+            "\n    brotli_static on;"
+            "\n    brotli_comp_level 5;"
+            "\n    brotli_min_length 1024;"
+            f"\n    brotli_types {self.COMPRESSIBLE_TYPES};"
+        )
+
+    def _nginx_has_http3(self) -> bool:
+        """Check if Nginx was built with HTTP/3 support (1.25 and later)."""
+        try:
+            result = self.run_command(["nginx", "-V"], check=False)
+        except OSError:
+            return False
+        return "--with-http_v3_module" in (result.stderr or "")
+
+    def _nginx_microcache(self, state: InstallState) -> str:
+        """PHP location directives caching anonymous responses for a second."""
+        bypass = f"$cookie_{self.SESSION_COOKIE} $http_authorization"
+        # Laravel sets cookies on every session-backed response and Nginx
+        # never caches responses that set cookies, so only stateless
+        # anonymous requests are cached
+        return (
+            "\n\n        fastcgi_cache pelican;"
+            '\n        fastcgi_cache_key "$scheme$request_method$host$request_uri";'
+            "\n        fastcgi_cache_valid 200 301 302 1s;"
+            "\n        fastcgi_cache_use_stale updating error timeout;"
+            "\n        fastcgi_cache_lock on;"
+            f"\n        fastcgi_cache_bypass {bypass};"
+            f"\n        fastcgi_no_cache {bypass};"
+            "\n        add_header X-Cache-Status $upstream_cache_status;"
+            f"{self._nginx_alt_svc(state)}"
+        )
+
+    def _nginx_alt_svc(self, state: InstallState) -> str:
+        """
+        Alt-Svc header for locations with their own add_header.
+
+        Nginx only inherits add_header directives into locations that set
+        none, so each of those repeats the HTTP/3 advertisement of the TLS
+        snippet.
+        """
+        if self._uses_tls_profile(state) and self._nginx_has_http3():
+            return f"\n        add_header Alt-Svc '{self.ALT_SVC}' always;"
+        return ""
 
     def _configure_apache(self, state: InstallState) -> None:
         """Configure Apache for Panel."""
-        config_path = "/etc/apache2/sites-available/pelican.conf"
-        protocol = "https" if state.protocol == "https" else "http"
-        port = 443 if protocol == "https" else 80
+        self.configs.write(
+            self.APACHE_CONFIG,
+            self._apache_config(state),
+            actions=(reload_action("apache2"),),
+            header=True,
+        )
 
-        config = f"""<VirtualHost *:{port}>
-    ServerName {state.domain}
-    DocumentRoot "/var/www/pelican/public"
+        # Switch from mod_php and prefork to PHP-FPM and the event MPM;
+        # changing the MPM needs a restart rather than a reload
+        disable, enable = self._apache_module_changes(state)
+        if disable:
+            self.run_command(["a2dismod", "-f", *disable], use_sudo=True, check=False)
+        if enable:
+            self.run_command(["a2enmod", *enable], use_sudo=True, check=False)
+        if disable or enable:
+            self.configs.queue(restart_action("apache2"))
 
-    AllowEncodedSlashes NoDecode
+        if state.profile == "performance" and not state.uses_octane():
+            self.configs.write(
+                self.APACHE_TUNING_CONFIG,
+                self._apache_tuning_config(),
+                actions=(restart_action("apache2"),),
+                header=True,
+            )
+            if not self._is_apache_tuning_enabled():
+                self.run_command(["a2enconf", "pelican-performance"], use_sudo=True, check=False)
+                self.configs.queue(restart_action("apache2"))
+        elif self.APACHE_TUNING_CONFIG.exists():
+            self.run_command(["a2disconf", "pelican-performance"], use_sudo=True, check=False)
+            self.files.remove(self.APACHE_TUNING_CONFIG)
+            self.configs.queue(restart_action("apache2"))
 
-    <Directory "/var/www/pelican/public">
-        Require all granted
-        AllowOverride all
-    </Directory>
+        if not Path("/etc/apache2/sites-enabled/pelican.conf").exists():
+            self.run_command(["a2ensite", "pelican.conf"], use_sudo=True, check=False)
+            self.configs.queue(reload_action("apache2"))
 
-    ErrorLog /var/log/apache2/pelican.app-error.log
-    CustomLog /var/log/apache2/pelican.app-access.log combined
-</VirtualHost>
-"""
+    def _apache_module_changes(self, state: InstallState) -> tuple[list[str], list[str]]:
+        """Get the Apache modules to disable and to enable."""
+        wanted = self.APACHE_MODULES
+        if state.uses_octane():
+            wanted += self.APACHE_OCTANE_MODULES
 
-        # Write config file
-        self.run_command(
-            ["bash", "-c", f"echo '{config}' > {config_path}"],
-            use_sudo=True,
-            shell=False,
+        def is_enabled(module: str) -> bool:
+            return (self.APACHE_MODS_ENABLED / f"{module}.load").exists()
+
+        disable = [m for m in self.APACHE_CONFLICTING_MODULES if is_enabled(m)]
+        enable = [m for m in wanted if not is_enabled(m)]
+        return disable, enable
+
+    def _is_apache_tuned(self, state: InstallState) -> bool:
+        """Check the event MPM tuning matches the profile."""
+        if state.profile != "performance" or state.uses_octane():
+            return not self.APACHE_TUNING_CONFIG.exists()
+        return self._is_apache_tuning_enabled() and file_has_content(
+            self.APACHE_TUNING_CONFIG, with_hash_header(self._apache_tuning_config())
         )
 
-        # Enable site and required modules
-        self.run_command(["a2ensite", "pelican.conf"], use_sudo=True, check=False)
-        self.run_command(["a2enmod", "rewrite"], use_sudo=True, check=False)
+    def _is_apache_tuning_enabled(self) -> bool:
+        """Check if the tuning config is enabled."""
+        return Path("/etc/apache2/conf-enabled/pelican-performance.conf").exists()
 
-        # Reload Apache
-        self.run_command(["systemctl", "reload", "apache2"], use_sudo=True)
+    def _apache_tuning_config(self) -> str:
+        """Render the event MPM tuning for this host."""
+        tuning = ApacheTuning.for_host(self.hardware)
+        return APACHE_TUNING.render(
+            start_servers=tuning.start_servers,
+            server_limit=tuning.server_limit,
+            threads_per_child=tuning.threads_per_child,
+            max_request_workers=tuning.max_request_workers,
+            min_spare_threads=tuning.min_spare_threads,
+            max_spare_threads=tuning.max_spare_threads,
+            max_connections_per_child=tuning.max_connections_per_child,
+        )
+
+    def _apache_config(self, state: InstallState) -> str:
+        """Render the Apache site config for Panel."""
+        if state.uses_octane():
+            return APACHE_OCTANE_SITE.render(
+                port=443 if state.protocol == "https" else 80,
+                domain=state.domain,
+                octane_port=self.OCTANE_PORT,
+            )
+        return APACHE_SITE.render(
+            port=443 if state.protocol == "https" else 80,
+            domain=state.domain,
+            php_socket=self.PHP_FPM_SOCKET,
+        )
 
     def _configure_caddy(self, state: InstallState) -> None:
         """Configure Caddy for Panel."""
-        config_path = "/etc/caddy/Caddyfile"
-        php_version = "8.3"
-
-        config = f"""{state.domain} {{
-    root * /var/www/pelican/public
-    file_server
-
-    php_fastcgi unix//run/php/php{php_version}-fpm.sock
-
-    header {{
-        -Server
-        -X-Powered-By
-        Referrer-Policy "same-origin"
-        X-Frame-Options "deny"
-        X-XSS-Protection "1; mode=block"
-        X-Content-Type-Options "nosniff"
-    }}
-}}
-"""
-
-        # Write config file
-        self.run_command(
-            ["bash", "-c", f"echo '{config}' > {config_path}"],
-            use_sudo=True,
-            shell=False,
+        self.configs.write(
+            self.CADDY_CONFIG,
+            self._caddy_config(state),
+            actions=(reload_action("caddy"),),
+            header=True,
+        )
+
+    def _caddy_config(self, state: InstallState) -> str:
+        """Render the Caddyfile for Panel."""
+        if state.uses_octane():
+            return CADDY_OCTANE.render(
+                domain=state.domain, octane_port=self.OCTANE_PORT, tls=self._caddy_tls(state)
+            )
+        if state.profile == "compatible":
+            return CADDYFILE.render(domain=state.domain, php_socket=self.PHP_FPM_SOCKET)
+        return CADDYFILE_PERFORMANCE.render(
+            domain=state.domain,
+            php_socket=self.PHP_FPM_SOCKET,
+            max_children=self.fpm_pool().max_children,
+            tls=self._caddy_tls(state),
+        )
+
+    def _caddy_tls(self, state: InstallState) -> str:
+        """Site directives of the TLS profile for Caddy."""
+        if not self._uses_tls_profile(state):
+            return ""
+        # Caddy serves HTTP/3, rotates session ticket keys and staples OCSP
+        # responses by default; the certificate key and protocols are pinned
+        return (
+            "\n    tls {"
+            "\n        key_type p256"
+            "\n        protocols tls1.2 tls1.3"
+            "\n    }\n"
         )
 
-        # Reload Caddy
-        self.run_command(["systemctl", "reload", "caddy"], use_sudo=True)
+    def _uses_certbot(self, state: InstallState) -> bool:
+        """Check if Certbot installs the certificate into the webserver config."""
+        return state.protocol == "https" and state.webserver in ("nginx", "apache")
+
+    def _is_ssl_configured(self, state: InstallState) -> bool:
+        """Check if a certificate exists and the webserver config uses it."""
+        if not self._uses_certbot(state):
+            return True
+        cert_dir = f"{self.LETSENCRYPT_LIVE / state.domain}/"
+        if not Path(cert_dir, "fullchain.pem").exists():
+            return False
+        if state.webserver == "apache":
+            config = self.APACHE_SSL_CONFIG
+        else:
+            config = self.NGINX_CONFIG
+        try:
+            return cert_dir in config.read_text()
+        except OSError:
+            return False
 
     def _setup_ssl(self, state: InstallState) -> None:
         """Setup SSL certificate via Certbot."""
+        if not self._uses_certbot(state):  # Caddy handles SSL automatically
+            return
+        command = [
+            "certbot",
+            f"--{state.webserver}",
+            "-d",
+            state.domain,
+            "--non-interactive",
+            "--agree-tos",
+            "-m",
+            state.ssl_email,
+        ]
+        if self._uses_tls_profile(state):
+            # ECDSA P-256 keys make smaller certificates and cheaper handshakes
+            # than RSA; Certbot only changes the key type of an existing
+            # certificate when it is named
+            command += [
+                "--cert-name",
+                state.domain,
+                "--key-type",
+                "ecdsa",
+                "--elliptic-curve",
+                "secp256r1",
+            ]
+        # Don't fail if cert already exists
+        self.run_command(command, use_sudo=True, check=False)
+
+    def _uses_tls_profile(self, state: InstallState) -> bool:
+        """Check if TLS is tuned (performance profile over HTTPS)."""
+        return state.protocol == "https" and state.profile == "performance"
+
+    def _tls_config(self, state: InstallState) -> tuple[Path, str | None] | None:
+        """
+        Get the TLS profile file of the webserver and its rendered content.
+
+        Returns:
+            Path and content (None if the file should not exist), or None
+            if the webserver has no such file
+        """
         if state.webserver == "nginx":
-            # Certbot nginx plugin
-            self.run_command(
-                [
-                    "certbot",
-                    "--nginx",
-                    "-d",
-                    state.domain,
-                    "--non-interactive",
-                    "--agree-tos",
-                    "-m",
-                    state.ssl_email,
-                ],
-                use_sudo=True,
-                check=False,  # Don't fail if cert already exists
-            )
+            path = self.NGINX_TLS_CONFIG
         elif state.webserver == "apache":
-            # Certbot apache plugin
-            self.run_command(
-                [
-                    "certbot",
-                    "--apache",
-                    "-d",
-                    state.domain,
-                    "--non-interactive",
-                    "--agree-tos",
-                    "-m",
-                    state.ssl_email,
-                ],
-                use_sudo=True,
-                check=False,
+            path = self.APACHE_TLS_CONFIG
+        else:
+            return None
+        # The Nginx snippet adds listeners needing the certificate
+        certificate = self.LETSENCRYPT_LIVE / state.domain / "fullchain.pem"
+        if not self._uses_tls_profile(state) or not certificate.exists():
+            return path, None
+        if state.webserver == "apache":
+            return path, APACHE_TLS.render()
+        http3 = ""
+        if self._nginx_has_http3():
+            http3 = (
+                "\n\n# HTTP/3 over QUIC (UDP port 443)"
+                "\nlisten 443 quic reuseport;"
+                "\nlisten [::]:443 quic reuseport;"
+                f"\nadd_header Alt-Svc '{self.ALT_SVC}' always;"
             )
-        else:  # Caddy handles SSL automatically
-            pass
+        return path, NGINX_TLS.render(http3=http3)
 
-    def _set_permissions(self, webserver: str) -> None:
-        """Set proper file permissions."""
-        # Determine web user
-        if webserver in ["nginx", "caddy"]:
-            web_user = "www-data"
-        elif webserver == "apache":
-            web_user = "www-data"
-        else:
-            web_user = "www-data"
+    def _configure_tls(self, state: InstallState) -> None:
+        """Write or remove the webserver's TLS profile."""
+        config = self._tls_config(state)
+        if config is None:
+            return
+        path, content = config
+        service = "apache2" if state.webserver == "apache" else "nginx"
+        if content is not None:
+            self.configs.write(path, content, actions=(reload_action(service),), header=True)
+            if state.webserver == "apache" and not self._is_apache_tls_enabled():
+                self.run_command(["a2enconf", "pelican-tls"], use_sudo=True, check=False)
+                self.configs.queue(reload_action(service))
+        elif path.exists():
+            if state.webserver == "apache":
+                self.run_command(["a2disconf", "pelican-tls"], use_sudo=True, check=False)
+            self.files.remove(path)
+            self.configs.queue(reload_action(service))
 
-        # Set ownership
-        self.run_command(
-            ["chown", "-R", f"{web_user}:{web_user}", str(self.PANEL_DIR)],
-            use_sudo=True,
+    def _is_tls_configured(self, state: InstallState) -> bool:
+        """Check the webserver's TLS profile matches the state."""
+        config = self._tls_config(state)
+        if config is None:
+            return True
+        path, content = config
+        if content is None:
+            return not path.exists()
+        return file_has_content(path, with_hash_header(content)) and (
+            state.webserver != "apache" or self._is_apache_tls_enabled()
         )
 
-        # Set permissions
-        self.run_command(
-            ["chmod", "-R", "755", f"{self.PANEL_DIR}/storage"],
-            use_sudo=True,
-            check=False,
+    def _is_apache_tls_enabled(self) -> bool:
+        """Check if the Apache TLS profile is enabled."""
+        return Path("/etc/apache2/conf-enabled/pelican-tls.conf").exists()
+
+    def _cache_server_socket(self, server: str) -> str:
+        """Get the socket path, in the runtime directory of the server's systemd unit."""
+        return f"/run/{server}/{server}-server.sock"
+
+    def _cache_server_paths(self, server: str) -> tuple[Path, Path]:
+        """Get the server's main config and the panel's config it includes."""
+        config_dir = Path("/etc") / server
+        return config_dir / f"{server}.conf", config_dir / "pelican.conf"
+
+    def _setup_cache_server(self, state: InstallState) -> None:
+        """Tune Redis or Valkey and point the panel's cache, sessions and queue at it."""
+        server = state.cache_server
+        service = f"{server}-server"
+        main_path, include_path = self._cache_server_paths(server)
+        # Socket and memory settings only take effect on a restart
+        self.configs.write(
+            include_path,
+            self._cache_server_config(server),
+            actions=(restart_action(service),),
+            header=True,
         )
-        self.run_command(
-            ["chmod", "-R", "755", f"{self.PANEL_DIR}/bootstrap/cache"],
+        main_config = self._cache_server_main_config(server)
+        if main_config is not None and self.configs.write(
+            main_path, main_config, actions=(restart_action(service),), mode=0o640
+        ):
+            # Debian's packages keep the config readable by the server only
+            self.files.chown(main_path, server)
+
+        user = self._web_user(state.webserver)
+        if not self._is_in_group(user, server):
+            self.run_command(["usermod", "-aG", server, user], use_sudo=True)
+            # New PHP-FPM workers get the group; Octane's process keeps its groups
+            self.configs.queue(reload_action(self.PHP_FPM_SERVICE))
+            if state.uses_octane():
+                self.configs.queue(restart_action(self.OCTANE_SERVICE))
+
+        env = self._panel_env(state)
+        if not file_has_content(self.PANEL_ENV, env):
+            # Read by PHP as the web user; permissions may not be fixed after this
+            self.files.write_file(
+                self.PANEL_ENV, env, mode=0o640, owner=self._web_user(state.webserver)
+            )
+            self._reload_php()
+
+    def _is_cache_server_configured(self, state: InstallState) -> bool:
+        """Check the server's config, socket access and the panel's .env."""
+        server = state.cache_server
+        main_path, include_path = self._cache_server_paths(server)
+        main_config = self._cache_server_main_config(server)
+        return (
+            main_config is not None
+            and file_has_content(main_path, main_config)
+            and file_has_content(
+                include_path, with_hash_header(self._cache_server_config(server))
+            )
+            and self._is_in_group(self._web_user(state.webserver), server)
+            and file_has_content(self.PANEL_ENV, self._panel_env(state))
+        )
+
+    def _cache_server_config(self, server: str) -> str:
+        """Render the socket and memory settings for this host."""
+        tuning = RedisTuning.for_host(self.hardware)
+        return REDIS_CONFIG.render(
+            socket=self._cache_server_socket(server),
+            maxmemory=tuning.maxmemory_mb,
+            policy=tuning.maxmemory_policy,
+        )
+
+    def _cache_server_main_config(self, server: str) -> str | None:
+        """Get the server's main config ending with the panel's include, or None if missing."""
+        main_path, include_path = self._cache_server_paths(server)
+        try:
+            config = main_path.read_text()
+        except OSError:
+            return None
+        include = f"include {include_path}"
+        if include in config.splitlines():
+            return config
+        # Later directives win, so the include goes last
+        return f"{config.rstrip()}\n\n# Pelican Panel\n{include}\n"
+
+    def _panel_env(self, state: InstallState) -> str:
+        """Get the panel's .env (or its example) using the server's socket."""
+        content = ""
+        for path in (self.PANEL_ENV, self.PANEL_DIR / ".env.example"):
+            try:
+                content = path.read_text()
+                break
+            except OSError:
+                continue
+        return set_env_values(
+            content,
+            {
+                "CACHE_STORE": "redis",
+                "SESSION_DRIVER": "redis",
+                "QUEUE_CONNECTION": "redis",
+                "REDIS_CLIENT": "phpredis",
+                # A host starting with "/" is a socket; the port is ignored
+                "REDIS_HOST": self._cache_server_socket(state.cache_server),
+                "REDIS_PORT": "0",
+            },
+        )
+
+    def _is_in_group(self, user: str, group: str) -> bool:
+        """Check if a user is a supplementary member of a group."""
+        try:
+            return user in grp.getgrnam(group).gr_mem
+        except KeyError:
+            return False
+
+    def _check_cache_server(self, state: InstallState) -> None:
+        """
+        Ping the server over its socket as the web user.
+
+        Raises:
+            RuntimeError: If the server does not answer
+        """
+        socket = self._cache_server_socket(state.cache_server)
+        result = self.run_command(
+            [
+                "runuser",
+                "-u",
+                self._web_user(state.webserver),
+                "--",
+                f"{state.cache_server}-cli",
+                "-s",
+                socket,
+                "ping",
+            ],
             use_sudo=True,
             check=False,
         )
+        if result.returncode != 0 or (result.stdout or "").strip() != "PONG":
+            output = (result.stderr or result.stdout or "").strip()
+            raise RuntimeError(
+                f"{state.cache_server_name()} is not reachable on {socket}: {output}"
+            )
+        report_progress(1, f"{state.cache_server_name()} answers on {socket}")
+
+    def _web_user(self, webserver: str) -> str:
+        """Determine the user the webserver runs PHP as."""
+        if webserver in ["nginx", "caddy"]:
+            return "www-data"
+        elif webserver == "apache":
+            return "www-data"
+        return "www-data"
+
+    def _has_permissions(self, webserver: str) -> bool:
+        """Check ownership of the panel directory, its writable paths and .env."""
+        try:
+            uid = pwd.getpwnam(self._web_user(webserver)).pw_uid
+            paths = [
+                self.PANEL_DIR,
+                self.PANEL_DIR / "storage",
+                self.PANEL_DIR / "bootstrap" / "cache",
+            ]
+            if self.PANEL_ENV.exists():
+                paths.append(self.PANEL_ENV)
+            return all(path.stat().st_uid == uid for path in paths)
+        except (KeyError, OSError):
+            return False
+
+    def _set_permissions(self, webserver: str) -> None:
+        """Set proper file permissions."""
+        # Only entries with the wrong owner or mode are changed, so this is
+        # mostly a no-op when extraction and composer ran as the web user
+        changed = self.files.fix_permissions(
+            self.PANEL_DIR,
+            self._web_user(webserver),
+            modes={
+                self.PANEL_DIR / path: 0o755
+                for path in self.WRITABLE_PATHS
+                if (self.PANEL_DIR / path).exists()
+            },
+        )
+        report_progress(1, f"{changed} entries changed")
 
+    def _web_owner(self, webserver: str) -> tuple[int, int] | None:
+        """Get (uid, gid) of the web user, or None if not running as root."""
+        if os.geteuid() != 0:
+            return None
+        try:
+            user = pwd.getpwnam(self._web_user(webserver))
+        except KeyError:
+            return None
+        return user.pw_uid, user.pw_gid
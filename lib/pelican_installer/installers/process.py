@@ -0,0 +1,167 @@
+"""Asyncio-based execution of system commands."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Number of trailing output lines kept for error reporting
+DEFAULT_TAIL_LINES = 200
+
+# Number of commands allowed to run at the same time
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Size of each read from a streamed pipe; also caps the length of one line
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncCommandRunner:
+    """Run commands with ``asyncio`` subprocesses and bounded concurrency.
+
+    Commands can be awaited directly or run from synchronous code with
+    :meth:`run_sync`. When the runner is given an event loop that runs in
+    another thread (such as Textual's), synchronous callers submit their
+    commands to that loop instead of creating their own, so no thread is
+    needed per command. Scheduler tasks running in parallel share one
+    runner, which bounds how many of their commands run at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ):
+        """
+        Initialize runner.
+
+        Args:
+            max_concurrency: Maximum number of commands running at once
+            loop: Event loop running in another thread to execute commands on
+        """
+        self.max_concurrency = max_concurrency
+        self.loop = loop
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def run_sync(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine to completion from synchronous code.
+
+        Must not be called from the thread running ``self.loop``.
+        """
+        if self.loop is not None:
+            return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+        return asyncio.run(coro)
+
+    async def run(
+        self,
+        cmd: list[str] | str,
+        capture: bool = True,
+        check: bool = True,
+        shell: bool = False,
+        stream: bool = False,
+        line_sink: Callable[[str], None] | None = None,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        cwd: str | None = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command.
+
+        Args:
+            cmd: Command and arguments
+            capture: Whether to capture output
+            check: Whether to raise on non-zero exit
+            shell: Whether to run in shell
+            stream: Whether to read merged stdout/stderr line by line,
+                keeping only the last ``tail_lines`` lines (capture is ignored)
+            line_sink: Function called with each streamed output line
+            tail_lines: Number of trailing lines kept when streaming
+            cwd: Working directory for the command
+
+        Returns:
+            CompletedProcess object
+
+        Raises:
+            subprocess.CalledProcessError: If command fails and check=True
+        """
+        async with self._get_semaphore():
+            if stream:
+                stdout, stderr = subprocess.PIPE, subprocess.STDOUT
+            elif capture:
+                stdout, stderr = subprocess.PIPE, subprocess.PIPE
+            else:
+                stdout, stderr = None, None
+
+            kwargs: dict[str, Any] = {
+                "stdin": subprocess.DEVNULL,
+                "stdout": stdout,
+                "stderr": stderr,
+                "cwd": cwd,
+            }
+            if shell:
+                proc = await asyncio.create_subprocess_shell(cmd, **kwargs)
+            else:
+                proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+
+            if stream:
+                out = await self._read_stream(proc, line_sink, tail_lines)
+                err = None
+            else:
+                out_bytes, err_bytes = await proc.communicate()
+                out = self._decode(out_bytes)
+                err = self._decode(err_bytes)
+            returncode = await proc.wait()
+
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, output=out, stderr=err)
+        return subprocess.CompletedProcess(cmd, returncode, stdout=out, stderr=err)
+
+    async def _read_stream(
+        self,
+        proc: asyncio.subprocess.Process,
+        line_sink: Callable[[str], None] | None,
+        tail_lines: int,
+    ) -> str:
+        """Read a process's output line by line, keeping only the trailing lines."""
+        assert proc.stdout is not None
+        tail: deque[str] = deque(maxlen=tail_lines)
+        pending = b""
+
+        def emit(raw: bytes) -> None:
+            # Progress output redraws with carriage returns; keep the last frame
+            line = raw.decode(errors="replace").rsplit("\r", 1)[-1]
+            tail.append(line)
+            if line_sink:
+                line_sink(line)
+
+        while True:
+            chunk = await proc.stdout.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            *lines, pending = (pending + chunk).split(b"\n")
+            for raw in lines:
+                emit(raw)
+            if len(pending) >= READ_CHUNK_SIZE:
+                emit(pending)
+                pending = b""
+        if pending:
+            emit(pending)
+
+        return "\n".join(tail)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @staticmethod
+    def _decode(data: bytes | None) -> str | None:
+        """Decode captured output."""
+        return None if data is None else data.decode(errors="replace")
@@ -0,0 +1,255 @@
+"""Dependency-aware scheduling of installer steps."""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from pelican_installer.utils.journal import CheckpointJournal
+
+# Resource tags a task can hold while it runs
+APT_LOCK = "apt"
+NETWORK = "network"
+DISK = "disk"
+
+# How many running tasks may hold each resource at once
+RESOURCE_LIMITS = {
+    APT_LOCK: 1,
+    NETWORK: 3,
+    DISK: 2,
+}
+
+# Scheduler and task the current worker thread is running
+_current = threading.local()
+
+
+def report_progress(fraction: float, detail: str | None = None) -> None:
+    """
+    Report how far the calling task has got.
+
+    Does nothing when not called from a task run by a TaskScheduler.
+
+    Args:
+        fraction: Completed part of the task, from 0 to 1
+        detail: Short status shown next to the task's label
+    """
+    scheduler = getattr(_current, "scheduler", None)
+    if scheduler is not None:
+        scheduler._report(_current.task, fraction, detail)
+
+
+@dataclass(frozen=True)
+class InstallTask:
+    """A single installer step."""
+
+    name: str
+    label: str
+    run: Callable[[], None]
+    after: tuple[str, ...] = ()
+    resources: frozenset[str] = frozenset()
+
+    # Cheap check whether the step's result is already in place
+    satisfied: Callable[[], bool] | None = None
+
+
+class TaskScheduler:
+    """Run installer tasks in parallel where dependencies and resources allow.
+
+    A task starts once every task named in ``after`` has finished and all of
+    its resource tags are below their limit. Dependencies on tasks that are
+    not part of the schedule are treated as already satisfied, so an
+    installer's tasks can run on their own or merged with another's.
+
+    In converge mode a task is skipped when its ``satisfied`` check passes
+    and none of its dependencies actually ran in this schedule.
+    """
+
+    def __init__(
+        self,
+        tasks: list[InstallTask],
+        on_update: Callable[[int, list[InstallTask]], None] | None = None,
+        max_workers: int = 4,
+        resource_limits: dict[str, int] | None = None,
+        journal: CheckpointJournal | None = None,
+        converge: bool = False,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            tasks: Tasks to run; ties are started in list order
+            on_update: Function to call with (progress, active_tasks) whenever
+                a task starts, finishes or reports progress; labels of active
+                tasks include their reported detail
+            max_workers: Maximum number of tasks running at once
+            resource_limits: Override for RESOURCE_LIMITS
+            journal: Journal of steps completed by earlier runs; those are
+                skipped and newly completed ones are recorded
+            converge: Whether to skip tasks whose ``satisfied`` check passes
+        """
+        self.tasks = tasks
+        self.on_update = on_update
+        self.max_workers = max_workers
+        self.resource_limits = resource_limits or RESOURCE_LIMITS
+        self.journal = journal
+        self.converge = converge
+        self.skipped: list[str] = []
+        self._lock = threading.Lock()
+        self._done_count = 0
+        self._active: list[InstallTask] = []
+        self._fractions: dict[str, float] = {}
+        self._details: dict[str, str] = {}
+        self._check_graph()
+
+    def run(self) -> None:
+        """
+        Run all tasks.
+
+        Raises:
+            Exception: The first error raised by a task, once the tasks that
+                were already running have finished
+        """
+        names = {task.name for task in self.tasks}
+        done = self.journal.completed() & names if self.journal else set()
+        pending = [task for task in self.tasks if task.name not in done]
+        # Tasks that did work (not skipped); their dependents must run too
+        changed = set(done)
+        running: dict[Future, InstallTask] = {}
+        in_use: Counter[str] = Counter()
+        error: BaseException | None = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while running or (pending and error is None):
+                if error is None:
+                    for task in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        if self._is_ready(task, names, done, in_use):
+                            pending.remove(task)
+                            in_use.update(task.resources)
+                            upstream_changed = any(dep in changed for dep in task.after)
+                            running[pool.submit(self._run_task, task, upstream_changed)] = task
+                    self._notify(done, running)
+                    if not running:
+                        raise RuntimeError("No runnable tasks; check resource limits")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    in_use.subtract(task.resources)
+                    with self._lock:
+                        self._fractions.pop(task.name, None)
+                        self._details.pop(task.name, None)
+                    exc = future.exception()
+                    if exc is not None:
+                        error = error or exc
+                    else:
+                        if future.result():
+                            self.skipped.append(task.name)
+                        else:
+                            changed.add(task.name)
+                        done.add(task.name)
+                        if self.journal:
+                            self.journal.mark_done(task.name)
+                self._notify(done, running)
+
+        if error is not None:
+            raise error
+
+    def _run_task(self, task: InstallTask, upstream_changed: bool) -> bool:
+        """
+        Run a task unless converge mode finds it already satisfied.
+
+        Args:
+            task: Task to run
+            upstream_changed: Whether any dependency of the task ran
+
+        Returns:
+            True if the task was skipped
+        """
+        if self.converge and not upstream_changed and task.satisfied is not None:
+            try:
+                if task.satisfied():
+                    return True
+            except Exception:
+                # A failing check just means the step has to run
+                pass
+        _current.scheduler, _current.task = self, task
+        try:
+            task.run()
+        finally:
+            _current.scheduler = _current.task = None
+        return False
+
+    def _report(self, task: InstallTask, fraction: float, detail: str | None) -> None:
+        """Record progress reported by a running task."""
+        with self._lock:
+            self._fractions[task.name] = min(max(fraction, 0.0), 1.0)
+            if detail is not None:
+                self._details[task.name] = detail
+        self._emit()
+
+    def _is_ready(
+        self,
+        task: InstallTask,
+        names: set[str],
+        done: set[str],
+        in_use: Counter[str],
+    ) -> bool:
+        """Check if a task's dependencies are done and its resources are free."""
+        if any(dep in names and dep not in done for dep in task.after):
+            return False
+        return all(
+            in_use[resource] < self.resource_limits.get(resource, 1)
+            for resource in task.resources
+        )
+
+    def _notify(self, done: set[str], running: dict[Future, InstallTask]) -> None:
+        """Report progress and the currently active tasks."""
+        with self._lock:
+            self._done_count = len(done)
+            self._active = list(running.values())
+        self._emit()
+
+    def _emit(self) -> None:
+        """Call on_update with progress including partially completed tasks."""
+        if not self.on_update:
+            return
+        with self._lock:
+            completed = self._done_count + sum(self._fractions.values())
+            active = [
+                replace(task, label=f"{task.label} ({self._details[task.name]})")
+                if task.name in self._details
+                else task
+                for task in self._active
+            ]
+        progress = int(100 * completed / len(self.tasks)) if self.tasks else 100
+        self.on_update(progress, active)
+
+    def _check_graph(self) -> None:
+        """Reject duplicate task names and dependency cycles."""
+        by_name: dict[str, InstallTask] = {}
+        for task in self.tasks:
+            if task.name in by_name:
+                raise ValueError(f"Duplicate task: {task.name}")
+            by_name[task.name] = task
+
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited or name not in by_name:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle at task: {name}")
+            visiting.add(name)
+            for dep in by_name[name].after:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in by_name:
+            visit(name)
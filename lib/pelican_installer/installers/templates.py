@@ -0,0 +1,506 @@
+"""Config file templates for the Panel webservers."""
+
+from __future__ import annotations
+
+from pelican_installer.installers.config import ConfigTemplate
+
+NGINX_SITE = ConfigTemplate(
+    """server {
+    listen $port;
+    $listen_v6
+    server_name $domain;
+    root /var/www/pelican/public;
+    index index.php;
+
+    access_log /var/log/nginx/pelican.app-access.log;
+    error_log  /var/log/nginx/pelican.app-error.log error;
+
+    client_max_body_size 100M;
+    client_body_timeout 120s;
+
+    sendfile off;
+
+    location / {
+        try_files $$uri $$uri/ /index.php?$$query_string;
+    }
+
+    location ~ \\.php$$ {
+        fastcgi_split_path_info ^(.+\\.php)(/.+)$$;
+        fastcgi_pass unix:$php_socket;
+        fastcgi_index index.php;
+        include fastcgi_params;
+        fastcgi_param PHP_VALUE "upload_max_filesize = 100M \\n post_max_size=100M";
+        fastcgi_param SCRIPT_FILENAME $$document_root$$fastcgi_script_name;
+        fastcgi_param HTTP_PROXY "";
+        fastcgi_intercept_errors off;
+        fastcgi_buffer_size 16k;
+        fastcgi_buffers 4 16k;
+        fastcgi_connect_timeout 300;
+        fastcgi_send_timeout 300;
+        fastcgi_read_timeout 300;
+        include /etc/nginx/fastcgi_params;
+    }
+
+    location ~ /\\.ht {
+        deny all;
+    }
+}
+"""
+)
+
+# Performance profile; optional blocks ($brotli, $microcache, ...) are
+# rendered by PanelInstaller and are empty when disabled
+NGINX_SITE_PERFORMANCE = ConfigTemplate(
+    """upstream pelican_php {
+    server unix:$php_socket;$upstream_keepalive
+}
+
+server {
+    listen $port;
+    $listen_v6
+    server_name $domain;
+    # TLS profile, written once the certificate exists
+    include /etc/nginx/snippets/pelican-tls*.conf;
+    root /var/www/pelican/public;
+    index index.php;
+
+    access_log /var/log/nginx/pelican.app-access.log;
+    error_log  /var/log/nginx/pelican.app-error.log error;
+
+    client_max_body_size 100M;
+    client_body_timeout 120s;
+
+    sendfile on;
+    tcp_nopush on;
+    tcp_nodelay on;
+    keepalive_timeout 65s;
+
+    open_file_cache max=$open_file_cache inactive=60s;
+    open_file_cache_valid 60s;
+    open_file_cache_min_uses 2;
+    open_file_cache_errors on;
+
+    gzip on;
+    gzip_vary on;
+    gzip_proxied any;
+    gzip_comp_level 5;
+    gzip_min_length 1024;
+    gzip_types $compressible_types;
+    # .gz siblings written by the installer
+    gzip_static on;$brotli
+
+    location / {
+        try_files $$uri $$uri/ /index.php?$$query_string;
+    }
+
+    # Vite build output has content hashes in its file names
+    location ^~ /build/assets/ {
+        access_log off;
+        add_header Cache-Control "public, max-age=31536000, immutable";$alt_svc
+        try_files $$uri =404;
+    }
+
+    location ~* \\.(?:css|js|mjs|map|woff2?|ttf|eot|svg|png|jpe?g|gif|webp|avif|ico)$$ {
+        access_log off;
+        add_header Cache-Control "public, max-age=604800";$alt_svc
+        try_files $$uri /index.php?$$query_string;
+    }
+
+    location ~ \\.php$$ {
+        fastcgi_split_path_info ^(.+\\.php)(/.+)$$;
+        fastcgi_pass pelican_php;
+        fastcgi_index index.php;
+        include fastcgi_params;
+        fastcgi_param PHP_VALUE "upload_max_filesize = 100M \\n post_max_size=100M";
+        fastcgi_param SCRIPT_FILENAME $$document_root$$fastcgi_script_name;
+        fastcgi_param HTTP_PROXY "";
+        fastcgi_intercept_errors off;
+        fastcgi_buffer_size 32k;
+        fastcgi_buffers $fastcgi_buffers 16k;
+        fastcgi_connect_timeout 300;
+        fastcgi_send_timeout 300;
+        fastcgi_read_timeout 300;$fastcgi_keep_conn$microcache
+    }
+
+    location ~ /\\.ht {
+        deny all;
+    }
+}
+"""
+)
+
+# TLS profile of the Nginx site, included once the certificate exists.
+# Certbot's options-ssl-nginx.conf already sets the protocols (TLS 1.2 and
+# 1.3), the ciphers and a shared session cache for resumption
+NGINX_TLS = ConfigTemplate(
+    """# X25519 first, then P-256 matching the ECDSA certificate
+ssl_ecdh_curve X25519:prime256v1:secp384r1;$http3
+"""
+)
+
+# Shared cache zone for NGINX_SITE_PERFORMANCE microcaching (http context)
+NGINX_MICROCACHE = ConfigTemplate(
+    """fastcgi_cache_path $cache_dir levels=1:2 keys_zone=pelican:10m max_size=256m inactive=10m use_temp_path=off;
+"""
+)
+
+APACHE_SITE = ConfigTemplate(
+    """<VirtualHost *:$port>
+    ServerName $domain
+    DocumentRoot "/var/www/pelican/public"
+    Protocols h2 h2c http/1.1
+
+    AllowEncodedSlashes NoDecode
+
+    <Directory "/var/www/pelican/public">
+        Require all granted
+        AllowOverride all
+    </Directory>
+
+    # PHP runs in PHP-FPM, so Apache can use the event MPM
+    <FilesMatch "\\.php$$">
+        SetHandler "proxy:unix:$php_socket|fcgi://localhost"
+    </FilesMatch>
+    ProxyTimeout 300
+
+    ErrorLog /var/log/apache2/pelican.app-error.log
+    CustomLog /var/log/apache2/pelican.app-access.log combined
+</VirtualHost>
+"""
+)
+
+# Performance profile: event MPM and keepalive sized to the host
+APACHE_TUNING = ConfigTemplate(
+    """<IfModule mpm_event_module>
+    StartServers $start_servers
+    ServerLimit $server_limit
+    ThreadsPerChild $threads_per_child
+    MaxRequestWorkers $max_request_workers
+    MinSpareThreads $min_spare_threads
+    MaxSpareThreads $max_spare_threads
+    MaxConnectionsPerChild $max_connections_per_child
+</IfModule>
+
+# Idle keepalive connections are handled by the event MPM's listener
+# thread, not by a worker
+KeepAlive On
+KeepAliveTimeout 10
+MaxKeepAliveRequests 1000
+"""
+)
+
+# TLS profile of Apache; mod_ssl has no HTTP/3, and Certbot's
+# options-ssl-apache.conf sets the protocols and ciphers
+APACHE_TLS = ConfigTemplate(
+    """<IfModule ssl_module>
+    # X25519 first, then P-256 matching the ECDSA certificate
+    SSLOpenSSLConfCmd Curves X25519:prime256v1:secp384r1
+    # Resumed sessions skip the full handshake
+    SSLSessionCacheTimeout 86400
+</IfModule>
+"""
+)
+
+CADDYFILE = ConfigTemplate(
+    """$domain {
+    root * /var/www/pelican/public
+    file_server
+
+    php_fastcgi unix/$php_socket
+
+    header {
+        -Server
+        -X-Powered-By
+        Referrer-Policy "same-origin"
+        X-Frame-Options "deny"
+        X-XSS-Protection "1; mode=block"
+        X-Content-Type-Options "nosniff"
+    }
+}
+"""
+)
+
+# Performance profile; the PHP-FPM pool size bounds concurrent requests,
+# so requests beyond it wait briefly for a free worker instead of queueing
+# in the pool's socket backlog
+CADDYFILE_PERFORMANCE = ConfigTemplate(
+    """$domain {$tls
+    root * /var/www/pelican/public
+    encode zstd gzip
+
+    # Vite build output has content hashes in its file names
+    @hashed path /build/assets/*
+    header @hashed Cache-Control "public, max-age=31536000, immutable"
+
+    @static {
+        path *.css *.js *.mjs *.map *.woff *.woff2 *.ttf *.eot *.svg *.png *.jpg *.jpeg *.gif *.webp *.avif *.ico
+        not path /build/assets/*
+    }
+    header @static Cache-Control "public, max-age=604800"
+
+    php_fastcgi unix/$php_socket {
+        dial_timeout 3s
+        read_timeout 300s
+        write_timeout 300s
+        fail_duration 1s
+        unhealthy_request_count $max_children
+        lb_try_duration 10s
+        lb_try_interval 100ms
+    }
+
+    file_server {
+        precompressed zstd br gzip
+    }
+
+    header {
+        -Server
+        -X-Powered-By
+        Referrer-Policy "same-origin"
+        X-Frame-Options "deny"
+        X-XSS-Protection "1; mode=block"
+        X-Content-Type-Options "nosniff"
+    }
+}
+"""
+)
+
+# The installer's hash header uses "#", which PHP ini files don't accept
+FPM_POOL = ConfigTemplate(
+    """; Generated by pelican-installer
+[pelican]
+user = $user
+group = $user
+
+listen = $socket
+listen.owner = $listen_owner
+listen.group = $listen_owner
+listen.mode = 0660
+
+pm = $pm
+pm.max_children = $max_children
+pm.start_servers = $start_servers
+pm.min_spare_servers = $min_spare_servers
+pm.max_spare_servers = $max_spare_servers
+pm.process_idle_timeout = 10s
+pm.max_requests = $max_requests
+
+; Upload limits of the panel, whichever webserver is in front
+php_admin_value[upload_max_filesize] = 100M
+php_admin_value[post_max_size] = 100M
+
+; OPcache behaviour of this pool only; the shared sizes are in conf.d.
+; Code only changes through the installer, which reloads PHP-FPM
+php_admin_value[opcache.validate_timestamps] = 0
+php_admin_value[opcache.jit] = tracing
+"""
+)
+
+# Applies to every PHP-FPM pool, as OPcache memory is shared by the master,
+# so it only holds sizes; FPM_POOL switches the JIT on for the panel
+OPCACHE_INI = ConfigTemplate(
+    """; Generated by pelican-installer
+opcache.enable = 1
+opcache.memory_consumption = $memory_consumption
+opcache.interned_strings_buffer = $interned_strings_buffer
+opcache.max_accelerated_files = $max_accelerated_files
+; Reserved for the JIT, which stays off unless a pool turns it on
+opcache.jit = off
+opcache.jit_buffer_size = ${jit_buffer_size}M
+$preload"""
+)
+
+# Loads the framework classes (with their parents) into OPcache when
+# PHP-FPM starts; classes that fail to load are skipped
+OPCACHE_PRELOAD = ConfigTemplate(
+    """<?php
+// Generated by pelican-installer
+
+// PHP-FPM doesn't start if preloading fails, such as while vendor/ is replaced
+if (!is_file('$panel_dir/vendor/autoload.php')
+    || !is_file('$panel_dir/vendor/composer/autoload_classmap.php')) {
+    return;
+}
+require '$panel_dir/vendor/autoload.php';
+
+$$classmap = require '$panel_dir/vendor/composer/autoload_classmap.php';
+foreach (array_keys($$classmap) as $$class) {
+    if (!str_starts_with($$class, 'Illuminate\\\\')) {
+        continue;
+    }
+    try {
+        class_exists($$class) || interface_exists($$class) || trait_exists($$class);
+    } catch (\\Throwable) {
+    }
+}
+"""
+)
+
+OCTANE_SERVICE = ConfigTemplate(
+    """[Unit]
+Description=Pelican Panel (Laravel Octane, $server)
+After=network.target
+
+[Service]
+User=$user
+Group=$user
+WorkingDirectory=$panel_dir
+ExecStart=/usr/bin/php $panel_dir/artisan octane:start --server=$server --host=127.0.0.1 --port=$port --workers=$workers --max-requests=$max_requests
+ExecReload=/usr/bin/php $panel_dir/artisan octane:reload --server=$server
+Restart=always
+RestartSec=3
+LimitNOFILE=65535
+
+[Install]
+WantedBy=multi-user.target
+"""
+)
+
+# Included at the end of redis.conf (or valkey.conf), overriding its values
+REDIS_CONFIG = ConfigTemplate(
+    """# The panel connects over a unix socket; the web user is in the server's group
+unixsocket $socket
+unixsocketperm 770
+
+maxmemory ${maxmemory}mb
+maxmemory-policy $policy
+"""
+)
+
+# Reverse-proxy configs for Octane: static files are served directly,
+# everything else goes to the application server
+NGINX_OCTANE_SITE = ConfigTemplate(
+    """map $$http_upgrade $$connection_upgrade {
+    default upgrade;
+    ''      close;
+}
+
+upstream pelican_octane {
+    server 127.0.0.1:$octane_port;
+    keepalive 16;
+}
+
+server {
+    listen $port;
+    $listen_v6
+    server_name $domain;
+    # TLS profile, written once the certificate exists
+    include /etc/nginx/snippets/pelican-tls*.conf;
+    root /var/www/pelican/public;
+    index index.php;
+
+    access_log /var/log/nginx/pelican.app-access.log;
+    error_log  /var/log/nginx/pelican.app-error.log error;
+
+    client_max_body_size 100M;
+    client_body_timeout 120s;
+
+    sendfile on;
+    tcp_nopush on;
+
+    gzip on;
+    gzip_vary on;
+    gzip_proxied any;
+    gzip_comp_level 5;
+    gzip_min_length 1024;
+    gzip_types $compressible_types;
+    # .gz siblings written by the installer
+    gzip_static on;
+
+    location / {
+        try_files $$uri @octane;
+    }
+
+    # PHP files in public/ are the application's, never static files
+    location ~ \\.php$$ {
+        try_files /not_exists @octane;
+    }
+
+    # Vite build output has content hashes in its file names
+    location ^~ /build/assets/ {
+        access_log off;
+        add_header Cache-Control "public, max-age=31536000, immutable";$alt_svc
+        try_files $$uri =404;
+    }
+
+    location @octane {
+        proxy_http_version 1.1;
+        proxy_set_header Host $$http_host;
+        proxy_set_header Scheme $$scheme;
+        proxy_set_header SERVER_PORT $$server_port;
+        proxy_set_header REMOTE_ADDR $$remote_addr;
+        proxy_set_header X-Forwarded-For $$proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $$scheme;
+        proxy_set_header Upgrade $$http_upgrade;
+        proxy_set_header Connection $$connection_upgrade;
+        proxy_read_timeout 300s;
+        proxy_pass http://pelican_octane;
+    }
+
+    location ~ /\\.(?!well-known) {
+        deny all;
+    }
+}
+"""
+)
+
+APACHE_OCTANE_SITE = ConfigTemplate(
+    """<VirtualHost *:$port>
+    ServerName $domain
+    DocumentRoot "/var/www/pelican/public"
+
+    AllowEncodedSlashes NoDecode
+
+    <Directory "/var/www/pelican/public">
+        Require all granted
+        AllowOverride None
+    </Directory>
+    Protocols h2 h2c http/1.1
+
+    # Existing static files are served by Apache, the rest (including
+    # PHP files in public/) by Octane
+    RewriteEngine On
+    RewriteCond %{DOCUMENT_ROOT}%{REQUEST_URI} !-f [OR]
+    RewriteCond %{REQUEST_URI} \\.php$$
+    RewriteRule ^/(.*)$$ http://127.0.0.1:$octane_port/$$1 [P,L]
+
+    ProxyPreserveHost On
+    ProxyTimeout 300
+    RequestHeader set X-Forwarded-Proto expr=%{REQUEST_SCHEME}
+
+    ErrorLog /var/log/apache2/pelican.app-error.log
+    CustomLog /var/log/apache2/pelican.app-access.log combined
+</VirtualHost>
+"""
+)
+
+CADDY_OCTANE = ConfigTemplate(
+    """$domain {$tls
+    root * /var/www/pelican/public
+    encode zstd gzip
+
+    # PHP files in public/ are the application's, never static files
+    @static {
+        file
+        not path *.php
+    }
+    handle @static {
+        file_server {
+            precompressed zstd br gzip
+        }
+    }
+
+    handle {
+        reverse_proxy 127.0.0.1:$octane_port
+    }
+
+    header {
+        -Server
+        -X-Powered-By
+        Referrer-Policy "same-origin"
+        X-Frame-Options "deny"
+        X-XSS-Protection "1; mode=block"
+        X-Content-Type-Options "nosniff"
+    }
+}
+"""
+)
@@ -0,0 +1,320 @@
+"""Service settings sized to the host's resources."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from pelican_installer.utils.hardware import HardwareInfo
+
+# Children of the distro's default PHP-FPM pool
+DEFAULT_FPM_CHILDREN = 5
+
+# Memory of a panel PHP-FPM worker when none is running to measure, and
+# the least a measured worker is assumed to need
+DEFAULT_FPM_WORKER_MB = 64
+
+# Requests a PHP-FPM worker serves before it is replaced
+FPM_MAX_REQUESTS = 500
+
+# Memory of an Octane worker, which keeps the booted application
+DEFAULT_OCTANE_WORKER_MB = 96
+
+# Requests an Octane worker serves before it is recycled
+OCTANE_MAX_REQUESTS = 1000
+
+
+def php_memory_budget(hardware: HardwareInfo) -> tuple[int, int]:
+    """
+    Get the memory PHP workers may use.
+
+    Derived from the total RAM rather than what is free right now, so the
+    result is the same on every run.
+
+    Returns:
+        Budget and the reserve kept for the OS, database and webserver (MB)
+    """
+    reserve = max(256, hardware.memory_mb // 4)
+    return max(128, hardware.memory_mb - reserve), reserve
+
+
+@dataclass
+class NginxTuning:
+    """Nginx settings for the performance profile."""
+
+    worker_rlimit_nofile: int
+    worker_connections: int
+    open_file_cache: int
+    fastcgi_buffers: int
+    # Idle FastCGI connections kept per worker (0 disables keepalive)
+    upstream_keepalive: int
+
+    @classmethod
+    def for_host(
+        cls, hardware: HardwareInfo, fpm_children: int = DEFAULT_FPM_CHILDREN
+    ) -> NginxTuning:
+        """
+        Size Nginx for a host.
+
+        Args:
+            hardware: Host resources
+            fpm_children: Size of the PHP-FPM pool Nginx passes requests to
+
+        Returns:
+            Tuned settings
+        """
+        memory_gb = max(1, hardware.memory_mb // 1024)
+        rlimit = max(1024, min(hardware.fd_limit, 65535))
+        # A proxied request holds two descriptors (client and upstream)
+        connections = max(768, min(rlimit // 2, 1024 * memory_gb, 16384))
+        # PHP-FPM children serve one connection at a time, so idle kept-alive
+        # connections must leave at least half of the pool free
+        keepalive = min(4, fpm_children // (2 * hardware.cpus))
+        return cls(
+            worker_rlimit_nofile=rlimit,
+            worker_connections=connections,
+            open_file_cache=max(1000, min(hardware.memory_mb * 4, 20000)),
+            fastcgi_buffers=16 if hardware.memory_mb >= 2048 else 8,
+            upstream_keepalive=keepalive,
+        )
+
+    def apply_to_main_config(self, config: str) -> str:
+        """
+        Set the worker limits in the main nginx.conf.
+
+        These directives are only valid in the main and events contexts,
+        which site configs cannot reach, so the distro's values are replaced.
+
+        Args:
+            config: Content of nginx.conf
+
+        Returns:
+            Updated content
+        """
+        config = re.sub(r"(?m)^(\s*)worker_processes\s+[^;]+;", r"\1worker_processes auto;", config)
+        rlimit = f"worker_rlimit_nofile {self.worker_rlimit_nofile};"
+        config, found = re.subn(
+            r"(?m)^(\s*)worker_rlimit_nofile\s+[^;]+;", rf"\g<1>{rlimit}", config
+        )
+        if not found:
+            config = re.sub(
+                r"(?m)^(\s*worker_processes auto;)$", rf"\1\n{rlimit}", config, count=1
+            )
+        return re.sub(
+            r"(?m)^(\s*)worker_connections\s+[^;]+;",
+            rf"\g<1>worker_connections {self.worker_connections};",
+            config,
+        )
+
+
+@dataclass
+class FpmPoolTuning:
+    """PHP-FPM process manager settings for the panel pool."""
+
+    pm: str
+    max_children: int
+    start_servers: int
+    min_spare_servers: int
+    max_spare_servers: int
+    max_requests: int
+    # How the values were derived, for display
+    reasons: list[str]
+
+    @classmethod
+    def for_host(cls, hardware: HardwareInfo, worker_mb: float | None = None) -> FpmPoolTuning:
+        """
+        Size the pool from available memory and worker size.
+
+        Args:
+            hardware: Host resources
+            worker_mb: Measured average memory of panel workers that have
+                served requests, if any are running
+
+        Returns:
+            Tuned settings
+        """
+        budget, reserve = php_memory_budget(hardware)
+        worker = DEFAULT_FPM_WORKER_MB
+        if worker_mb:
+            # Rounded up to 8 MB, so small changes don't resize the pool
+            worker = max(DEFAULT_FPM_WORKER_MB, -(-round(worker_mb) // 8) * 8)
+        children = max(2, min(budget // worker, 256))
+
+        min_spare = max(1, min(hardware.cpus, children // 4))
+        max_spare = max(min_spare + 1, min(hardware.cpus * 3, children // 2))
+        start = min_spare + (max_spare - min_spare) // 2
+
+        if not worker_mb:
+            measured = "estimate, no busy panel workers running"
+        elif worker_mb < DEFAULT_FPM_WORKER_MB:
+            measured = f"measured {worker_mb:.0f} MB, raised to the minimum"
+        else:
+            measured = "measured"
+        reasons = [
+            f"{budget} MB of {hardware.memory_mb} MB RAM for PHP "
+            f"({reserve} MB kept for the system)",
+            f"~{worker} MB per worker ({measured})",
+            f"max_children = {budget} MB / {worker} MB = {budget // worker}"
+            + (f", limited to {children}" if children != budget // worker else ""),
+        ]
+        if hardware.memory_mb < 1024:
+            pm = "ondemand"
+            reasons.append("pm = ondemand: under 1 GB RAM, idle workers are stopped")
+        else:
+            pm = "dynamic"
+            reasons.append(
+                f"pm = dynamic: {min_spare}-{max_spare} spare workers for {hardware.cpus} CPU(s)"
+            )
+        reasons.append(
+            f"pm.max_requests = {FPM_MAX_REQUESTS}: workers are recycled to contain leaks"
+        )
+        return cls(
+            pm=pm,
+            max_children=children,
+            start_servers=start,
+            min_spare_servers=min_spare,
+            max_spare_servers=max_spare,
+            max_requests=FPM_MAX_REQUESTS,
+            reasons=reasons,
+        )
+
+    def describe(self) -> list[str]:
+        """Summarize the settings followed by their reasoning."""
+        settings = f"pm = {self.pm}, max_children = {self.max_children}"
+        if self.pm == "dynamic":
+            settings += (
+                f", start = {self.start_servers}, "
+                f"spare = {self.min_spare_servers}-{self.max_spare_servers}"
+            )
+        settings += f", max_requests = {self.max_requests}"
+        return [settings, *self.reasons]
+
+
+@dataclass
+class OpcacheTuning:
+    """OPcache and JIT settings for PHP-FPM."""
+
+    memory_consumption: int
+    interned_strings_buffer: int
+    max_accelerated_files: int
+    jit_buffer_size: int
+
+    @classmethod
+    def for_host(cls, hardware: HardwareInfo, php_files: int) -> OpcacheTuning:
+        """
+        Size OPcache for a host and code base.
+
+        Args:
+            hardware: Host resources
+            php_files: Number of PHP files of the panel (including vendor/)
+
+        Returns:
+            Tuned settings (sizes in MB)
+        """
+        large = hardware.memory_mb >= 2048
+        # Room for twice the current files, so updates don't fill the table
+        max_files = max(10000, -(-php_files * 2 // 1000) * 1000)
+        return cls(
+            memory_consumption=256 if large else 128,
+            interned_strings_buffer=32 if large else 16,
+            max_accelerated_files=min(max_files, 1000000),
+            jit_buffer_size=64 if large else 32,
+        )
+
+
+@dataclass
+class OctaneTuning:
+    """Worker settings of an Octane application server."""
+
+    workers: int
+    max_requests: int
+
+    @classmethod
+    def for_host(cls, hardware: HardwareInfo) -> OctaneTuning:
+        """
+        Size Octane for a host.
+
+        Two workers per core keep the CPUs busy while others wait on the
+        database, as long as they fit in memory.
+
+        Args:
+            hardware: Host resources
+
+        Returns:
+            Tuned settings
+        """
+        budget, _ = php_memory_budget(hardware)
+        workers = max(2, min(hardware.cpus * 2, budget // DEFAULT_OCTANE_WORKER_MB))
+        return cls(workers=workers, max_requests=OCTANE_MAX_REQUESTS)
+
+
+@dataclass
+class ApacheTuning:
+    """Event MPM settings for the performance profile."""
+
+    start_servers: int
+    server_limit: int
+    threads_per_child: int
+    max_request_workers: int
+    min_spare_threads: int
+    max_spare_threads: int
+    max_connections_per_child: int
+
+    THREADS_PER_CHILD = 25
+    # Memory of an Apache child with its threads, without PHP
+    CHILD_MB = 20
+
+    @classmethod
+    def for_host(cls, hardware: HardwareInfo) -> ApacheTuning:
+        """
+        Size the event MPM for a host.
+
+        Children are limited to four per core and to a quarter of the RAM.
+
+        Args:
+            hardware: Host resources
+
+        Returns:
+            Tuned settings
+        """
+        threads = cls.THREADS_PER_CHILD
+        server_limit = max(2, min(hardware.cpus * 4, hardware.memory_mb // 4 // cls.CHILD_MB, 64))
+        min_spare = threads * max(1, hardware.cpus // 2)
+        return cls(
+            start_servers=min(server_limit, max(2, hardware.cpus)),
+            server_limit=server_limit,
+            threads_per_child=threads,
+            max_request_workers=server_limit * threads,
+            min_spare_threads=min_spare,
+            max_spare_threads=min_spare + 2 * threads,
+            max_connections_per_child=10000,
+        )
+
+
+@dataclass
+class RedisTuning:
+    """Memory limit of the Redis or Valkey server holding the panel's data."""
+
+    maxmemory_mb: int
+    maxmemory_policy: str
+
+    @classmethod
+    def for_host(cls, hardware: HardwareInfo) -> RedisTuning:
+        """
+        Size Redis for a host.
+
+        An eighth of the RAM leaves room for PHP and the database; the
+        panel's cache and sessions rarely need more than a few hundred MB.
+
+        Args:
+            hardware: Host resources
+
+        Returns:
+            Tuned settings
+        """
+        return cls(
+            maxmemory_mb=max(64, min(hardware.memory_mb // 8, 2048)),
+            # Cache entries and sessions expire; queued jobs don't and must
+            # never be evicted
+            maxmemory_policy="volatile-lru",
+        )
@@ -6,6 +6,10 @@ import platform
 from pathlib import Path
 
 from pelican_installer.installers.base import BaseInstaller
+from pelican_installer.installers.config import DAEMON_RELOAD, restart_action
+from pelican_installer.installers.scheduler import DISK, NETWORK, InstallTask
+from pelican_installer.utils.files import file_has_content
+from pelican_installer.utils.releases import latest_release, latest_release_tag
 
 
 class WingsInstaller(BaseInstaller):
@@ -13,35 +17,111 @@ class WingsInstaller(BaseInstaller):
 
     WINGS_BINARY = Path("/usr/local/bin/wings")
     CONFIG_DIR = Path("/etc/pelican")
+    GITHUB_REPO = "pelican-dev/wings"
     GITHUB_RELEASE_BASE = "https://github.com/pelican-dev/wings/releases/latest/download"
 
-    def install(self) -> None:
-        """Install Wings."""
-        self.update_progress(10, "Creating directories...")
-        self._create_directories()
+    SERVICE_FILE = Path("/etc/systemd/system/wings.service")
+    DAEMON_CONFIG = Path("/etc/docker/daemon.json")
+    DIRECTORIES = [
+        CONFIG_DIR,
+        Path("/var/run/wings"),
+        Path("/var/lib/pelican/volumes"),
+        Path("/var/lib/pelican/backups"),
+    ]
 
-        self.update_progress(30, "Downloading Wings binary...")
-        self._download_wings()
+    # Marker recording the installed release
+    RELEASE_MARKER = CONFIG_DIR / ".installer-wings-release"
 
-        self.update_progress(60, "Setting up systemd service...")
-        self._setup_systemd_service()
+    SERVICE_CONTENT = """[Unit]
+Description=Wings Daemon
+After=docker.service
+Requires=docker.service
+PartOf=docker.service
 
-        self.update_progress(80, "Configuring Docker network...")
-        self._configure_docker()
+[Service]
+Type=simple
+User=root
+WorkingDirectory=/etc/pelican
+LimitNOFILE=4096
+PIDFile=/var/run/wings/daemon.pid
+ExecStart=/usr/local/bin/wings
+Restart=on-failure
+RestartSec=5s
+StartLimitInterval=180
+StartLimitBurst=30
 
+[Install]
+WantedBy=multi-user.target
+"""
+
+    def install(self) -> None:
+        """Install Wings."""
+        self.run_tasks(self.tasks())
         self.update_progress(100, "Wings installed successfully!")
 
+    def tasks(self) -> list[InstallTask]:
+        """
+        Declare the Wings installation steps.
+
+        Steps depend on the ``deps.*`` tasks of DependencyInstaller; when
+        those are not scheduled alongside, they are assumed to be done.
+
+        Returns:
+            Tasks named ``wings.*``
+        """
+        tasks = [
+            InstallTask(
+                name="wings.directories",
+                label="Creating directories",
+                run=self._create_directories,
+                resources=frozenset({DISK}),
+                satisfied=self._has_directories,
+            ),
+            InstallTask(
+                name="wings.download",
+                label="Downloading Wings binary",
+                run=self._download_wings,
+                after=("wings.directories", "deps.packages"),
+                resources=frozenset({NETWORK, DISK}),
+                satisfied=self._is_latest_release,
+            ),
+            InstallTask(
+                name="wings.service",
+                label="Setting up systemd service",
+                run=self._setup_systemd_service,
+                after=("wings.directories", "wings.download"),
+                satisfied=self._is_service_configured,
+            ),
+            InstallTask(
+                name="wings.docker",
+                label="Configuring Docker network",
+                run=self._configure_docker,
+                after=("deps.docker",),
+                satisfied=self._is_docker_configured,
+            ),
+        ]
+
+        # Reload services once, after every config is written
+        tasks.append(
+            InstallTask(
+                name="wings.services",
+                label="Reloading services",
+                run=self.apply_config_changes,
+                after=tuple(task.name for task in tasks),
+                satisfied=lambda: not self.configs.pending(),
+            )
+        )
+        return tasks
+
     def _create_directories(self) -> None:
         """Create required directories for Wings."""
-        directories = [
-            self.CONFIG_DIR,
-            Path("/var/run/wings"),
-            Path("/var/lib/pelican/volumes"),
-            Path("/var/lib/pelican/backups"),
-        ]
+        with self.files.batch():
+            for directory in self.DIRECTORIES:
+                self.files.mkdir(directory)
 
-        for directory in directories:
-            self.run_command(["mkdir", "-p", str(directory)], use_sudo=True)
+    def _has_directories(self) -> bool:
+        """Check if all Wings directories exist."""
+        return all(directory.is_dir() for directory in self.DIRECTORIES)
 
     def _download_wings(self) -> None:
         """Download Wings binary for the current architecture."""
@@ -54,52 +134,64 @@ class WingsInstaller(BaseInstaller):
         else:
             raise RuntimeError(f"Unsupported architecture: {machine}")
 
-        download_url = f"{self.GITHUB_RELEASE_BASE}/wings_linux_{arch}"
-
-        # Download
-        self.run_command(
-            ["curl", "-L", "-o", str(self.WINGS_BINARY), download_url],
-            use_sudo=True,
+        asset_name = f"wings_linux_{arch}"
+        release = latest_release(self.GITHUB_REPO)
+        tag = release.tag if release else None
+        asset = release.assets.get(asset_name) if release else None
+
+        # Reuse a cached copy of this release, or download it (resumable
+        # and verified against the release digest)
+        binary = self.fetch_artifact(
+            asset.url if asset else f"{self.GITHUB_RELEASE_BASE}/{asset_name}",
+            asset_name,
+            key=f"{self.GITHUB_REPO}@{tag}/{asset_name}" if tag else None,
+            sha256=asset.sha256 if asset else None,
         )
 
-        # Make executable
-        self.run_command(["chmod", "u+x", str(self.WINGS_BINARY)], use_sudo=True)
+        with self.files.batch():
+            # Install as an executable; the binary is replaced atomically
+            self.files.copy_file(binary, self.WINGS_BINARY, mode=0o755)
+
+            # Record the release so converge mode can tell if it is current
+            if tag:
+                self.files.write_file(self.RELEASE_MARKER, f"{tag}\n")
+        if not tag:
+            binary.unlink()
+
+    def _is_latest_release(self) -> bool:
+        """Check if the installed Wings binary is the latest release."""
+        if not self.WINGS_BINARY.exists():
+            return False
+        try:
+            installed = self.RELEASE_MARKER.read_text().strip()
+        except OSError:
+            return False
+        return installed == latest_release_tag(self.GITHUB_REPO)
 
     def _setup_systemd_service(self) -> None:
         """Create and enable Wings systemd service."""
-        service_file = "/etc/systemd/system/wings.service"
-        service_content = """[Unit]
-Description=Wings Daemon
-After=docker.service
-Requires=docker.service
-PartOf=docker.service
+        # Write service file; systemd is reloaded once all configs are written
+        self.configs.write(self.SERVICE_FILE, self.SERVICE_CONTENT, actions=(DAEMON_RELOAD,))
 
-[Service]
-Type=simple
-User=root
-WorkingDirectory=/etc/pelican
-LimitNOFILE=4096
-PIDFile=/var/run/wings/daemon.pid
-ExecStart=/usr/local/bin/wings
-Restart=on-failure
-RestartSec=5s
-StartLimitInterval=180
-StartLimitBurst=30
-
-[Install]
-WantedBy=multi-user.target
-"""
+        # Enable service (but don't start yet - needs config)
+        self.run_command(["systemctl", "enable", "wings"], use_sudo=True, check=False)
 
-        # Write service file
-        self.run_command(
-            ["bash", "-c", f"cat > {service_file} << 'EOF'\n{service_content}\nEOF"],
+    def _is_service_configured(self) -> bool:
+        """Check if the unit file is current and the service is enabled."""
+        return file_has_content(self.SERVICE_FILE, self.SERVICE_CONTENT) and Path(
+            "/etc/systemd/system/multi-user.target.wants/wings.service"
+        ).exists()
+
+    def _is_docker_configured(self) -> bool:
+        """Check if the Docker network and daemon config exist."""
+        if not self.DAEMON_CONFIG.exists():
+            return False
+        result = self.run_command(
+            ["docker", "network", "inspect", "pelican_network"],
             use_sudo=True,
-            shell=False,
+            check=False,
         )
-
-        # Reload systemd and enable service (but don't start yet - needs config)
-        self.run_command(["systemctl", "daemon-reload"], use_sudo=True)
-        self.run_command(["systemctl", "enable", "wings"], use_sudo=True, check=False)
+        return result.returncode == 0
 
     def _configure_docker(self) -> None:
         """Configure Docker for Wings."""
@@ -117,7 +209,7 @@ WantedBy=multi-user.target
         )
 
         # Configure Docker daemon
-        daemon_config = Path("/etc/docker/daemon.json")
+        daemon_config = self.DAEMON_CONFIG
         if not daemon_config.exists():
             config_content = """{
   "log-driver": "json-file",
@@ -128,16 +220,6 @@ WantedBy=multi-user.target
   "storage-driver": "overlay2"
 }
 """
-            self.run_command(
-                ["bash", "-c", f"echo '{config_content}' > {daemon_config}"],
-                use_sudo=True,
-                shell=False,
-            )
-
-            # Restart Docker to apply config
-            self.run_command(
-                ["systemctl", "restart", "docker"],
-                use_sudo=True,
-                check=False,
-            )
+            # Docker is restarted once all configs are written
+            self.configs.write(daemon_config, config_content, actions=(restart_action("docker"),))
 
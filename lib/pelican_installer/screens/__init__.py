@@ -1,17 +1,23 @@
 """Screen modules for the installer."""
 
+from pelican_installer.screens.cache import CacheScreen
 from pelican_installer.screens.domain import DomainScreen
 from pelican_installer.screens.install import InstallScreen
 from pelican_installer.screens.menu import MenuScreen
+from pelican_installer.screens.octane import OctaneScreen
+from pelican_installer.screens.profile import ProfileScreen
 from pelican_installer.screens.protocol import ProtocolScreen
 from pelican_installer.screens.ssl import SSLScreen
 from pelican_installer.screens.summary import SummaryScreen
 from pelican_installer.screens.webserver import WebserverScreen
 
 __all__ = [
+    "CacheScreen",
     "DomainScreen",
     "InstallScreen",
     "MenuScreen",
+    "OctaneScreen",
+    "ProfileScreen",
     "ProtocolScreen",
     "SSLScreen",
     "SummaryScreen",
@@ -0,0 +1,82 @@
+"""Cache server selection screen."""
+
+from __future__ import annotations
+
+from textual import on
+from textual.app import ComposeResult
+from textual.containers import Container
+from textual.screen import Screen
+from textual.widgets import Button, Static
+
+from pelican_installer.components.menu import InstallerMenu
+from pelican_installer.utils.state import InstallState
+from pelican_installer.utils.system import SystemDetector
+
+
+class CacheScreen(Screen[str]):
+    """Screen for selecting the server backing the panel's cache, sessions and queue."""
+
+    CSS = """
+    CacheScreen {
+        align: center middle;
+    }
+    """
+
+    def __init__(self, state: InstallState) -> None:
+        super().__init__()
+        self.state = state
+        # Valkey is only packaged by newer releases (such as Debian 13)
+        self.servers = ["redis", "valkey", "none"]
+        if not SystemDetector.is_package_available("valkey-server"):
+            self.servers.remove("valkey")
+
+    def compose(self) -> ComposeResult:
+        with Container(id="root"):
+            with Container(id="card"):
+                yield Static("Cache, Sessions and Queue", id="title")
+                yield Static(
+                    "Keep them in memory instead of on disk and in the database:",
+                    id="subtitle",
+                )
+                yield InstallerMenu(id="cache-menu")
+                yield Static(
+                    f"Use ↑/↓, 1-{len(self.servers)}, Enter or click to select",
+                    id="hint",
+                )
+                with Container(id="footer"):
+                    yield Button("Back (b)", id="back")
+                    yield Button("Close (c)", id="close")
+
+    def on_mount(self) -> None:
+        """Set up cache server options."""
+        menu = self.query_one("#cache-menu", InstallerMenu)
+        menu.clear_options()
+        labels = {
+            "redis": "Redis (recommended)",
+            "valkey": "Valkey",
+            "none": "None - panel defaults",
+        }
+        menu.add_options(
+            [f"{number}) {labels[server]}" for number, server in enumerate(self.servers, 1)]
+        )
+        menu.highlighted = 0
+
+    @on(InstallerMenu.OptionSelected)
+    def handle_selection(self, event: InstallerMenu.OptionSelected) -> None:
+        """Handle cache server selection."""
+        self.state.cache_server = self.servers[event.option_index]
+        self.dismiss("protocol")
+
+    @on(Button.Pressed, "#back")
+    def back_pressed(self) -> None:
+        """Go back to profile selection."""
+        self.dismiss("back")
+
+    @on(Button.Pressed, "#close")
+    def close_pressed(self) -> None:
+        """Handle close button."""
+        self.app.exit()
+
+    def action_request_close(self) -> None:
+        """Global close action (c key)."""
+        self.app.exit()
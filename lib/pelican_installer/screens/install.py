@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import subprocess
+
 from textual import on, work
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.screen import Screen
-from textual.widgets import Button, ProgressBar, Static
+from textual.widgets import Button, Log, ProgressBar, Static
 from textual.worker import Worker, WorkerState
 
 from pelican_installer.installers import (
@@ -14,6 +17,10 @@ from pelican_installer.installers import (
     PanelInstaller,
     WingsInstaller,
 )
+from pelican_installer.installers.process import AsyncCommandRunner
+from pelican_installer.installers.scheduler import InstallTask, TaskScheduler
+from pelican_installer.utils.cache import ArtifactCache
+from pelican_installer.utils.journal import CheckpointJournal
 from pelican_installer.utils.state import InstallState
 
 
@@ -40,12 +47,24 @@ class InstallScreen(Screen[str]):
         color: #ff6b6b;
         margin-top: 1;
     }
+
+    #command-output {
+        height: 6;
+        border: round #777777;
+        background: #2a2a2a;
+        color: #999;
+    }
     """
 
+    # Number of command output lines kept in the live output panel
+    OUTPUT_LINES = 200
+
     def __init__(self, state: InstallState) -> None:
         super().__init__()
         self.state = state
         self._worker: Worker | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._runner: AsyncCommandRunner | None = None
 
     def compose(self) -> ComposeResult:
         component_name = "Panel" if self.state.component == "panel" else "Wings"
@@ -59,6 +78,7 @@ class InstallScreen(Screen[str]):
                     yield ProgressBar(total=100, id="progress")
                     yield Static("Initializing...", id="progress-status")
                     yield Static("", id="error-message")
+                yield Log(max_lines=self.OUTPUT_LINES, id="command-output")
 
                 yield Static(
                     "Installation in progress. Please wait...",
@@ -71,26 +91,66 @@ class InstallScreen(Screen[str]):
 
     def on_mount(self) -> None:
         """Start the real installation process."""
+        # Commands run as subprocesses on Textual's event loop; the worker
+        # thread only sequences the installation steps
+        self._loop = asyncio.get_running_loop()
+        self._runner = AsyncCommandRunner(loop=self._loop)
         self._worker = self.run_installation()
 
     @work(exclusive=True, thread=True)
     def run_installation(self) -> None:
         """Run the actual installation in a worker thread."""
         try:
-            # Phase 1: Install dependencies
+            # Dependency and component steps are scheduled together so
+            # independent steps of both can overlap
             self.call_from_thread(self.update_subtitle, "Installing Dependencies...")
-            dep_installer = DependencyInstaller(progress_callback=self.update_progress_thread_safe)
-            dep_installer.install(self.state)
+            dep_installer = DependencyInstaller(
+                progress_callback=self.update_progress_thread_safe,
+                output_callback=self.append_output_thread_safe,
+                runner=self._runner,
+            )
+            tasks = dep_installer.tasks(self.state)
+            cache = ArtifactCache()
 
-            # Phase 2: Install Panel or Wings
             if self.state.component == "panel":
                 self.call_from_thread(self.update_subtitle, "Installing Panel...")
-                panel_installer = PanelInstaller(progress_callback=self.update_progress_thread_safe)
-                panel_installer.install(self.state)
+                panel_installer = PanelInstaller(
+                    progress_callback=self.update_progress_thread_safe,
+                    output_callback=self.append_output_thread_safe,
+                    runner=self._runner,
+                    cache=cache,
+                )
+                tasks += panel_installer.tasks(self.state)
             elif self.state.component == "wings":
                 self.call_from_thread(self.update_subtitle, "Installing Wings...")
-                wings_installer = WingsInstaller(progress_callback=self.update_progress_thread_safe)
-                wings_installer.install()
+                wings_installer = WingsInstaller(
+                    progress_callback=self.update_progress_thread_safe,
+                    output_callback=self.append_output_thread_safe,
+                    runner=self._runner,
+                    cache=cache,
+                )
+                tasks += wings_installer.tasks()
+
+            # Steps completed by an earlier, failed run with the same
+            # settings are skipped
+            journal = CheckpointJournal(self.state.fingerprint())
+            if journal.completed():
+                self.call_from_thread(self.update_subtitle, "Resuming installation...")
+            TaskScheduler(
+                tasks,
+                on_update=self.update_tasks_thread_safe,
+                journal=journal,
+                converge=self.state.converge,
+            ).run()
+            journal.clear()
+
+            self.state.cache_hits = cache.hits
+            self.state.cache_misses = cache.misses
+            self.state.cache_bytes_saved = cache.bytes_saved
+            if self.state.component == "panel" and not self.state.uses_octane():
+                self.state.php_fpm_pool = panel_installer.fpm_pool().describe()
+            if self.state.component == "panel" and panel_installer.precompress_result:
+                self.state.precompress_summary = panel_installer.precompress_result.summary()
 
             # Mark as complete
             self.state.dependencies_installed = True
@@ -99,6 +159,12 @@ class InstallScreen(Screen[str]):
             # Enable next button
             self.call_from_thread(self.enable_next_button)
 
+        except subprocess.CalledProcessError as e:
+            error_msg = f"Installation failed: {str(e)}"
+            if e.output:
+                # Streamed commands keep only the trailing output lines
+                error_msg += "\n" + "\n".join(str(e.output).splitlines()[-3:])
+            self.call_from_thread(self.show_error, error_msg)
         except Exception as e:
             error_msg = f"Installation failed: {str(e)}"
             self.call_from_thread(self.show_error, error_msg)
@@ -107,6 +173,22 @@ class InstallScreen(Screen[str]):
         """Update progress from worker thread (thread-safe)."""
         self.call_from_thread(self.update_progress_ui, progress, message)
 
+    def update_tasks_thread_safe(self, progress: int, active: list[InstallTask]) -> None:
+        """Update progress and active tasks from scheduler thread (thread-safe)."""
+        if active:
+            message = "Running: " + ", ".join(task.label for task in active)
+            self.call_from_thread(self.update_progress_ui, progress, message)
+
+    def append_output_thread_safe(self, line: str) -> None:
+        """Append a line of command output from any thread (thread-safe)."""
+        # Output arrives on the event loop thread, so call_from_thread can't be used
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self.append_output, line)
+
+    def append_output(self, line: str) -> None:
+        """Append a line to the live command output panel."""
+        self.query_one("#command-output", Log).write_line(line)
+
     def update_progress_ui(self, progress: int, message: str) -> None:
         """Update the progress bar and status message."""
         progress_bar = self.query_one("#progress", ProgressBar)
@@ -84,6 +84,9 @@ class MenuScreen(Screen[str]):
         if selected:
             text = str(selected.prompt).lower()
 
+            # Update/Reinstall converges an existing installation
+            self.state.converge = "update" in text or "reinstall" in text
+
             # Parse selection
             if "install panel" in text and "uninstall" not in text:
                 self.state.component = "panel"
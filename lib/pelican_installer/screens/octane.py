@@ -0,0 +1,82 @@
+"""Octane application server selection screen."""
+
+from __future__ import annotations
+
+from textual import on
+from textual.app import ComposeResult
+from textual.containers import Container
+from textual.screen import Screen
+from textual.widgets import Button, Static
+
+from pelican_installer.components.menu import InstallerMenu
+from pelican_installer.utils.state import InstallState
+
+
+class OctaneScreen(Screen[str]):
+    """Screen for selecting the Octane server (FrankenPHP/RoadRunner/Swoole)."""
+
+    CSS = """
+    OctaneScreen {
+        align: center middle;
+    }
+    """
+
+    def __init__(self, state: InstallState) -> None:
+        super().__init__()
+        self.state = state
+
+    def compose(self) -> ComposeResult:
+        with Container(id="root"):
+            with Container(id="card"):
+                yield Static("Octane Application Server", id="title")
+                yield Static(
+                    "The panel stays booted in memory between requests. Select the server:",
+                    id="subtitle",
+                )
+                yield InstallerMenu(id="octane-menu")
+                yield Static(
+                    "Use ↑/↓, 1-3, Enter or click to select",
+                    id="hint",
+                )
+                with Container(id="footer"):
+                    yield Button("Back (b)", id="back")
+                    yield Button("Close (c)", id="close")
+
+    def on_mount(self) -> None:
+        """Set up server options."""
+        menu = self.query_one("#octane-menu", InstallerMenu)
+        menu.clear_options()
+        menu.add_options(
+            [
+                "1) FrankenPHP (recommended)",
+                "2) RoadRunner",
+                "3) Swoole",
+            ]
+        )
+        menu.highlighted = 0
+
+    @on(InstallerMenu.OptionSelected)
+    def handle_selection(self, event: InstallerMenu.OptionSelected) -> None:
+        """Handle server selection."""
+        if event.option_index == 0:
+            self.state.runtime = "frankenphp"
+        elif event.option_index == 1:
+            self.state.runtime = "roadrunner"
+        elif event.option_index == 2:
+            self.state.runtime = "swoole"
+
+        self.dismiss("front")
+
+    @on(Button.Pressed, "#back")
+    def back_pressed(self) -> None:
+        """Go back to webserver selection."""
+        self.dismiss("back")
+
+    @on(Button.Pressed, "#close")
+    def close_pressed(self) -> None:
+        """Handle close button."""
+        self.app.exit()
+
+    def action_request_close(self) -> None:
+        """Global close action (c key)."""
+        self.app.exit()
@@ -0,0 +1,85 @@
+"""Webserver tuning profile selection screen."""
+
+from __future__ import annotations
+
+from textual import on
+from textual.app import ComposeResult
+from textual.containers import Container
+from textual.screen import Screen
+from textual.widgets import Button, Static
+
+from pelican_installer.components.menu import InstallerMenu
+from pelican_installer.utils.state import InstallState
+
+
+class ProfileScreen(Screen[str]):
+    """Screen for selecting the performance or compatible webserver profile."""
+
+    CSS = """
+    ProfileScreen {
+        align: center middle;
+    }
+    """
+
+    def __init__(self, state: InstallState) -> None:
+        super().__init__()
+        self.state = state
+
+    def compose(self) -> ComposeResult:
+        with Container(id="root"):
+            with Container(id="card"):
+                yield Static("Webserver Profile", id="title")
+                yield Static("Select how the webserver is tuned:", id="subtitle")
+                yield InstallerMenu(id="profile-menu")
+                yield Static(
+                    "Use ↑/↓, Enter or click to select",
+                    id="hint",
+                )
+                with Container(id="footer"):
+                    yield Button("Back (b)", id="back")
+                    yield Button("Close (c)", id="close")
+
+    def on_mount(self) -> None:
+        """Set up profile options."""
+        menu = self.query_one("#profile-menu", InstallerMenu)
+        menu.clear_options()
+        options = ["1) Performance - sized to this server (recommended)"]
+        if self._has_microcache():
+            options.append("2) Performance + microcaching of anonymous pages")
+        options.append(f"{len(options) + 1}) Compatible - distro defaults")
+        menu.add_options(options)
+        menu.highlighted = 0
+
+    @on(InstallerMenu.OptionSelected)
+    def handle_selection(self, event: InstallerMenu.OptionSelected) -> None:
+        """Handle profile selection."""
+        has_microcache = self._has_microcache()
+        if event.option_index == 0:
+            self.state.profile = "performance"
+            self.state.microcache = False
+        elif event.option_index == 1 and has_microcache:
+            self.state.profile = "performance"
+            self.state.microcache = True
+        else:
+            self.state.profile = "compatible"
+            self.state.microcache = False
+
+        self.dismiss("cache")
+
+    def _has_microcache(self) -> bool:
+        """Microcaching is offered for Nginx in front of PHP-FPM."""
+        return self.state.webserver == "nginx" and not self.state.uses_octane()
+
+    @on(Button.Pressed, "#back")
+    def back_pressed(self) -> None:
+        """Go back to webserver selection."""
+        self.dismiss("back")
+
+    @on(Button.Pressed, "#close")
+    def close_pressed(self) -> None:
+        """Handle close button."""
+        self.app.exit()
+
+    def action_request_close(self) -> None:
+        """Global close action (c key)."""
+        self.app.exit()
@@ -65,7 +65,7 @@ class ProtocolScreen(Screen[str]):
 
     @on(Button.Pressed, "#back")
     def back_pressed(self) -> None:
-        """Go back to webserver selection."""
+        """Go back to cache server selection."""
         self.dismiss("back")
 
     @on(Button.Pressed, "#close")
@@ -72,6 +72,21 @@ class SummaryScreen(Screen[str]):
                             f"✓ Webserver: {self.state.webserver.capitalize()}",
                             classes="summary-item",
                         )
+                        yield Static(
+                            f"✓ Runtime: {self.state.runtime_name()}",
+                            classes="summary-item",
+                        )
+                        profile = self.state.profile.capitalize()
+                        if self.state.microcache:
+                            profile += " (microcaching)"
+                        yield Static(
+                            f"✓ Profile: {profile}",
+                            classes="summary-item",
+                        )
+                        yield Static(
+                            f"✓ Cache, sessions and queue: {self.state.cache_server_name()}",
+                            classes="summary-item",
+                        )
                         yield Static(
                             f"✓ Protocol: {self.state.protocol.upper()}",
                             classes="summary-item",
@@ -81,6 +96,15 @@ class SummaryScreen(Screen[str]):
                             classes="summary-item",
                         )
 
+                        # PHP-FPM pool sizing, then its reasoning
+                        if self.state.php_fpm_pool:
+                            yield Static(
+                                f"✓ PHP-FPM pool: {self.state.php_fpm_pool[0]}",
+                                classes="summary-item",
+                            )
+                            for reason in self.state.php_fpm_pool[1:]:
+                                yield Static(f"    {reason}", classes="summary-label")
+
                         if self.state.use_ssl:
                             yield Static(
                                 f"✓ SSL Certificate: {self.state.domain}",
@@ -97,6 +121,21 @@ class SummaryScreen(Screen[str]):
                         classes="summary-item",
                     )
 
+                    if self.state.precompress_summary:
+                        yield Static(
+                            f"✓ Precompressed assets: {self.state.precompress_summary}",
+                            classes="summary-item",
+                        )
+
+                    # Artifact cache (only if something was looked up)
+                    if self.state.cache_hits or self.state.cache_misses:
+                        saved_mb = self.state.cache_bytes_saved / (1024 * 1024)
+                        yield Static(
+                            f"✓ Download cache: {self.state.cache_hits} hit(s), "
+                            f"{self.state.cache_misses} miss(es), {saved_mb:.1f} MB reused",
+                            classes="summary-item",
+                        )
+
                 if self.state.component == "panel":
                     access_url = f"{self.state.protocol}://{self.state.domain}/installer"
                     yield Static(
@@ -13,7 +13,11 @@ from pelican_installer.utils.state import InstallState
 
 
 class WebserverScreen(Screen[str]):
-    """Screen for selecting webserver (Nginx/Apache/Caddy)."""
+    """Screen for selecting webserver (Nginx/Apache/Caddy) or Octane.
+
+    With ``front=True`` it selects the webserver proxying to the Octane
+    server chosen before.
+    """
 
     CSS = """
     WebserverScreen {
@@ -21,18 +25,22 @@ class WebserverScreen(Screen[str]):
     }
     """
 
-    def __init__(self, state: InstallState) -> None:
+    def __init__(self, state: InstallState, front: bool = False) -> None:
         super().__init__()
         self.state = state
+        self.front = front
 
     def compose(self) -> ComposeResult:
         with Container(id="root"):
             with Container(id="card"):
                 yield Static("Webserver Configuration", id="title")
-                yield Static("Select your preferred webserver:", id="subtitle")
+                if self.front:
+                    yield Static("Select the webserver in front of Octane:", id="subtitle")
+                else:
+                    yield Static("Select your preferred webserver:", id="subtitle")
                 yield InstallerMenu(id="webserver-menu")
                 yield Static(
-                    "Use ↑/↓, 1-3, Enter or click to select",
+                    f"Use ↑/↓, 1-{3 if self.front else 4}, Enter or click to select",
                     id="hint",
                 )
                 with Container(id="footer"):
@@ -43,18 +51,25 @@ class WebserverScreen(Screen[str]):
         """Set up webserver options."""
         menu = self.query_one("#webserver-menu", InstallerMenu)
         menu.clear_options()
-        menu.add_options(
-            [
-                "1) Nginx (recommended)",
-                "2) Apache",
-                "3) Caddy",
-            ]
-        )
+        options = [
+            "1) Nginx (recommended)",
+            "2) Apache",
+            "3) Caddy",
+        ]
+        if not self.front:
+            options.append("4) Octane application server (fastest, advanced)")
+        menu.add_options(options)
         menu.highlighted = 0
 
     @on(InstallerMenu.OptionSelected)
     def handle_selection(self, event: InstallerMenu.OptionSelected) -> None:
         """Handle webserver selection."""
+        if event.option_index == 3:
+            self.dismiss("octane")
+            return
+        if not self.front:
+            self.state.runtime = "php-fpm"
+
         if event.option_index == 0:
             self.state.webserver = "nginx"
         elif event.option_index == 1:
@@ -62,11 +77,11 @@ class WebserverScreen(Screen[str]):
         elif event.option_index == 2:
             self.state.webserver = "caddy"
 
-        self.dismiss("protocol")
+        self.dismiss("profile")
 
     @on(Button.Pressed, "#back")
     def back_pressed(self) -> None:
-        """Go back to main menu."""
+        """Go back to main menu (or Octane selection)."""
         self.dismiss("back")
 
     @on(Button.Pressed, "#close")
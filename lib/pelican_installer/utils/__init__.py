@@ -1,7 +1,8 @@
 """Utility modules for system detection and installation."""
 
+from pelican_installer.utils.packages import PackageIndex
 from pelican_installer.utils.state import InstallState
 from pelican_installer.utils.system import SystemDetector
 
-__all__ = ["InstallState", "SystemDetector"]
+__all__ = ["InstallState", "PackageIndex", "SystemDetector"]
 
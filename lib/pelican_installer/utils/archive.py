@@ -0,0 +1,162 @@
+"""Streaming extraction of tar archives."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tarfile
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+from pelican_installer.utils.manifest import Manifest
+
+CHUNK_SIZE = 256 * 1024
+
+
+class ArchiveError(Exception):
+    """Raised when an archive contains an unsafe or unsupported entry."""
+
+
+class _CountingReader:
+    """File object wrapper that reports how many bytes were read."""
+
+    def __init__(self, fileobj: BinaryIO, callback: Callable[[int], None]):
+        self._fileobj = fileobj
+        self._callback = callback
+        self.position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self.position += len(data)
+        self._callback(self.position)
+        return data
+
+
+def extract_tar_stream(
+    fileobj: BinaryIO,
+    dest: Path,
+    progress_callback: Callable[[int, int], None] | None = None,
+    manifest: Manifest | None = None,
+    owner: tuple[int, int] | None = None,
+) -> int:
+    """
+    Extract a gzip-compressed tar archive while it is being read.
+
+    The archive is read strictly sequentially, so ``fileobj`` may be a
+    network stream. Entries that would end up outside ``dest`` (absolute
+    paths, ``..`` components, links resolving out of the tree, entries
+    below an extracted symlink) are refused; device files and FIFOs are
+    skipped. Ownership from the archive is not
+    applied; entries are created as the current user or given to ``owner``.
+
+    Args:
+        fileobj: Readable binary stream of the archive
+        dest: Existing directory to extract into
+        progress_callback: Function to call with (bytes_read, files_written)
+        manifest: Dictionary to record the extracted files in
+        owner: (uid, gid) to give extracted entries (requires root)
+
+    Returns:
+        Number of regular files written
+
+    Raises:
+        ArchiveError: If the archive contains an unsafe entry
+        tarfile.TarError: If the archive is corrupt
+    """
+    root = os.path.realpath(dest)
+    files = 0
+
+    def report(position: int) -> None:
+        if progress_callback:
+            progress_callback(position, files)
+
+    reader = _CountingReader(fileobj, report)
+    with tarfile.open(fileobj=reader, mode="r|gz") as archive:  # type: ignore[call-overload]
+        for member in archive:
+            target = _target_path(root, member.name)
+            if target == root:
+                continue
+            rel = os.path.relpath(target, root)
+
+            # Earlier entries may have created symlinks; nothing is written
+            # through them, even when they point into the tree
+            parent = os.path.dirname(target)
+            if _crosses_symlink(root, parent) or (member.isdir() and os.path.islink(target)):
+                raise ArchiveError(f"Refusing to extract through a symlink: {member.name}")
+            os.makedirs(parent, exist_ok=True)
+
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+                os.chmod(target, (member.mode & 0o777) | 0o700)
+            elif member.isfile():
+                source = archive.extractfile(member)
+                assert source is not None
+                _remove(target)
+                digest = hashlib.sha256()
+                with open(target, "wb") as f:
+                    for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                        f.write(chunk)
+                        digest.update(chunk)
+                os.chmod(target, member.mode & 0o777)
+                if manifest is not None:
+                    manifest[rel] = (member.size, digest.hexdigest())
+                files += 1
+                report(reader.position)
+            elif member.issym():
+                # Resolved like the kernel will, through links extracted earlier
+                link = os.path.realpath(os.path.join(os.path.realpath(parent), member.linkname))
+                if os.path.isabs(member.linkname) or not _is_within(root, link):
+                    raise ArchiveError(f"Refusing symlink out of the archive: {member.name}")
+                _remove(target)
+                os.symlink(member.linkname, target)
+                if manifest is not None:
+                    manifest[rel] = (0, f"symlink:{member.linkname}")
+            elif member.islnk():
+                if os.path.isabs(member.linkname):
+                    raise ArchiveError(f"Refusing absolute path in archive: {member.linkname}")
+                # Resolved through links extracted earlier, like symlink targets
+                source_path = os.path.realpath(os.path.join(root, member.linkname))
+                if not _is_within(root, source_path) or not os.path.isfile(source_path):
+                    raise ArchiveError(f"Refusing hardlink out of the archive: {member.name}")
+                _remove(target)
+                os.link(source_path, target, follow_symlinks=False)
+                if manifest is not None:
+                    source_rel = os.path.relpath(source_path, root)
+                    if source_rel in manifest:
+                        manifest[rel] = manifest[source_rel]
+            else:
+                continue
+
+            if owner is not None:
+                os.chown(target, *owner, follow_symlinks=False)
+    return files
+
+
+def _target_path(root: str, name: str) -> str:
+    """Resolve an entry name below root, refusing paths that escape it."""
+    if os.path.isabs(name):
+        raise ArchiveError(f"Refusing absolute path in archive: {name}")
+    target = os.path.normpath(os.path.join(root, name))
+    if not _is_within(root, target):
+        raise ArchiveError(f"Refusing path outside of the archive: {name}")
+    return target
+
+
+def _crosses_symlink(root: str, path: str) -> bool:
+    """Check if path, or a directory between root and it, is a symlink."""
+    while _is_within(root, path) and path != root:
+        if os.path.islink(path):
+            return True
+        path = os.path.dirname(path)
+    return False
+
+
+def _is_within(root: str, path: str) -> bool:
+    """Check if path is root or below it."""
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def _remove(path: str) -> None:
+    """Remove an existing file or link so it can be replaced."""
+    if os.path.islink(path) or os.path.isfile(path):
+        os.unlink(path)
@@ -0,0 +1,150 @@
+"""Content-addressed cache of downloaded release artifacts."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from pelican_installer.utils.files import file_hash
+
+
+class ArtifactCache:
+    """Keep downloaded release artifacts for later installs and updates.
+
+    Artifacts are stored once per SHA-256 digest under ``objects/`` and
+    looked up by a key naming the release they belong to (for example
+    ``pelican-dev/panel@v1.0.0/panel.tar.gz``). When the cache grows past
+    its size cap, the least recently used entries are evicted.
+    """
+
+    DEFAULT_ROOT = Path("/var/cache/pelican-installer/artifacts")
+    DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+    def __init__(self, root: Path = DEFAULT_ROOT, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize cache.
+
+        Args:
+            root: Directory holding the index and cached objects
+            max_size: Maximum total size of cached objects in bytes
+        """
+        self.root = root
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def object_path(self, digest: str) -> Path:
+        """Get the location of a cached object."""
+        return self.root / "objects" / digest
+
+    def get(self, key: str, sha256: str | None = None) -> Path | None:
+        """
+        Look up an artifact.
+
+        Args:
+            key: Release key of the artifact
+            sha256: Expected digest; an entry with a different digest is a miss
+
+        Returns:
+            Path of the cached object, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            path = self.object_path(entry["digest"]) if entry else None
+            if (
+                entry is None
+                or (sha256 is not None and entry["digest"] != sha256.lower())
+                or path is None
+                or not path.is_file()
+                or path.stat().st_size != entry["size"]
+            ):
+                self.misses += 1
+                return None
+
+            entry["last_used"] = time.time()
+            self.hits += 1
+            self.bytes_saved += entry["size"]
+            self._save()
+            return path
+
+    def put(self, key: str, path: Path, sha256: str | None = None) -> Path:
+        """
+        Move a downloaded file into the cache.
+
+        Args:
+            key: Release key of the artifact
+            path: Downloaded file; it is moved, not copied
+            sha256: Digest of the file if already known
+
+        Returns:
+            Path of the cached object
+        """
+        digest = (sha256 or file_hash(path)).lower()
+        size = path.stat().st_size
+        target = self.object_path(digest)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = {"digest": digest, "size": size, "last_used": time.time()}
+            if previous is not None and previous["digest"] != digest:
+                # The key now names other content; drop its old object
+                self._unlink_unreferenced(previous["digest"])
+            self._evict(keep=key)
+            self._save()
+        return target
+
+    def _evict(self, keep: str) -> None:
+        """Remove least recently used entries until the cache fits its cap."""
+        sizes = {e["digest"]: e["size"] for e in self._entries.values()}
+        total = sum(sizes.values())
+        by_age = sorted(self._entries.items(), key=lambda item: item[1]["last_used"])
+        for key, entry in by_age:
+            if total <= self.max_size:
+                break
+            if key == keep:
+                continue
+            del self._entries[key]
+            if self._unlink_unreferenced(entry["digest"]):
+                total -= sizes[entry["digest"]]
+
+    def _unlink_unreferenced(self, digest: str) -> bool:
+        """Remove an object unless another key still refers to it."""
+        # Objects are shared between keys with identical content
+        if any(e["digest"] == digest for e in self._entries.values()):
+            return False
+        self.object_path(digest).unlink(missing_ok=True)
+        return True
+
+    def _load(self) -> dict[str, dict]:
+        """Read the cache index from disk."""
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self) -> None:
+        """Write the cache index atomically."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".index-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,496 @@
+"""Resumable, verified HTTP downloads."""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, TypeVar
+from urllib.parse import urljoin, urlsplit
+
+T = TypeVar("T")
+
+USER_AGENT = "pelican-installer"
+
+# Status codes worth retrying; other 4xx errors fail immediately
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+REDIRECT_STATUS = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 10
+
+CHUNK_SIZE = 256 * 1024
+
+
+class DownloadError(Exception):
+    """Raised when a download fails permanently or fails verification."""
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of a completed download."""
+
+    path: Path
+    size: int
+    digest: str
+    resumed: bool
+
+
+@dataclass
+class _Segment:
+    """Byte range of a segmented download and how much of it is on disk."""
+
+    start: int
+    end: int  # inclusive
+    received: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.start + self.received > self.end
+
+
+class _Progress:
+    """Byte counter of one download."""
+
+    def __init__(self, total: int | None, callback: Callable[[int, int | None], None] | None):
+        self.total = total
+        self.received = 0
+        self._callback = callback
+        self._lock = threading.Lock()
+
+    def add(self, count: int) -> None:
+        """Record received bytes and report them."""
+        with self._lock:
+            self.received += count
+            received = self.received
+        if self._callback and count:
+            self._callback(received, self.total)
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP connections, one set per thread."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def get(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """Get a reusable connection to a host."""
+        conns = self._local.__dict__.setdefault("conns", {})
+        key = (scheme, netloc)
+        if key not in conns:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conns[key] = cls(netloc, timeout=self.timeout)
+        return conns[key]
+
+    def discard(self, scheme: str, netloc: str) -> None:
+        """Close and forget a connection after an error."""
+        conns = self._local.__dict__.get("conns", {})
+        conn = conns.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+
+class Downloader:
+    """Download files in-process with resume, retries and checksum checks.
+
+    Partial downloads are kept next to the destination as ``<name>.<hash>.part``
+    and resumed with HTTP range requests, so an interrupted transfer picks
+    up where it stopped, also across installer runs. Large files can be
+    fetched as several ranged segments in parallel.
+    """
+
+    def __init__(
+        self,
+        retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        timeout: float = 30.0,
+        segments: int = 1,
+        segment_min_size: int = 8 * 1024 * 1024,
+        progress_callback: Callable[[int, int | None], None] | None = None,
+    ):
+        """
+        Initialize downloader.
+
+        Args:
+            retries: Attempts without progress before giving up
+            backoff: Initial delay between attempts in seconds (doubles each time)
+            max_backoff: Maximum delay between attempts in seconds
+            timeout: Socket timeout in seconds
+            segments: Number of parallel ranged segments for large files
+            segment_min_size: Files smaller than this are never segmented
+            progress_callback: Function to call with (bytes_received, total_bytes)
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.segments = segments
+        self.segment_min_size = segment_min_size
+        self.progress_callback = progress_callback
+        self._pool = _ConnectionPool(timeout)
+
+    def download(
+        self,
+        url: str,
+        dest: Path,
+        checksum: str | None = None,
+        hash_name: str = "sha256",
+    ) -> DownloadResult:
+        """
+        Download a URL to a file.
+
+        The file only appears at ``dest`` once it is complete and verified.
+
+        Args:
+            url: URL to download
+            dest: Destination path
+            checksum: Expected hex digest; verification is skipped if None
+            hash_name: hashlib algorithm of the checksum
+
+        Returns:
+            Result with size and digest of the file
+
+        Raises:
+            DownloadError: If the download fails or the checksum does not match
+        """
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # The partial file is tied to the URL so a different release never
+        # resumes into it
+        url_hash = hashlib.sha256(url.encode()).hexdigest()[:12]
+        part = dest.with_name(f"{dest.name}.{url_hash}.part")
+        resumed = part.exists()
+
+        size, accepts_ranges = self._probe(url)
+        progress = _Progress(size, self.progress_callback)
+
+        if (
+            self.segments > 1
+            and accepts_ranges
+            and size is not None
+            and size >= self.segment_min_size
+        ):
+            self._download_segmented(url, part, size, progress)
+            digest = self._hash_file(part, hash_name)
+        else:
+            digest = self._download_single(url, part, hash_name, progress)
+
+        if checksum is not None and digest.lower() != checksum.lower():
+            part.unlink()
+            raise DownloadError(f"Checksum mismatch for {url}: expected {checksum}, got {digest}")
+
+        final_size = part.stat().st_size
+        os.replace(part, dest)
+        return DownloadResult(path=dest, size=final_size, digest=digest, resumed=resumed)
+
+    def open(self, url: str, offset: int = 0) -> http.client.HTTPResponse:
+        """
+        Open a URL for streaming, following redirects and retrying failures.
+
+        Args:
+            url: URL to open
+            offset: Byte offset to start from (uses a range request)
+
+        Returns:
+            Response positioned at ``offset``; the caller must read it fully
+            or close it
+        """
+        return self._with_retries(url, lambda: self._request(url, offset))
+
+    def stream(self, url: str, sink: BinaryIO | None = None, hash_name: str = "sha256") -> DownloadStream:
+        """
+        Open a URL as a readable stream that resumes after dropped connections.
+
+        Args:
+            url: URL to read
+            sink: File to copy everything read into
+            hash_name: hashlib algorithm used to hash the stream
+
+        Returns:
+            Stream to read the response body from
+        """
+        return DownloadStream(self, url, sink=sink, hash_name=hash_name)
+
+    def _download_single(
+        self,
+        url: str,
+        part: Path,
+        hash_name: str,
+        progress: _Progress,
+    ) -> str:
+        """Download as one stream, resuming a partial file and hashing as it goes."""
+        digest = hashlib.new(hash_name)
+        offset = 0
+        if part.exists():
+            # Bring the hash up to date with the bytes already on disk
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    offset += len(chunk)
+            progress.add(offset)
+
+        def attempt() -> None:
+            nonlocal digest, offset
+            try:
+                response = self._request(url, offset)
+            except _RangeNotSatisfiable:
+                offset = 0
+                response = self._request(url)
+            if offset and response.status != 206:
+                # Server can't resume; start over
+                offset = 0
+            if offset == 0:
+                digest = hashlib.new(hash_name)
+
+            with open(part, "ab" if offset else "wb") as f:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    offset += len(chunk)
+                    progress.add(len(chunk))
+
+            if progress.total is not None and offset < progress.total:
+                raise _RetryableError(f"Connection closed after {offset} bytes")
+
+        self._with_retries(url, attempt, progress=lambda: offset)
+        return digest.hexdigest()
+
+    def _download_segmented(
+        self,
+        url: str,
+        part: Path,
+        size: int,
+        progress: _Progress,
+    ) -> None:
+        """Download parallel ranged segments into a preallocated file."""
+        state_file = part.with_name(part.name + ".json")
+        segments = self._load_segments(state_file, size)
+        if segments is None or not part.exists():
+            segments = self._plan_segments(size)
+            with open(part, "wb") as f:
+                f.truncate(size)
+        progress.add(sum(s.received for s in segments))
+
+        state_lock = threading.Lock()
+
+        def save_state() -> None:
+            with state_lock:
+                state_file.write_text(json.dumps([asdict(s) for s in segments]))
+
+        def fetch(segment: _Segment) -> None:
+            def attempt() -> None:
+                offset = segment.start + segment.received
+                response = self._request(url, offset, segment.end)
+                if response.status != 206:
+                    response.close()
+                    raise DownloadError(f"Server ignored range request for {url}")
+                fd = os.open(part, os.O_WRONLY)
+                try:
+                    for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                        os.pwrite(fd, chunk, segment.start + segment.received)
+                        segment.received += len(chunk)
+                        progress.add(len(chunk))
+                finally:
+                    os.close(fd)
+                    save_state()
+                if not segment.done:
+                    raise _RetryableError(f"Segment closed after {segment.received} bytes")
+
+            if not segment.done:
+                self._with_retries(url, attempt, progress=lambda: segment.received)
+
+        with ThreadPoolExecutor(max_workers=self.segments) as pool:
+            list(pool.map(fetch, segments))
+
+        if not all(s.done for s in segments):
+            raise DownloadError(f"Incomplete download of {url}")
+        state_file.unlink()
+
+    def _plan_segments(self, size: int) -> list[_Segment]:
+        """Split a file into equal byte ranges."""
+        step = -(-size // self.segments)
+        return [
+            _Segment(start=start, end=min(start + step, size) - 1)
+            for start in range(0, size, step)
+        ]
+
+    def _load_segments(self, state_file: Path, size: int) -> list[_Segment] | None:
+        """Load segment progress of an interrupted download."""
+        try:
+            segments = [_Segment(**s) for s in json.loads(state_file.read_text())]
+        except (OSError, ValueError, TypeError):
+            return None
+        if not segments or segments[-1].end != size - 1:
+            return None
+        return segments
+
+    def _probe(self, url: str) -> tuple[int | None, bool]:
+        """Get the size of a resource and whether it supports range requests."""
+
+        def attempt() -> tuple[int | None, bool]:
+            response = self._request(url, method="HEAD")
+            response.read()
+            length = response.getheader("Content-Length")
+            ranges = response.getheader("Accept-Ranges", "").lower() == "bytes"
+            return (int(length) if length and length.isdigit() else None), ranges
+
+        try:
+            return self._with_retries(url, attempt)
+        except DownloadError:
+            # Some servers reject HEAD; fall back to a plain streamed GET
+            return None, False
+
+    def _request(
+        self,
+        url: str,
+        offset: int = 0,
+        end: int | None = None,
+        method: str = "GET",
+    ) -> http.client.HTTPResponse:
+        """Send a request, following redirects; returns a 200/206 response."""
+        for _ in range(MAX_REDIRECTS):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+            if offset or end is not None:
+                headers["Range"] = f"bytes={offset}-{'' if end is None else end}"
+
+            conn = self._pool.get(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, headers=headers)
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException):
+                self._pool.discard(parts.scheme, parts.netloc)
+                raise
+
+            if response.status in REDIRECT_STATUS:
+                response.read()
+                url = urljoin(url, response.getheader("Location", ""))
+                continue
+            if response.status in (200, 206):
+                return response
+
+            response.read()
+            if response.status == 416 and offset:
+                # Range past the end: the partial file is stale
+                raise _RangeNotSatisfiable()
+            error = _RetryableError if response.status in RETRY_STATUS else DownloadError
+            raise error(f"HTTP {response.status} for {url}")
+        raise DownloadError(f"Too many redirects for {url}")
+
+    def _with_retries(
+        self,
+        url: str,
+        attempt: Callable[[], T],
+        progress: Callable[[], int] | None = None,
+    ) -> T:
+        """Call attempt() with exponential backoff on transient errors."""
+        failures = 0
+        while True:
+            before = progress() if progress else 0
+            try:
+                return attempt()
+            except (_RetryableError, OSError, http.client.HTTPException) as e:
+                # Attempts that made progress don't count towards the limit
+                if progress and progress() > before:
+                    failures = 0
+                failures += 1
+                if failures > self.retries:
+                    raise DownloadError(f"Download of {url} failed: {e}") from e
+                parts = urlsplit(url)
+                self._pool.discard(parts.scheme, parts.netloc)
+                delay = min(self.max_backoff, self.backoff * 2 ** (failures - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    @staticmethod
+    def _hash_file(path: Path, hash_name: str) -> str:
+        """Hash a file on disk."""
+        digest = hashlib.new(hash_name)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+class DownloadStream:
+    """Response body read sequentially, reconnecting with range requests.
+
+    Everything read is hashed and optionally copied to a sink file, so a
+    stream consumed by another reader (such as a tar extractor) can be
+    verified and kept once it is complete.
+    """
+
+    def __init__(
+        self,
+        downloader: Downloader,
+        url: str,
+        sink: BinaryIO | None = None,
+        hash_name: str = "sha256",
+    ):
+        self.url = url
+        self.position = 0
+        self._downloader = downloader
+        self._sink = sink
+        self._digest = hashlib.new(hash_name)
+        self._response: http.client.HTTPResponse | None = downloader.open(url)
+        length = self._response.getheader("Content-Length")
+        self.length = int(length) if length and length.isdigit() else None
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes (the rest of the body if negative)."""
+        if size < 0:
+            return b"".join(iter(lambda: self.read(CHUNK_SIZE), b""))
+
+        def attempt() -> bytes:
+            if self._response is None:
+                self._response = self._downloader._request(self.url, self.position)
+                if self._response.status != 206:
+                    self._response.close()
+                    self._response = None
+                    raise DownloadError(f"Server can't resume {self.url}")
+            try:
+                data = self._response.read(size)
+            except (OSError, http.client.HTTPException):
+                self._response = None
+                raise
+            if not data and self.length is not None and self.position < self.length:
+                self._response = None
+                raise _RetryableError(f"Connection closed after {self.position} bytes")
+            return data
+
+        data = self._downloader._with_retries(self.url, attempt, progress=lambda: self.position)
+        self.position += len(data)
+        self._digest.update(data)
+        if self._sink is not None:
+            self._sink.write(data)
+        return data
+
+    def drain(self) -> None:
+        """Read whatever the consumer left unread, so the digest covers the whole body."""
+        while self.read(CHUNK_SIZE):
+            pass
+
+    def hexdigest(self) -> str:
+        """Get the digest of everything read so far."""
+        return self._digest.hexdigest()
+
+    def close(self) -> None:
+        """Close the underlying response."""
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+
+class _RetryableError(Exception):
+    """Transient HTTP error."""
+
+
+class _RangeNotSatisfiable(Exception):
+    """Server rejected a resume offset."""
@@ -0,0 +1,119 @@
+"""File content helpers."""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import hashlib
+import os
+from pathlib import Path
+
+# renameat2() arguments (linux/fcntl.h, linux/fs.h)
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+
+def content_hash(content: str | bytes) -> str:
+    """Get the SHA-256 hex digest of some content."""
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(path: Path) -> str | None:
+    """Get the SHA-256 hex digest of a file, or None if it can't be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def file_has_content(path: Path, content: str) -> bool:
+    """
+    Check if a file holds the given content.
+
+    Trailing newlines are ignored, since files written with ``echo`` get
+    an extra one.
+    """
+    try:
+        on_disk = path.read_bytes()
+    except OSError:
+        return False
+    return content_hash(on_disk.rstrip(b"\n")) == content_hash(content.rstrip("\n"))
+
+
+def hash_header(content: str) -> str:
+    """Comment line recording the hash of generated config content."""
+    return f"# Generated by pelican-installer (sha256:{content_hash(content)})"
+
+
+def with_hash_header(content: str) -> str:
+    """Prefix generated config content with its hash header."""
+    return f"{hash_header(content)}\n{content}"
+
+
+def has_hash_header(path: Path, content: str) -> bool:
+    """
+    Check if a file was generated from the given content.
+
+    Unlike file_has_content this accepts later edits by other tools
+    (such as Certbot), as long as the header is intact.
+    """
+    try:
+        with open(path) as f:
+            first_line = f.readline().rstrip("\n")
+    except OSError:
+        return False
+    return first_line == hash_header(content)
+
+
+def set_env_values(content: str, values: dict[str, str]) -> str:
+    """
+    Set ``KEY=value`` lines of a dotenv file.
+
+    Existing keys are replaced in place, leaving commented-out lines
+    alone; missing keys are appended.
+    """
+    lines = content.splitlines()
+    remaining = dict(values)
+    for i, line in enumerate(lines):
+        key, sep, _ = line.partition("=")
+        key = key.strip()
+        if sep and key in remaining:
+            lines[i] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+    return "\n".join(lines) + "\n"
+
+
+def exchange_paths(first: Path, second: Path) -> None:
+    """
+    Atomically swap two paths with renameat2(RENAME_EXCHANGE).
+
+    Both paths must exist on the same filesystem.
+
+    Raises:
+        OSError: If the swap fails or is not supported (the C library
+            lacks renameat2, or the filesystem lacks RENAME_EXCHANGE)
+    """
+    libc = ctypes.CDLL(None, use_errno=True)
+    try:
+        renameat2 = libc.renameat2
+    except AttributeError:
+        raise OSError(errno.ENOSYS, "renameat2 is not available") from None
+    renameat2.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_uint,
+    ]
+    result = renameat2(
+        _AT_FDCWD, os.fsencode(first), _AT_FDCWD, os.fsencode(second), _RENAME_EXCHANGE
+    )
+    if result != 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error), str(first), None, str(second))
@@ -0,0 +1,136 @@
+"""Host resource detection for tuned service configs."""
+
+from __future__ import annotations
+
+import os
+import resource
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class HardwareInfo:
+    """Resources available to services on this host."""
+
+    cpus: int
+    memory_mb: int
+    fd_limit: int
+
+
+class HardwareDetector:
+    """Detect CPU, memory and file descriptor limits."""
+
+    PROC = Path("/proc")
+    MEMINFO = Path("/proc/meminfo")
+    FILE_MAX = Path("/proc/sys/fs/file-max")
+
+    # Used when a value cannot be read
+    DEFAULT_MEMORY_MB = 1024
+    DEFAULT_FD_LIMIT = 1024
+
+    @classmethod
+    def detect(cls) -> HardwareInfo:
+        """Detect current host resources."""
+        meminfo = cls._read_meminfo()
+        return HardwareInfo(
+            cpus=cls._get_cpus(),
+            memory_mb=meminfo.get("MemTotal", cls.DEFAULT_MEMORY_MB * 1024) // 1024,
+            fd_limit=cls._get_fd_limit(),
+        )
+
+    @classmethod
+    def worker_memory_mb(
+        cls, command: str, title: str | None = None, min_cpu_seconds: float = 0
+    ) -> float | None:
+        """
+        Measure the average memory of a service's worker processes.
+
+        Workers are the processes named command whose parent is not init,
+        so a master process is left out. Proportional set size is used
+        where available, so memory shared between workers (such as the
+        OPcache) is only counted once. Workers that have barely run are
+        left out, since they haven't grown to their working size yet.
+
+        Args:
+            command: Process name, as in /proc/<pid>/comm
+            title: Text the process title must contain (such as a pool name)
+            min_cpu_seconds: CPU time a worker must have used to be counted
+
+        Returns:
+            Average memory in MB, or None if no matching worker is running
+        """
+        ticks = os.sysconf("SC_CLK_TCK")
+        sizes = []
+        for proc in cls.PROC.iterdir():
+            if not proc.name.isdigit():
+                continue
+            try:
+                if (proc / "comm").read_text().strip() != command:
+                    continue
+                if title is not None:
+                    cmdline = (proc / "cmdline").read_bytes().replace(b"\0", b" ").decode()
+                    if title not in cmdline:
+                        continue
+                # utime and stime follow the parenthesized command name
+                stat = (proc / "stat").read_text().rpartition(")")[2].split()
+                status = cls._read_fields(proc / "status")
+            except (OSError, UnicodeDecodeError):
+                continue
+            if status.get("PPid") == 1:
+                continue
+            if (int(stat[11]) + int(stat[12])) / ticks < min_cpu_seconds:
+                continue
+            try:
+                size = cls._read_fields(proc / "smaps_rollup").get("Pss")
+            except OSError:
+                # Only readable by the process owner and root
+                size = None
+            size = size or status.get("VmRSS")
+            if size:
+                sizes.append(size)
+        if not sizes:
+            return None
+        return sum(sizes) / len(sizes) / 1024
+
+    @classmethod
+    def _get_cpus(cls) -> int:
+        """Get the number of CPUs this process may run on."""
+        try:
+            return len(os.sched_getaffinity(0))
+        except (AttributeError, OSError):
+            return os.cpu_count() or 1
+
+    @classmethod
+    def _read_meminfo(cls) -> dict[str, int]:
+        """Read /proc/meminfo values (in kB)."""
+        try:
+            return cls._read_fields(cls.MEMINFO)
+        except OSError:
+            return {}
+
+    @classmethod
+    def _read_fields(cls, path: Path) -> dict[str, int]:
+        """Read the numeric ``Name: value`` lines of a /proc file."""
+        values = {}
+        with open(path) as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                fields = rest.split()
+                if fields and fields[0].isdigit():
+                    values[name] = int(fields[0])
+        return values
+
+    @classmethod
+    def _get_fd_limit(cls) -> int:
+        """Get how many files a service may open: the hard limit, capped by the system limit."""
+        try:
+            _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        except (OSError, ValueError):
+            hard = resource.RLIM_INFINITY
+        try:
+            system = int(cls.FILE_MAX.read_text().strip())
+        except (OSError, ValueError):
+            system = cls.DEFAULT_FD_LIMIT
+        if hard == resource.RLIM_INFINITY:
+            return system
+        return min(hard, system)
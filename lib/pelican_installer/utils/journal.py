@@ -0,0 +1,84 @@
+"""On-disk journal of completed installation steps."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+class CheckpointJournal:
+    """Record completed installer steps so a failed run can resume.
+
+    The journal is keyed by a fingerprint of the installation settings; when
+    the settings change, previously completed steps no longer count.
+    """
+
+    DEFAULT_PATH = Path("/var/lib/pelican-installer/journal.json")
+
+    def __init__(self, key: str, path: Path = DEFAULT_PATH):
+        """
+        Initialize journal.
+
+        Args:
+            key: Fingerprint of the settings the steps were completed with
+            path: Location of the journal file
+        """
+        self.key = key
+        self.path = path
+        self._lock = threading.Lock()
+        self._completed = self._load()
+
+    def is_done(self, step: str) -> bool:
+        """Check if a step was completed by an earlier run."""
+        with self._lock:
+            return step in self._completed
+
+    def completed(self) -> set[str]:
+        """Get all completed steps."""
+        with self._lock:
+            return set(self._completed)
+
+    def mark_done(self, step: str) -> None:
+        """Record a completed step and persist the journal."""
+        with self._lock:
+            if step in self._completed:
+                return
+            self._completed.add(step)
+            self._save()
+
+    def clear(self) -> None:
+        """Forget all completed steps (after a successful run)."""
+        with self._lock:
+            self._completed.clear()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _load(self) -> set[str]:
+        """Read completed steps for this key from disk."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        if not isinstance(data, dict) or data.get("key") != self.key:
+            return set()
+        return set(data.get("completed", []))
+
+    def _save(self) -> None:
+        """Write the journal atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".journal-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"key": self.key, "completed": sorted(self._completed)}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
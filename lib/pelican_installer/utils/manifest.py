@@ -0,0 +1,146 @@
+"""Release manifests and incremental updates of installed trees."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pelican_installer.utils.files import file_hash
+
+# Relative path -> (size, SHA-256) of regular files; symlinks are recorded
+# with size 0 and "symlink:<target>" instead of a digest
+Manifest = dict[str, tuple[int, str]]
+
+
+@dataclass
+class UpdateResult:
+    """Files touched by an incremental update."""
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    def summary(self) -> str:
+        """Short description for progress output."""
+        return (
+            f"{len(self.added)} added, {len(self.changed)} changed, "
+            f"{len(self.removed)} removed, {self.unchanged} unchanged"
+        )
+
+
+def load_manifest(path: Path) -> Manifest | None:
+    """Read a manifest written by save_manifest, or None if there is none."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {name: (int(entry[0]), str(entry[1])) for name, entry in data.items()}
+
+
+def save_manifest(path: Path, manifest: Manifest) -> None:
+    """Write a manifest atomically."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".manifest-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def apply_update(
+    staging: Path,
+    dest: Path,
+    new: Manifest,
+    old: Manifest | None,
+    protected: tuple[str, ...] = (),
+) -> UpdateResult:
+    """
+    Update an installed tree from an extracted release, touching only differences.
+
+    Added and changed files are moved over from ``staging``; files listed in
+    the old manifest but not in the new one are deleted. Without an old
+    manifest the installed files are hashed for comparison instead and
+    nothing is deleted.
+
+    Args:
+        staging: Directory the new release was extracted to
+        dest: Installed tree to update
+        new: Manifest of the new release
+        old: Manifest of the installed release, if known
+        protected: Top-level names that are never written or deleted
+
+    Returns:
+        Files added, changed and removed
+    """
+    result = UpdateResult()
+
+    def is_protected(name: str) -> bool:
+        return name.split(os.sep, 1)[0] in protected
+
+    for name, entry in sorted(new.items()):
+        if is_protected(name):
+            continue
+        target = dest / name
+        current = old.get(name) if old is not None else _describe(target)
+        if current == entry and _matches(target, entry):
+            result.unchanged += 1
+            continue
+
+        (result.changed if current is not None else result.added).append(name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.is_dir() and not target.is_symlink():
+            # A directory replaced by a file upstream
+            shutil.rmtree(target)
+        os.replace(staging / name, target)
+
+    if old is not None:
+        for name in sorted(old.keys() - new.keys()):
+            if is_protected(name):
+                continue
+            target = dest / name
+            if target.is_symlink() or target.is_file():
+                target.unlink()
+                result.removed.append(name)
+            _remove_empty_parents(target.parent, dest)
+    return result
+
+
+def _describe(path: Path) -> tuple[int, str] | None:
+    """Build the manifest entry of an installed file."""
+    if path.is_symlink():
+        return 0, f"symlink:{os.readlink(path)}"
+    if not path.is_file():
+        return None
+    digest = file_hash(path)
+    return (path.stat().st_size, digest) if digest else None
+
+
+def _matches(path: Path, entry: tuple[int, str]) -> bool:
+    """Cheaply check that an installed file still looks like its manifest entry."""
+    size, digest = entry
+    if digest.startswith("symlink:"):
+        return path.is_symlink()
+    try:
+        return not path.is_symlink() and path.stat().st_size == size
+    except OSError:
+        return False
+
+
+def _remove_empty_parents(path: Path, stop: Path) -> None:
+    """Remove directories left empty by deletions, up to (not including) stop."""
+    while path != stop and stop in path.parents:
+        try:
+            path.rmdir()
+        except OSError:
+            return
+        path = path.parent
@@ -0,0 +1,106 @@
+"""Package status index backed by the dpkg status database."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+
+class PackageIndex:
+    """In-memory view of ``/var/lib/dpkg/status``.
+
+    The status file is parsed once and every "is X installed / which
+    version" query is answered from the resulting map. The index reloads
+    itself when the status file changes on disk or after an explicit
+    :meth:`invalidate` (called after every apt/dpkg transaction).
+    """
+
+    STATUS_FILE = Path("/var/lib/dpkg/status")
+
+    _lock = threading.Lock()
+    _packages: dict[str, str] | None = None
+    _signature: tuple[int, int] | None = None
+
+    @classmethod
+    def is_installed(cls, package: str) -> bool:
+        """Check if a package is installed."""
+        return package in cls._load()
+
+    @classmethod
+    def version(cls, package: str) -> str | None:
+        """Get the installed version of a package, or None if not installed."""
+        return cls._load().get(package)
+
+    @classmethod
+    def missing(cls, packages: list[str]) -> list[str]:
+        """Return the packages from the list that are not installed."""
+        installed = cls._load()
+        return [pkg for pkg in packages if pkg not in installed]
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached index so the next query re-reads the status file."""
+        with cls._lock:
+            cls._packages = None
+            cls._signature = None
+
+    @classmethod
+    def _load(cls) -> dict[str, str]:
+        """Return the package map, re-parsing the status file if it changed."""
+        signature = cls._stat_signature()
+        with cls._lock:
+            if cls._packages is None or signature != cls._signature:
+                cls._packages = cls._parse(cls.STATUS_FILE) if signature else {}
+                cls._signature = signature
+            return cls._packages
+
+    @classmethod
+    def _stat_signature(cls) -> tuple[int, int] | None:
+        """Get (mtime, size) of the status file, or None if it is missing."""
+        try:
+            stat = cls.STATUS_FILE.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _parse(path: Path) -> dict[str, str]:
+        """
+        Parse a dpkg status file.
+
+        Args:
+            path: Path to the status file
+
+        Returns:
+            Mapping of installed package name (and ``name:arch``) to version
+        """
+        packages: dict[str, str] = {}
+        fields: dict[str, str] = {}
+
+        def flush() -> None:
+            name = fields.get("Package")
+            status = fields.get("Status", "").split()
+            if name and status[-1:] == ["installed"]:
+                version = fields.get("Version", "")
+                packages[name] = version
+                arch = fields.get("Architecture")
+                if arch:
+                    packages[f"{name}:{arch}"] = version
+            fields.clear()
+
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        flush()
+                    elif line[0] in " \t":
+                        # Continuation of a multi-line field; not needed
+                        continue
+                    else:
+                        key, _, value = line.partition(":")
+                        fields[key] = value.strip()
+            flush()
+        except OSError:
+            return {}
+
+        return packages
@@ -0,0 +1,90 @@
+"""In-process ownership and mode fixing for directory trees."""
+
+from __future__ import annotations
+
+import os
+import stat
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+
+class PermissionFixer:
+    """Bring a tree to a given owner and modes, touching only wrong entries.
+
+    Directories are scanned with ``os.scandir`` by a thread pool, one
+    directory per job, so large subtrees like ``vendor/`` are walked in
+    parallel. Only entries whose owner or mode differ from the target get a
+    ``chown``/``chmod`` call. Symlinks are never followed.
+    """
+
+    DEFAULT_WORKERS = 8
+
+    def __init__(
+        self,
+        uid: int,
+        gid: int,
+        modes: dict[Path, int] | None = None,
+        max_workers: int = DEFAULT_WORKERS,
+    ):
+        """
+        Initialize fixer.
+
+        Args:
+            uid: Owner every entry should have
+            gid: Group every entry should have
+            modes: Mode for each subtree (applied to the path and everything
+                below it); other entries keep their mode
+            max_workers: Number of directories scanned at once
+        """
+        self.uid = uid
+        self.gid = gid
+        self.modes = {os.path.normpath(path): mode for path, mode in (modes or {}).items()}
+        self.max_workers = max_workers
+
+    def fix(self, root: Path) -> int:
+        """
+        Fix ownership and modes below root (including root itself).
+
+        Args:
+            root: Directory to fix
+
+        Returns:
+            Number of entries that were changed
+        """
+        top = os.path.normpath(root)
+        mode = self.modes.get(top)
+        changed = self._fix_entry(top, os.lstat(top), mode)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending: set[Future] = {pool.submit(self._scan, top, mode)}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    count, subdirs = future.result()
+                    changed += count
+                    pending.update(pool.submit(self._scan, path, m) for path, m in subdirs)
+        return changed
+
+    def _scan(self, directory: str, inherited: int | None) -> tuple[int, list[tuple[str, int | None]]]:
+        """Fix the entries of one directory; returns the count and subdirectories."""
+        changed = 0
+        subdirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                mode = self.modes.get(entry.path, inherited)
+                st = entry.stat(follow_symlinks=False)
+                changed += self._fix_entry(entry.path, st, mode)
+                if stat.S_ISDIR(st.st_mode):
+                    subdirs.append((entry.path, mode))
+        return changed, subdirs
+
+    def _fix_entry(self, path: str, st: os.stat_result, mode: int | None) -> int:
+        """Change owner and mode of one entry if needed; returns 1 if changed."""
+        changed = 0
+        if st.st_uid != self.uid or st.st_gid != self.gid:
+            os.chown(path, self.uid, self.gid, follow_symlinks=False)
+            changed = 1
+        if mode is not None and not stat.S_ISLNK(st.st_mode) and stat.S_IMODE(st.st_mode) != mode:
+            os.chmod(path, mode)
+            changed = 1
+        return changed
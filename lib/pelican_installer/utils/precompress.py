@@ -0,0 +1,276 @@
+"""Build-time compression of static assets."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import shutil
+import stat
+import subprocess
+import tempfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+# Sibling suffix and the command writing the compressed file to stdout
+# (None: gzip in-process)
+ENCODINGS: dict[str, list[str] | None] = {
+    ".gz": None,
+    ".br": ["brotli", "-c", "-q", "11"],
+    ".zst": ["zstd", "-19", "-q", "-c"],
+}
+
+
+@dataclass
+class PrecompressResult:
+    """Outcome of a precompression run."""
+
+    files: int = 0
+    written: int = 0
+    removed: int = 0
+    failed: int = 0
+    # Bytes saved by the siblings written, per suffix
+    bytes_saved: dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        """Short description for progress output."""
+        saved = ", ".join(
+            f"{suffix[1:]} -{size / (1024 * 1024):.1f} MB"
+            for suffix, size in self.bytes_saved.items()
+        )
+        text = f"{self.files} assets, {self.written} compressed files written"
+        if saved:
+            text += f" ({saved})"
+        if self.failed:
+            text += f", {self.failed} failed"
+        return text
+
+
+class Precompressor:
+    """Write ``.gz``, ``.br`` and ``.zst`` siblings of compressible assets.
+
+    Webservers serve these instead of compressing every response. Files are
+    compressed in a process pool across all cores; assets whose siblings
+    are at least as new are skipped, and siblings whose asset is gone are
+    removed. Encodings whose command is not installed are left out.
+
+    Encodings that don't make an asset smaller get no sibling; they are
+    recorded in a state file outside the web root, so the asset counts as
+    done until it changes.
+    """
+
+    COMPRESSIBLE_SUFFIXES = frozenset(
+        {".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".xml", ".html", ".ttf", ".eot"}
+    )
+
+    # Smaller files gain nothing worth a second file
+    MIN_SIZE = 1024
+
+    DEFAULT_STATE_PATH = Path("/var/lib/pelican-installer/precompress-skipped.json")
+
+    def __init__(self, max_workers: int | None = None, state_path: Path = DEFAULT_STATE_PATH):
+        """
+        Initialize precompressor.
+
+        Args:
+            max_workers: Number of processes; defaults to the CPU count
+            state_path: Where encodings that didn't shrink an asset are recorded
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.state_path = state_path
+        self.encodings = {
+            suffix: command
+            for suffix, command in ENCODINGS.items()
+            if command is None or shutil.which(command[0])
+        }
+
+    def run(
+        self, root: Path, progress_callback: Callable[[int, int], None] | None = None
+    ) -> PrecompressResult:
+        """
+        Compress the assets below root.
+
+        Args:
+            root: Directory to walk (such as the panel's public/)
+            progress_callback: Function to call with (done, total) files
+
+        Returns:
+            Files compressed and bytes saved
+        """
+        result = PrecompressResult()
+        assets, result.removed = self._scan(root)
+        result.files = len(assets)
+        skipped = self._load_skipped()
+        # Forget assets below root that are gone
+        known = {str(path) for path in assets}
+        skipped = {
+            path: entry
+            for path, entry in skipped.items()
+            if path in known or not Path(path).is_relative_to(root)
+        }
+        pending = {str(path): self._stale_suffixes(path, skipped) for path in assets}
+        pending = {path: suffixes for path, suffixes in pending.items() if suffixes}
+        if not pending:
+            self._save_skipped(skipped)
+            return result
+
+        # forkserver: the installer runs this from a thread, where fork is unsafe
+        context = multiprocessing.get_context("forkserver")
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(_compress, path, suffixes, self.encodings): path
+                for path, suffixes in pending.items()
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                path = futures[future]
+                try:
+                    saved, not_smaller, mtime = future.result()
+                except (OSError, subprocess.CalledProcessError):
+                    result.failed += 1
+                else:
+                    result.written += len(saved)
+                    for suffix, size in saved.items():
+                        result.bytes_saved[suffix] = result.bytes_saved.get(suffix, 0) + size
+                    entry = {
+                        suffix: recorded
+                        for suffix, recorded in skipped.get(path, {}).items()
+                        if suffix not in pending[path] and recorded == mtime
+                    }
+                    entry.update(dict.fromkeys(not_smaller, mtime))
+                    if entry:
+                        skipped[path] = entry
+                    else:
+                        skipped.pop(path, None)
+                if progress_callback:
+                    progress_callback(done, len(futures))
+        self._save_skipped(skipped)
+        return result
+
+    def pending(self, root: Path) -> int:
+        """Count assets below root with a missing or outdated sibling."""
+        assets, _ = self._scan(root, remove=False)
+        skipped = self._load_skipped()
+        return sum(1 for path in assets if self._stale_suffixes(path, skipped))
+
+    def _scan(self, root: Path, remove: bool = True) -> tuple[list[Path], int]:
+        """Find compressible assets; optionally remove orphaned siblings."""
+        assets = []
+        removed = 0
+        for directory, _, files in os.walk(root):
+            names = set(files)
+            for name in files:
+                path = Path(directory, name)
+                base, suffix = os.path.splitext(name)
+                if suffix in ENCODINGS:
+                    # Only siblings written for an asset, never other archives
+                    is_sibling = os.path.splitext(base)[1] in self.COMPRESSIBLE_SUFFIXES
+                    if remove and is_sibling and base not in names:
+                        path.unlink()
+                        removed += 1
+                elif suffix in self.COMPRESSIBLE_SUFFIXES and not path.is_symlink():
+                    if path.stat().st_size >= self.MIN_SIZE:
+                        assets.append(path)
+        return assets, removed
+
+    def _stale_suffixes(self, path: Path, skipped: dict[str, dict[str, int]]) -> list[str]:
+        """Get the encodings whose sibling of path is missing or older."""
+        mtime = path.stat().st_mtime_ns
+        not_smaller = skipped.get(str(path), {})
+        stale = []
+        for suffix in self.encodings:
+            try:
+                if os.stat(f"{path}{suffix}").st_mtime_ns >= mtime:
+                    continue
+            except FileNotFoundError:
+                if not_smaller.get(suffix) == mtime:
+                    continue
+            stale.append(suffix)
+        return stale
+
+    def _load_skipped(self) -> dict[str, dict[str, int]]:
+        """Read the encodings recorded as not shrinking their asset, by asset path."""
+        try:
+            with open(self.state_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {
+            path: {suffix: mtime for suffix, mtime in entry.items() if isinstance(mtime, int)}
+            for path, entry in data.items()
+            if isinstance(entry, dict)
+        }
+
+    def _save_skipped(self, skipped: dict[str, dict[str, int]]) -> None:
+        """Persist the skipped encodings atomically (removing the file when empty)."""
+        if not skipped:
+            try:
+                self.state_path.unlink()
+            except FileNotFoundError:
+                pass
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix=".precompress-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(skipped, f)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _compress(
+    path: str, suffixes: list[str], encodings: dict[str, list[str] | None]
+) -> tuple[dict[str, int], list[str], int]:
+    """
+    Write compressed siblings of one file (run in a worker process).
+
+    Siblings get the file's mode, owner and timestamps, and are only kept
+    when smaller than the file; an outdated sibling that would no longer
+    be smaller is removed.
+
+    Returns:
+        Bytes saved per suffix written, the suffixes that weren't smaller
+        and the file's mtime in nanoseconds
+    """
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    saved = {}
+    not_smaller = []
+    for suffix in suffixes:
+        command = encodings[suffix]
+        if command is None:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+            compressed = compressor.compress(data) + compressor.flush()
+        else:
+            compressed = subprocess.run([*command, path], capture_output=True, check=True).stdout
+        if len(compressed) >= len(data):
+            not_smaller.append(suffix)
+            try:
+                os.unlink(f"{path}{suffix}")
+            except FileNotFoundError:
+                pass
+            continue
+
+        target = f"{path}{suffix}"
+        tmp_path = f"{target}.tmp-{os.getpid()}"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+            if os.geteuid() == 0:
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        saved[suffix] = len(data) - len(compressed)
+    return saved, not_smaller, st.st_mtime_ns
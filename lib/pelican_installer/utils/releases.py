@@ -0,0 +1,86 @@
+"""GitHub release lookups."""
+
+from __future__ import annotations
+
+import json
+import threading
+import urllib.request
+from dataclasses import dataclass, field
+
+GITHUB_LATEST_RELEASE_API = "https://api.github.com/repos/{repo}/releases/latest"
+
+
+@dataclass(frozen=True)
+class ReleaseAsset:
+    """Downloadable file attached to a release."""
+
+    name: str
+    url: str
+    sha256: str | None = None
+
+
+@dataclass(frozen=True)
+class Release:
+    """A GitHub release and its assets."""
+
+    tag: str
+    assets: dict[str, ReleaseAsset] = field(default_factory=dict)
+
+
+# Successful lookups only, so a transient failure is retried on the next call
+_releases: dict[str, Release] = {}
+_releases_lock = threading.Lock()
+
+
+def latest_release(repo: str, timeout: float = 10) -> Release | None:
+    """
+    Get the latest release of a GitHub repository.
+
+    Lookups are cached for the rest of the run once they succeed.
+
+    Args:
+        repo: Repository as ``owner/name``
+        timeout: Request timeout in seconds
+
+    Returns:
+        Release with asset URLs and SHA-256 digests (where GitHub provides
+        them), or None if it could not be determined
+    """
+    with _releases_lock:
+        cached = _releases.get(repo)
+    if cached is not None:
+        return cached
+
+    request = urllib.request.Request(
+        GITHUB_LATEST_RELEASE_API.format(repo=repo),
+        headers={"Accept": "application/vnd.github+json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = json.load(response)
+    except (OSError, ValueError):
+        return None
+
+    tag = data.get("tag_name") if isinstance(data, dict) else None
+    if not isinstance(tag, str) or not tag:
+        return None
+
+    assets = {}
+    for asset in data.get("assets") or []:
+        name = asset.get("name")
+        url = asset.get("browser_download_url")
+        if not name or not url:
+            continue
+        digest = asset.get("digest") or ""
+        sha256 = digest[len("sha256:"):] if digest.startswith("sha256:") else None
+        assets[name] = ReleaseAsset(name=name, url=url, sha256=sha256)
+
+    release = Release(tag=tag, assets=assets)
+    with _releases_lock:
+        return _releases.setdefault(repo, release)
+
+
+def latest_release_tag(repo: str) -> str | None:
+    """Get the tag of the latest release of a GitHub repository."""
+    release = latest_release(repo)
+    return release.tag if release else None
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass, field
 from typing import Literal
 
 ComponentType = Literal["panel", "wings"]
 WebserverType = Literal["nginx", "apache", "caddy"]
 ProtocolType = Literal["https", "http"]
+ProfileType = Literal["performance", "compatible"]
+RuntimeType = Literal["php-fpm", "frankenphp", "roadrunner", "swoole"]
+CacheServerType = Literal["none", "redis", "valkey"]
 
 
 @dataclass
@@ -19,8 +24,18 @@ class InstallState:
 
     # Webserver configuration
     webserver: WebserverType = "nginx"
+    # PHP-FPM, or an Octane application server behind the webserver
+    runtime: RuntimeType = "php-fpm"
     protocol: ProtocolType = "https"
 
+    # Webserver tuning: sized to the host, or the conservative defaults
+    profile: ProfileType = "performance"
+    # Cache anonymous PHP responses briefly (performance profile, Nginx only)
+    microcache: bool = False
+
+    # Server for the panel's cache, sessions and queue ("none": panel defaults)
+    cache_server: CacheServerType = "none"
+
     # Domain/SSL configuration
     domain: str = ""
     use_ssl: bool = True
@@ -39,24 +54,87 @@ class InstallState:
     current_phase: str = "menu"
     installation_complete: bool = False
 
+    # Artifact cache statistics of the last installation
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_bytes_saved: int = 0
+
+    # PHP-FPM pool settings and how they were derived
+    php_fpm_pool: list[str] = field(default_factory=list)
+
+    # Static asset precompression of the last installation
+    precompress_summary: str = ""
+
+    # Update/reinstall: skip steps whose result is already in place
+    converge: bool = False
+
     def reset(self) -> None:
         """Reset state to defaults."""
         self.component = None
         self.webserver = "nginx"
+        self.runtime = "php-fpm"
         self.protocol = "https"
+        self.profile = "performance"
+        self.microcache = False
+        self.cache_server = "none"
         self.domain = ""
         self.use_ssl = True
         self.ssl_email = ""
         self.dependencies_installed = False
         self.current_phase = "menu"
         self.installation_complete = False
+        self.converge = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_bytes_saved = 0
+        self.php_fpm_pool = []
+        self.precompress_summary = ""
+
+    def uses_octane(self) -> bool:
+        """Check if the panel is served by an Octane application server."""
+        return self.runtime != "php-fpm"
+
+    def runtime_name(self) -> str:
+        """Display name of the runtime."""
+        names = {
+            "php-fpm": "PHP-FPM",
+            "frankenphp": "Octane (FrankenPHP)",
+            "roadrunner": "Octane (RoadRunner)",
+            "swoole": "Octane (Swoole)",
+        }
+        return names[self.runtime]
+
+    def cache_server_name(self) -> str:
+        """Display name of the cache server."""
+        names = {"none": "None (panel defaults)", "redis": "Redis", "valkey": "Valkey"}
+        return names[self.cache_server]
+
+    def fingerprint(self) -> str:
+        """Hash of the settings that determine what gets installed."""
+        settings = {
+            "component": self.component,
+            "webserver": self.webserver,
+            "runtime": self.runtime,
+            "protocol": self.protocol,
+            "profile": self.profile,
+            "microcache": self.microcache,
+            "cache_server": self.cache_server,
+            "domain": self.domain,
+            "use_ssl": self.use_ssl,
+            "ssl_email": self.ssl_email,
+        }
+        encoded = json.dumps(settings, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
 
     def to_dict(self) -> dict:
         """Convert state to dictionary for display."""
         return {
             "Component": self.component or "None",
             "Webserver": self.webserver.capitalize() if self.component == "panel" else "N/A",
+            "Runtime": self.runtime_name() if self.component == "panel" else "N/A",
             "Protocol": self.protocol.upper() if self.component == "panel" else "N/A",
+            "Profile": self.profile.capitalize() if self.component == "panel" else "N/A",
+            "Cache": self.cache_server_name() if self.component == "panel" else "N/A",
             "Domain": self.domain or "Not set",
             "SSL": "Yes" if self.use_ssl and self.protocol == "https" else "No",
         }
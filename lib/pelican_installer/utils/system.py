@@ -8,6 +8,8 @@ import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
+from pelican_installer.utils.packages import PackageIndex
+
 
 @dataclass
 class SystemInfo:
@@ -74,6 +76,29 @@ class SystemDetector:
             pass
         return platform.release()
 
+    @classmethod
+    def is_package_installed(cls, package: str) -> bool:
+        """Check if a Debian package is installed."""
+        return PackageIndex.is_installed(package)
+
+    @classmethod
+    def is_package_available(cls, package: str) -> bool:
+        """Check if apt can install a Debian package from the configured sources."""
+        try:
+            result = subprocess.run(
+                ["apt-cache", "policy", package],
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return False
+        for line in result.stdout.splitlines():
+            key, _, value = line.strip().partition(":")
+            if key == "Candidate":
+                return value.strip() not in ("", "(none)")
+        return False
+
     @classmethod
     def check_command_exists(cls, command: str) -> bool:
         """Check if a command exists in PATH."""
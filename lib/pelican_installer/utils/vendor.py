@@ -0,0 +1,181 @@
+"""Snapshots of installed Composer vendor directories."""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import pwd
+import shutil
+from pathlib import Path
+
+# ioctl cloning a file's extents (reflink) on btrfs, XFS and similar
+FICLONE = 0x40049409
+
+
+class VendorCache:
+    """Keep installed ``vendor/`` trees to restore instead of running Composer.
+
+    Snapshots are keyed by the ``composer.lock`` hash and the PHP version.
+    Files are restored as reflinks where the filesystem supports them,
+    otherwise copied. They never share an inode with the snapshot, since the
+    restored tree is given to the web user and modified by Composer.
+    """
+
+    DEFAULT_ROOT = Path("/var/cache/pelican-installer/vendor")
+
+    # Number of snapshots kept; older ones are removed when saving
+    DEFAULT_KEEP = 3
+
+    def __init__(self, root: Path = DEFAULT_ROOT, keep: int = DEFAULT_KEEP):
+        """
+        Initialize cache.
+
+        Args:
+            root: Directory holding the snapshots
+            keep: Number of snapshots to keep
+        """
+        self.root = root
+        self.keep = keep
+
+    @staticmethod
+    def key(lock_hash: str, php_version: str) -> str:
+        """Get the snapshot key for a composer.lock hash and PHP version."""
+        return hashlib.sha256(f"{lock_hash}:{php_version}".encode()).hexdigest()
+
+    def restore(
+        self,
+        key: str,
+        vendor_dir: Path,
+        exclude: tuple[str, ...] = (),
+        owner: str | None = None,
+    ) -> bool:
+        """
+        Replace a vendor directory with a snapshot.
+
+        Args:
+            key: Snapshot key
+            vendor_dir: vendor/ directory to replace
+            exclude: Names directly below vendor/ to leave out
+            owner: User to own the restored tree (with their primary group),
+                so Composer running as that user can rewrite it
+
+        Returns:
+            True if the snapshot was restored, False if there is none
+        """
+        snapshot = self.root / key
+        if not snapshot.is_dir():
+            return False
+
+        staging = vendor_dir.with_name(f".{vendor_dir.name}.restore")
+        retired = vendor_dir.with_name(f".{vendor_dir.name}.old")
+        for path in (staging, retired):
+            shutil.rmtree(path, ignore_errors=True)
+        _clone_tree(snapshot, staging, exclude)
+        if owner is not None:
+            user = pwd.getpwnam(owner)
+            _chown_tree(staging, user.pw_uid, user.pw_gid)
+
+        if vendor_dir.exists():
+            os.replace(vendor_dir, retired)
+        os.replace(staging, vendor_dir)
+        shutil.rmtree(retired, ignore_errors=True)
+        os.utime(snapshot)
+        return True
+
+    def save(self, key: str, vendor_dir: Path, exclude: tuple[str, ...] = ()) -> None:
+        """
+        Store a snapshot of a freshly installed vendor directory.
+
+        Args:
+            key: Snapshot key
+            vendor_dir: Installed vendor/ directory
+            exclude: Names directly below vendor/ to leave out
+        """
+        snapshot = self.root / key
+        if snapshot.is_dir():
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".{key}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        _clone_tree(vendor_dir, staging, exclude)
+        os.replace(staging, snapshot)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Remove the least recently used snapshots beyond the limit."""
+        snapshots = sorted(
+            (p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for snapshot in snapshots[self.keep:]:
+            shutil.rmtree(snapshot, ignore_errors=True)
+
+
+def _clone_tree(src: Path, dst: Path, exclude: tuple[str, ...]) -> None:
+    """
+    Recreate a directory tree, sharing file data through reflinks where possible.
+
+    Every file gets its own inode, so changes to one tree never reach the other.
+
+    Args:
+        src: Source directory
+        dst: Destination directory (must not exist)
+        exclude: Names directly below src to skip
+    """
+    src_root = str(src)
+    # Reflinks work for all files of a filesystem or for none
+    can_reflink = True
+
+    for dirpath, dirnames, filenames in os.walk(src_root):
+        rel = os.path.relpath(dirpath, src_root)
+        if rel == ".":
+            dirnames[:] = [d for d in dirnames if d not in exclude]
+            filenames = [f for f in filenames if f not in exclude]
+            target_dir = str(dst)
+        else:
+            target_dir = os.path.join(dst, rel)
+        os.makedirs(target_dir, exist_ok=True)
+        shutil.copystat(dirpath, target_dir)
+
+        # os.walk doesn't descend into symlinked directories; keep them as links
+        for name in [d for d in dirnames if os.path.islink(os.path.join(dirpath, d))]:
+            dirnames.remove(name)
+            os.symlink(os.readlink(os.path.join(dirpath, name)), os.path.join(target_dir, name))
+
+        for name in filenames:
+            source = os.path.join(dirpath, name)
+            target = os.path.join(target_dir, name)
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target)
+                continue
+
+            if can_reflink:
+                if _reflink(source, target):
+                    continue
+                can_reflink = False
+            shutil.copy2(source, target)
+
+
+def _chown_tree(root: Path, uid: int, gid: int) -> None:
+    """Change the owner of a directory tree, without following symlinks."""
+    os.lchown(root, uid, gid)
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            os.lchown(os.path.join(dirpath, name), uid, gid)
+
+
+def _reflink(source: str, target: str) -> bool:
+    """Clone a file's data without copying it, if the filesystem supports it."""
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        try:
+            os.unlink(target)
+        except FileNotFoundError:
+            pass
+        return False
+    shutil.copystat(source, target)
+    return True
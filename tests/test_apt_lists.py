@@ -0,0 +1,101 @@
+"""Freshness of apt package lists."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.apt import AptListsPolicy
+from pelican_installer.installers.dependencies import DependencyInstaller
+
+HOUR = 3600
+
+
+@pytest.fixture
+def lists(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Empty apt state under tmp_path; returns the lists directory."""
+    lists_dir = tmp_path / "lists"
+    lists_dir.mkdir()
+    (tmp_path / "sources.list").touch()
+    os.utime(tmp_path / "sources.list", (0, 0))
+    monkeypatch.setattr(AptListsPolicy, "LISTS_DIR", lists_dir)
+    monkeypatch.setattr(AptListsPolicy, "UPDATE_STAMP", tmp_path / "update-success-stamp")
+    monkeypatch.setattr(AptListsPolicy, "SOURCE_LIST", tmp_path / "sources.list")
+    monkeypatch.setattr(AptListsPolicy, "SOURCE_PARTS", tmp_path / "sources.list.d")
+    return lists_dir
+
+
+def write_list(lists_dir: Path, name: str, age: float) -> None:
+    path = lists_dir / name
+    path.touch()
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_single_refreshed_source_does_not_make_lists_fresh(lists: Path) -> None:
+    write_list(lists, "archive.ubuntu.com_Packages", 3 * HOUR)
+    write_list(lists, "download.docker.com_Packages", 0)
+
+    policy = AptListsPolicy(max_age=HOUR)
+
+    assert policy.last_update() == pytest.approx(time.time() - 3 * HOUR, abs=5)
+    assert not policy.is_fresh()
+
+
+def test_update_stamp_marks_full_update(lists: Path) -> None:
+    write_list(lists, "archive.ubuntu.com_Packages", 3 * HOUR)
+    AptListsPolicy.UPDATE_STAMP.touch()
+
+    assert AptListsPolicy(max_age=HOUR).is_fresh()
+
+
+@pytest.fixture
+def hooked(monkeypatch: pytest.MonkeyPatch) -> tuple[DependencyInstaller, list[list[str]]]:
+    """Installer whose apt-get update only runs the stamp hook of update-notifier."""
+    installer = DependencyInstaller()
+    commands: list[list[str]] = []
+
+    def run_command(cmd: list[str], **kwargs) -> None:
+        commands.append(cmd)
+        AptListsPolicy.UPDATE_STAMP.touch()
+
+    monkeypatch.setattr(installer, "run_command", run_command)
+    return installer, commands
+
+
+def test_single_source_update_keeps_stamp(lists: Path, hooked) -> None:
+    installer, commands = hooked
+    write_list(lists, "archive.ubuntu.com_Packages", 3 * HOUR)
+    stamp = AptListsPolicy.UPDATE_STAMP
+    stamp.touch()
+    old = time.time() - 3 * HOUR
+    os.utime(stamp, (old, old))
+
+    installer._update_package_lists(Path("/etc/apt/sources.list.d/docker.list"))
+
+    assert len(commands) == 1
+    assert stamp.stat().st_mtime == pytest.approx(old)
+    assert not installer.apt_lists.is_fresh()
+
+
+def test_single_source_update_creates_no_stamp(lists: Path, hooked) -> None:
+    installer, _ = hooked
+
+    installer._update_package_lists(Path("/etc/apt/sources.list.d/docker.list"))
+
+    assert not AptListsPolicy.UPDATE_STAMP.exists()
+
+
+def test_full_update_touches_stamp(lists: Path, hooked) -> None:
+    installer, commands = hooked
+    write_list(lists, "archive.ubuntu.com_Packages", 3 * HOUR)
+
+    installer._update_package_lists()
+
+    assert commands == [["apt-get", "update"]]
+    assert installer.apt_lists.is_fresh()
+    installer._update_package_lists()
+    assert len(commands) == 1
@@ -0,0 +1,166 @@
+"""Single apt transaction versus the former per-group installs, against a fake apt."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.dependencies import DependencyInstaller
+from pelican_installer.utils.packages import PackageIndex
+from pelican_installer.utils.state import InstallState
+
+FAKE_APT_GET = """\
+import os, sys
+
+with open(os.environ["FAKE_APT_LOG"], "a") as f:
+    f.write("apt-get " + " ".join(sys.argv[1:]) + "\\n")
+if sys.argv[1:2] == ["install"]:
+    packages = [arg for arg in sys.argv[2:] if not arg.startswith("-")]
+    with open(os.environ["FAKE_DPKG_STATUS"], "a") as f:
+        for package in packages:
+            f.write(f"Package: {package}\\nStatus: install ok installed\\nVersion: 1.0\\n\\n")
+"""
+
+FAKE_DPKG = """\
+import os, sys
+
+with open(os.environ["FAKE_APT_LOG"], "a") as f:
+    f.write("dpkg " + " ".join(sys.argv[1:]) + "\\n")
+with open(os.environ["FAKE_DPKG_STATUS"]) as f:
+    installed = f"Package: {sys.argv[-1]}\\n" in f.read()
+sys.exit(0 if installed else 1)
+"""
+
+
+class FakeApt:
+    """apt-get and dpkg stand-ins on PATH, logging every call."""
+
+    def __init__(self, root: Path):
+        self.log = root / "calls.log"
+        self.status = root / "status"
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget installed packages and logged calls."""
+        self.log.write_text("")
+        self.status.write_text("")
+        PackageIndex.invalidate()
+
+    def calls(self, prefix: str) -> list[str]:
+        """Logged calls starting with prefix."""
+        return [line for line in self.log.read_text().splitlines() if line.startswith(prefix)]
+
+    def installed(self) -> set[str]:
+        """Packages recorded in the fake status file."""
+        return {
+            line.split(": ", 1)[1]
+            for line in self.status.read_text().splitlines()
+            if line.startswith("Package: ")
+        }
+
+
+@pytest.fixture
+def fake_apt(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> FakeApt:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, source in (("apt-get", FAKE_APT_GET), ("dpkg", FAKE_DPKG)):
+        script = bin_dir / name
+        script.write_text(f"#!{sys.executable}\n{source}")
+        script.chmod(0o755)
+
+    fake = FakeApt(tmp_path)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_APT_LOG", str(fake.log))
+    monkeypatch.setenv("FAKE_DPKG_STATUS", str(fake.status))
+    monkeypatch.setattr(PackageIndex, "STATUS_FILE", fake.status)
+    # Running as root would otherwise skip sudo anyway; never call the real one
+    monkeypatch.setattr(os, "geteuid", lambda: 0)
+    yield fake
+    PackageIndex.invalidate()
+
+
+@pytest.fixture
+def installer(monkeypatch: pytest.MonkeyPatch) -> DependencyInstaller:
+    installer = DependencyInstaller()
+    # Package lists count as fresh, so no apt-get update runs
+    monkeypatch.setattr(installer.apt_lists, "is_fresh", lambda: True)
+    return installer
+
+
+def panel_state() -> InstallState:
+    state = InstallState()
+    state.component = "panel"
+    state.webserver = "nginx"
+    state.protocol = "https"
+    return state
+
+
+def install_per_group(installer: DependencyInstaller, state: InstallState) -> None:
+    """The former flow: probe each package with dpkg -s, then install each group."""
+    version = installer.PHP_VERSION
+    groups = [
+        [f"php{version}"] + [f"php{version}-{ext}" for ext in installer.PHP_EXTENSIONS],
+        [state.webserver],
+        [tool for tool in installer.TOOLS if not installer.check_command_exists(tool)],
+        [installer._certbot_package(state.webserver)],
+    ]
+    for group in groups:
+        missing = [
+            package
+            for package in group
+            if installer.run_command(["dpkg", "-s", package], check=False).returncode != 0
+        ]
+        if missing:
+            installer.run_command(["apt-get", "install", "-y", *missing], use_sudo=True)
+
+
+def test_plan_installs_everything_in_one_transaction(
+    fake_apt: FakeApt, installer: DependencyInstaller
+) -> None:
+    state = panel_state()
+
+    install_per_group(installer, state)
+    before_installs = fake_apt.calls("apt-get install")
+    before_packages = fake_apt.installed()
+    assert len(fake_apt.calls("dpkg")) >= len(before_packages)
+
+    fake_apt.reset()
+    installer._apply_plan(installer.plan_packages(state))
+
+    # One transaction instead of one per group, and no dpkg process per package
+    assert len(before_installs) >= 3
+    assert len(fake_apt.calls("apt-get install")) == 1
+    assert fake_apt.calls("dpkg") == []
+    assert fake_apt.installed() == before_packages
+
+
+def test_plan_is_empty_once_installed(fake_apt: FakeApt, installer: DependencyInstaller) -> None:
+    state = panel_state()
+    installer._apply_plan(installer.plan_packages(state))
+
+    assert installer.plan_packages(state).is_empty()
+
+
+def test_empty_plan_skips_package_list_update(
+    fake_apt: FakeApt, installer: DependencyInstaller, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    state = panel_state()
+    installer._apply_plan(installer.plan_packages(state))
+    # Stale package lists, but nothing left to install
+    monkeypatch.setattr(installer.apt_lists, "is_fresh", lambda: False)
+    fake_apt.log.write_text("")
+
+    installer._apply_plan(installer.plan_packages(state))
+
+    assert fake_apt.calls("apt-get") == []
+
+
+def test_plan_lists_each_package_once(fake_apt: FakeApt, installer: DependencyInstaller) -> None:
+    plan = installer.plan_packages(panel_state())
+
+    assert len(plan.packages) == len(set(plan.packages))
+    assert "nginx" in plan.packages
+    assert "python3-certbot-nginx" in plan.packages
@@ -0,0 +1,117 @@
+"""Safe streaming extraction of release archives."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.archive import ArchiveError, extract_tar_stream
+
+
+def archive(*members: tuple[str, str, bytes | str]) -> io.BytesIO:
+    """Build a .tar.gz from (type, name, content or link target) entries."""
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w:gz") as tar:
+        for kind, name, value in members:
+            info = tarfile.TarInfo(name)
+            if kind == "file":
+                info.size = len(value)
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(value))
+                continue
+            info.type = {
+                "dir": tarfile.DIRTYPE,
+                "symlink": tarfile.SYMTYPE,
+                "hardlink": tarfile.LNKTYPE,
+                "fifo": tarfile.FIFOTYPE,
+            }[kind]
+            info.mode = 0o755
+            if kind in ("symlink", "hardlink"):
+                info.linkname = value
+            tar.addfile(info)
+    data.seek(0)
+    return data
+
+
+@pytest.fixture
+def dest(tmp_path: Path) -> Path:
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside" / "secret").write_text("secret\n")
+    dest = tmp_path / "panel"
+    dest.mkdir()
+    return dest
+
+
+def test_extracts_files_links_and_manifest(dest: Path) -> None:
+    manifest: dict = {}
+    files = extract_tar_stream(
+        archive(
+            ("dir", "app", b""),
+            ("file", "app/index.php", b"<?php\n"),
+            ("symlink", "public/storage", "../app"),
+            ("hardlink", "app/copy.php", "app/index.php"),
+            ("fifo", "app/pipe", b""),
+        ),
+        dest,
+        manifest=manifest,
+    )
+
+    assert files == 1
+    assert (dest / "app" / "index.php").read_text() == "<?php\n"
+    assert (dest / "public" / "storage").resolve() == (dest / "app").resolve()
+    assert (dest / "app" / "copy.php").stat().st_ino == (dest / "app" / "index.php").stat().st_ino
+    assert not (dest / "app" / "pipe").exists()
+    assert manifest["app/copy.php"] == manifest["app/index.php"]
+    assert manifest["public/storage"] == (0, "symlink:../app")
+
+
+@pytest.mark.parametrize("name", ["../outside/evil", "/tmp/evil", "app/../../outside/evil"])
+def test_paths_outside_are_refused(dest: Path, name: str) -> None:
+    with pytest.raises(ArchiveError):
+        extract_tar_stream(archive(("file", name, b"x")), dest)
+    assert not (dest.parent / "outside" / "evil").exists()
+
+
+@pytest.mark.parametrize("target", ["../../outside", "/etc", "../app/../../outside"])
+def test_symlinks_out_of_the_tree_are_refused(dest: Path, target: str) -> None:
+    with pytest.raises(ArchiveError, match="symlink"):
+        extract_tar_stream(archive(("dir", "app", b""), ("symlink", "app/link", target)), dest)
+
+
+def test_nothing_is_written_through_a_symlink(dest: Path) -> None:
+    members = (
+        ("dir", "sub", b""),
+        ("symlink", "sub/up", ".."),
+        ("symlink", "sub/up/escape", "../outside"),
+    )
+    with pytest.raises(ArchiveError, match="through a symlink"):
+        extract_tar_stream(archive(*members), dest)
+
+    members = (("dir", "sub", b""), ("symlink", "alias", "sub"), ("file", "alias/file", b"x"))
+    with pytest.raises(ArchiveError, match="through a symlink"):
+        extract_tar_stream(archive(*members), dest)
+
+
+@pytest.mark.parametrize(
+    "members",
+    [
+        (("hardlink", "stolen", "../outside/secret"),),
+        (("hardlink", "stolen", str(Path("/etc/hostname"))),),
+        # Resolved through a symlink extracted earlier
+        (
+            ("dir", "sub", b""),
+            ("symlink", "s", "sub"),
+            ("hardlink", "stolen", "s/../../outside/secret"),
+        ),
+        # Hardlinks only ever point at regular files of the archive
+        (("dir", "sub", b""), ("hardlink", "stolen", "sub")),
+    ],
+)
+def test_hardlinks_out_of_the_tree_are_refused(dest: Path, members: tuple) -> None:
+    with pytest.raises(ArchiveError):
+        extract_tar_stream(archive(*members), dest)
+    assert not (dest / "stolen").exists()
+    assert (dest.parent / "outside" / "secret").stat().st_nlink == 1
@@ -0,0 +1,84 @@
+"""Content-addressed cache of release artifacts."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.cache import ArtifactCache
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ArtifactCache:
+    return ArtifactCache(root=tmp_path / "cache", max_size=300)
+
+
+def download(tmp_path: Path, content: bytes) -> tuple[Path, str]:
+    path = tmp_path / f"download-{hashlib.sha256(content).hexdigest()[:8]}"
+    path.write_bytes(content)
+    return path, hashlib.sha256(content).hexdigest()
+
+
+def objects(cache: ArtifactCache) -> set[str]:
+    return {path.name for path in (cache.root / "objects").iterdir()}
+
+
+def test_get_checks_digest_and_size(cache: ArtifactCache, tmp_path: Path) -> None:
+    path, digest = download(tmp_path, b"panel" * 10)
+    cached = cache.put("pelican-dev/panel@v1.0.0/panel.tar.gz", path)
+
+    assert cache.get("pelican-dev/panel@v1.0.0/panel.tar.gz", sha256=digest.upper()) == cached
+    assert cache.get("pelican-dev/panel@v1.0.0/panel.tar.gz", sha256="0" * 64) is None
+    cached.write_bytes(b"truncated")
+    assert cache.get("pelican-dev/panel@v1.0.0/panel.tar.gz") is None
+    assert (cache.hits, cache.misses, cache.bytes_saved) == (1, 2, 50)
+
+
+def test_index_survives_a_restart(cache: ArtifactCache, tmp_path: Path) -> None:
+    path, _ = download(tmp_path, b"wings" * 10)
+    cache.put("pelican-dev/wings@v1.0.0/wings_linux_amd64", path)
+
+    reopened = ArtifactCache(root=cache.root, max_size=cache.max_size)
+
+    assert reopened.get("pelican-dev/wings@v1.0.0/wings_linux_amd64") is not None
+
+
+def test_least_recently_used_entries_are_evicted(cache: ArtifactCache, tmp_path: Path) -> None:
+    for name in ("a", "b", "c"):
+        cache.put(name, download(tmp_path, name.encode() * 100)[0])
+        time.sleep(0.01)
+    # Using "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+
+    d, _ = download(tmp_path, b"d" * 100)
+    cache.put("d", d)
+
+    assert cache.get("b") is None
+    assert all(cache.get(name) is not None for name in ("a", "c", "d"))
+    assert len(objects(cache)) == 3
+
+
+def test_shared_objects_stay_while_referenced(cache: ArtifactCache, tmp_path: Path) -> None:
+    path, digest = download(tmp_path, b"same" * 50)
+    cache.put("panel@v1", path)
+    path, _ = download(tmp_path, b"same" * 50)
+    cache.put("panel@v1-rebuilt", path)
+
+    cache.put("panel@v1", download(tmp_path, b"other" * 10)[0])
+
+    assert digest in objects(cache)
+    assert cache.get("panel@v1-rebuilt", sha256=digest) is not None
+
+
+def test_replaced_object_is_removed(cache: ArtifactCache, tmp_path: Path) -> None:
+    path, old = download(tmp_path, b"old" * 50)
+    cache.put("wings@latest", path)
+    path, new = download(tmp_path, b"new" * 50)
+
+    cache.put("wings@latest", path)
+
+    assert objects(cache) == {new}
+    assert cache.get("wings@latest", sha256=new) is not None
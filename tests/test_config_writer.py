@@ -0,0 +1,52 @@
+"""Queued service actions of the config writer."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.config import ConfigWriter
+from pelican_installer.installers.dependencies import DependencyInstaller
+from pelican_installer.installers.fileops import FileOps
+from pelican_installer.installers.wings import WingsInstaller
+
+
+@pytest.fixture
+def state_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "pending-actions.json"
+    monkeypatch.setattr(ConfigWriter, "_shared", ConfigWriter(FileOps.shared(), path))
+    return path
+
+
+def test_installers_share_queued_actions(state_path: Path) -> None:
+    wings = WingsInstaller()
+    dependencies = DependencyInstaller()
+    assert wings.configs is dependencies.configs
+
+    wings.configs.queue("restart:wings")
+    dependencies.configs.queue("reload:nginx")
+
+    assert json.loads(state_path.read_text()) == ["restart:wings", "reload:nginx"]
+
+
+def test_flush_keeps_actions_queued_meanwhile(state_path: Path) -> None:
+    configs = ConfigWriter.shared()
+    configs.queue("daemon-reload", "reload:nginx")
+    commands: list[list[str]] = []
+
+    def run(command: list[str]) -> None:
+        commands.append(command)
+        if command == ["systemctl", "daemon-reload"]:
+            configs.queue("restart:wings")
+
+    configs.flush(run)
+
+    assert commands == [
+        ["systemctl", "daemon-reload"],
+        ["nginx", "-t"],
+        ["systemctl", "reload", "nginx"],
+    ]
+    assert configs.pending() == ["restart:wings"]
+    assert ConfigWriter(FileOps.shared(), state_path).pending() == ["restart:wings"]
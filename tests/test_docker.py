@@ -0,0 +1,26 @@
+"""Docker installation for Wings."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.dependencies import DependencyInstaller
+
+
+def test_docker_is_enabled_and_started_in_one_command(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    installer = DependencyInstaller()
+    commands: list[list[str]] = []
+    monkeypatch.setattr(installer, "DOWNLOAD_DIR", tmp_path)
+    monkeypatch.setattr(installer, "download", lambda url, dest: dest.touch())
+    monkeypatch.setattr(installer, "run_command", lambda cmd, **kwargs: commands.append(cmd))
+
+    installer._install_docker()
+
+    assert commands == [
+        ["sh", str(tmp_path / "get-docker.sh")],
+        ["systemctl", "enable", "--now", "docker"],
+    ]
@@ -0,0 +1,249 @@
+"""Downloader against a local HTTP server that supports ranges and drops connections."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils import download
+from pelican_installer.utils.download import DownloadError, Downloader
+
+BODY = os.urandom(1024 * 1024 + 123)
+DIGEST = hashlib.sha256(BODY).hexdigest()
+
+
+class FakeServer:
+    """Serves BODY with range support; can fail or cut off requests on demand."""
+
+    def __init__(self):
+        self.requests: list[tuple[str, str | None]] = []
+        self.failures = 0  # Next GET requests answered with 503
+        self.drops = 0  # Next GET requests cut off after drop_at bytes
+        self.drop_at = 300_000
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/pelican.tar.gz"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def ranges(self) -> list[str | None]:
+        """Range headers of the GET requests received so far."""
+        return [header for method, header in self.requests if method == "GET"]
+
+    def _take(self, counter: str) -> bool:
+        with self._lock:
+            if getattr(self, counter) > 0:
+                setattr(self, counter, getattr(self, counter) - 1)
+                return True
+            return False
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_HEAD(self):
+                server.requests.append(("HEAD", None))
+                self._send_headers(200, len(BODY))
+
+            def do_GET(self):
+                header = self.headers.get("Range")
+                server.requests.append(("GET", header))
+                if server._take("failures"):
+                    self._send_headers(503, 0)
+                    return
+
+                start, end = 0, len(BODY) - 1
+                if header:
+                    match = re.fullmatch(r"bytes=(\d+)-(\d*)", header)
+                    start = int(match.group(1))
+                    end = min(int(match.group(2) or end), end)
+                    if start >= len(BODY):
+                        self._send_headers(416, 0)
+                        return
+                payload = BODY[start:end + 1]
+                self._send_headers(206 if header else 200, len(payload), start, end)
+
+                if server._take("drops"):
+                    self.wfile.write(payload[:server.drop_at])
+                    self.wfile.flush()
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    self.close_connection = True
+                    return
+                self.wfile.write(payload)
+
+            def _send_headers(self, status, length, start=0, end=0):
+                self.send_response(status)
+                self.send_header("Content-Length", str(length))
+                self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(BODY)}")
+                self.end_headers()
+
+        return Handler
+
+
+@pytest.fixture
+def server():
+    server = FakeServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Backoff delays, recorded instead of slept; jitter pinned to its maximum."""
+    delays: list[float] = []
+    monkeypatch.setattr(download.time, "sleep", delays.append)
+    monkeypatch.setattr(download.random, "uniform", lambda low, high: high)
+    return delays
+
+
+def test_download_verifies_checksum(server: FakeServer, tmp_path: Path) -> None:
+    dest = tmp_path / "pelican.tar.gz"
+
+    result = Downloader().download(server.url, dest, checksum=DIGEST)
+
+    assert dest.read_bytes() == BODY
+    assert result.digest == DIGEST
+    assert result.size == len(BODY)
+    assert not result.resumed
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_dropped_connection_resumes_with_range(
+    server: FakeServer, tmp_path: Path, sleeps: list[float]
+) -> None:
+    server.drops = 1
+    dest = tmp_path / "pelican.tar.gz"
+
+    result = Downloader(retries=1).download(server.url, dest, checksum=DIGEST)
+
+    assert dest.read_bytes() == BODY
+    assert result.digest == DIGEST
+    received = int(server.ranges()[1].split("=")[1].rstrip("-"))
+    assert server.ranges()[0] is None
+    assert 0 < received <= server.drop_at
+    assert len(sleeps) == 1
+
+
+def test_partial_file_from_earlier_run_is_resumed(server: FakeServer, tmp_path: Path) -> None:
+    dest = tmp_path / "pelican.tar.gz"
+    url_hash = hashlib.sha256(server.url.encode()).hexdigest()[:12]
+    (tmp_path / f"pelican.tar.gz.{url_hash}.part").write_bytes(BODY[:500_000])
+
+    result = Downloader().download(server.url, dest, checksum=DIGEST)
+
+    assert server.ranges() == ["bytes=500000-"]
+    assert result.resumed
+    assert dest.read_bytes() == BODY
+
+
+def test_stale_partial_file_is_restarted(server: FakeServer, tmp_path: Path) -> None:
+    dest = tmp_path / "pelican.tar.gz"
+    url_hash = hashlib.sha256(server.url.encode()).hexdigest()[:12]
+    (tmp_path / f"pelican.tar.gz.{url_hash}.part").write_bytes(BODY + b"stale")
+
+    Downloader().download(server.url, dest, checksum=DIGEST)
+
+    assert server.ranges() == [f"bytes={len(BODY) + 5}-", None]
+    assert dest.read_bytes() == BODY
+
+
+def test_segmented_download_fetches_ranges_in_parallel(
+    server: FakeServer, tmp_path: Path, sleeps: list[float]
+) -> None:
+    server.drops = 1
+    server.drop_at = 100_000
+    dest = tmp_path / "pelican.tar.gz"
+    downloader = Downloader(segments=4, segment_min_size=1)
+
+    result = downloader.download(server.url, dest, checksum=DIGEST)
+
+    assert dest.read_bytes() == BODY
+    assert result.digest == DIGEST
+    # Four segment requests plus one resume of the segment that was cut off
+    ranges = server.ranges()
+    assert len(ranges) == 5
+    assert all(re.fullmatch(r"bytes=\d+-\d+", header) for header in ranges)
+    step = -(-len(BODY) // 4)
+    planned = {
+        f"bytes={start}-{min(start + step, len(BODY)) - 1}" for start in range(0, len(BODY), step)
+    }
+    assert planned <= set(ranges)
+    assert not any(path.suffix in (".part", ".json") for path in tmp_path.iterdir())
+
+
+def test_transient_errors_back_off_exponentially(
+    server: FakeServer, tmp_path: Path, sleeps: list[float]
+) -> None:
+    server.failures = 3
+    dest = tmp_path / "pelican.tar.gz"
+
+    Downloader(retries=3, backoff=0.5).download(server.url, dest, checksum=DIGEST)
+
+    assert sleeps == [0.5, 1.0, 2.0]
+    assert dest.read_bytes() == BODY
+
+
+def test_backoff_is_capped(server: FakeServer, tmp_path: Path, sleeps: list[float]) -> None:
+    server.failures = 4
+    dest = tmp_path / "pelican.tar.gz"
+
+    Downloader(retries=4, backoff=1.0, max_backoff=3.0).download(server.url, dest)
+
+    assert sleeps == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_persistent_errors_give_up(
+    server: FakeServer, tmp_path: Path, sleeps: list[float]
+) -> None:
+    server.failures = 10
+    dest = tmp_path / "pelican.tar.gz"
+
+    with pytest.raises(DownloadError, match="HTTP 503"):
+        Downloader(retries=2).download(server.url, dest)
+
+    assert len(sleeps) == 2
+    assert not dest.exists()
+
+
+def test_checksum_mismatch_discards_download(server: FakeServer, tmp_path: Path) -> None:
+    dest = tmp_path / "pelican.tar.gz"
+
+    with pytest.raises(DownloadError, match="Checksum mismatch"):
+        Downloader().download(server.url, dest, checksum="0" * 64)
+
+    assert not dest.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stream_reconnects_after_drop(
+    server: FakeServer, tmp_path: Path, sleeps: list[float]
+) -> None:
+    server.drops = 1
+    with open(tmp_path / "copy", "wb") as sink:
+        stream = Downloader().stream(server.url, sink=sink)
+        data = stream.read()
+        stream.close()
+
+    assert data == BODY
+    assert stream.hexdigest() == DIGEST
+    assert (tmp_path / "copy").read_bytes() == BODY
+    assert server.ranges()[1].startswith("bytes=")
@@ -0,0 +1,86 @@
+"""Batched file operations through the privileged helper."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.fileops import FileOperationError, FileOps
+
+
+@pytest.fixture
+def helper(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> tuple[FileOps, list[int]]:
+    """Unprivileged FileOps whose helper starts through a pass-through sudo."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    sudo = bin_dir / "sudo"
+    sudo.write_text('#!/bin/sh\nexec "$@"\n')
+    sudo.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    files = FileOps(privileged=False)
+    round_trips: list[int] = []
+    execute = files._execute
+
+    def counting_execute(operations):
+        round_trips.append(len(operations))
+        return execute(operations)
+
+    monkeypatch.setattr(files, "_execute", counting_execute)
+    yield files, round_trips
+    files.close()
+
+
+def test_batch_sends_operations_in_one_round_trip(tmp_path: Path, helper) -> None:
+    files, round_trips = helper
+    config = tmp_path / "etc" / "pelican"
+
+    with files.batch():
+        files.mkdir(config, mode=0o750)
+        files.write_file(config / "config.yml", "debug: false\n", mode=0o600)
+        with files.batch():
+            files.symlink(config / "config.yml", tmp_path / "config.yml")
+        files.touch(tmp_path / "stamp")
+        assert not config.exists()
+
+    assert round_trips == [4]
+    assert (tmp_path / "config.yml").read_text() == "debug: false\n"
+    assert (config / "config.yml").stat().st_mode & 0o777 == 0o600
+    assert (tmp_path / "stamp").exists()
+
+
+def test_operations_outside_a_batch_run_immediately(tmp_path: Path, helper) -> None:
+    files, round_trips = helper
+
+    files.write_file(tmp_path / "a", "a\n")
+    files.chmod(tmp_path / "a", 0o640)
+
+    assert round_trips == [1, 1]
+    assert (tmp_path / "a").stat().st_mode & 0o777 == 0o640
+
+
+def test_batches_are_per_thread(tmp_path: Path, helper) -> None:
+    files, round_trips = helper
+
+    with files.batch():
+        files.touch(tmp_path / "batched")
+        thread = threading.Thread(target=files.touch, args=(tmp_path / "other",))
+        thread.start()
+        thread.join()
+        assert (tmp_path / "other").exists()
+        assert not (tmp_path / "batched").exists()
+
+    assert sorted(round_trips) == [1, 1]
+
+
+def test_helper_errors_are_raised_and_helper_keeps_running(tmp_path: Path, helper) -> None:
+    files, _ = helper
+
+    with pytest.raises(FileOperationError, match="chmod"):
+        files.chmod(tmp_path / "missing", 0o644)
+
+    files.touch(tmp_path / "after")
+    assert (tmp_path / "after").exists()
@@ -0,0 +1,77 @@
+"""Resuming installations from the checkpoint journal."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.scheduler import InstallTask, TaskScheduler
+from pelican_installer.utils.journal import CheckpointJournal
+from pelican_installer.utils.state import InstallState
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "journal.json"
+
+
+def test_completed_steps_survive_a_restart(path: Path) -> None:
+    CheckpointJournal("settings", path).mark_done("deps.packages")
+
+    journal = CheckpointJournal("settings", path)
+
+    assert journal.is_done("deps.packages")
+    assert journal.completed() == {"deps.packages"}
+
+
+def test_changed_settings_start_over(path: Path) -> None:
+    state = InstallState()
+    state.component = "panel"
+    state.domain = "panel.example.com"
+    CheckpointJournal(state.fingerprint(), path).mark_done("panel.ssl")
+
+    state.domain = "other.example.com"
+    journal = CheckpointJournal(state.fingerprint(), path)
+
+    assert journal.completed() == set()
+    journal.mark_done("deps.packages")
+    assert CheckpointJournal(state.fingerprint(), path).completed() == {"deps.packages"}
+
+
+def test_clear_and_unreadable_journal(path: Path) -> None:
+    journal = CheckpointJournal("settings", path)
+    journal.mark_done("deps.packages")
+    journal.clear()
+
+    assert not path.exists()
+    path.write_text("{not json")
+    assert CheckpointJournal("settings", path).completed() == set()
+
+
+def test_scheduler_resumes_after_failed_step(path: Path) -> None:
+    ran: list[str] = []
+    fail = True
+
+    def composer() -> None:
+        if fail:
+            raise RuntimeError("network down")
+        ran.append("panel.composer")
+
+    def download() -> None:
+        ran.append("panel.download")
+
+    tasks = [
+        InstallTask(name="panel.download", label="Download", run=download),
+        InstallTask(
+            name="panel.composer", label="Composer", run=composer, after=("panel.download",)
+        ),
+    ]
+    with pytest.raises(RuntimeError):
+        TaskScheduler(tasks, journal=CheckpointJournal("settings", path)).run()
+
+    fail = False
+    TaskScheduler(tasks, journal=CheckpointJournal("settings", path)).run()
+
+    assert ran == ["panel.download", "panel.composer"]
+    assert CheckpointJournal("settings", path).completed() == {"panel.download", "panel.composer"}
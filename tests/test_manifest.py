@@ -0,0 +1,102 @@
+"""Incremental updates of an installed tree from release manifests."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.archive import extract_tar_stream
+from pelican_installer.utils.manifest import apply_update, load_manifest, save_manifest
+
+V1 = {
+    "app/Kernel.php": b"<?php // kernel v1\n",
+    "app/Legacy/Old.php": b"<?php // removed in v2\n",
+    "public/index.php": b"<?php // index\n",
+}
+V2 = {
+    "app/Kernel.php": b"<?php // kernel v2\n",
+    "app/New.php": b"<?php // added in v2\n",
+    "public/index.php": b"<?php // index\n",
+    "storage/app/.gitignore": b"*\n",
+}
+
+
+def extract(files: dict[str, bytes], dest: Path) -> dict:
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    data.seek(0)
+    dest.mkdir(parents=True, exist_ok=True)
+    manifest: dict = {}
+    extract_tar_stream(data, dest, manifest=manifest)
+    return manifest
+
+
+@pytest.fixture
+def installed(tmp_path: Path) -> tuple[Path, dict]:
+    dest = tmp_path / "panel"
+    manifest = extract(V1, dest)
+    (dest / "storage" / "app").mkdir(parents=True)
+    (dest / "storage" / "app" / "avatar.png").write_bytes(b"user upload")
+    return dest, manifest
+
+
+def test_update_adds_changes_and_removes(tmp_path: Path, installed: tuple[Path, dict]) -> None:
+    dest, old = installed
+    new = extract(V2, tmp_path / "staging")
+    untouched = (dest / "public" / "index.php").stat().st_ino
+
+    result = apply_update(tmp_path / "staging", dest, new, old, protected=("storage",))
+
+    assert result.added == ["app/New.php"]
+    assert result.changed == ["app/Kernel.php"]
+    assert result.removed == ["app/Legacy/Old.php"]
+    assert result.unchanged == 1
+    assert (dest / "app" / "Kernel.php").read_bytes() == V2["app/Kernel.php"]
+    assert not (dest / "app" / "Legacy").exists()
+    assert (dest / "public" / "index.php").stat().st_ino == untouched
+    # Protected paths are never written
+    assert not (dest / "storage" / "app" / ".gitignore").exists()
+    assert (dest / "storage" / "app" / "avatar.png").exists()
+
+
+def test_update_without_old_manifest_hashes_and_keeps_files(
+    tmp_path: Path, installed: tuple[Path, dict]
+) -> None:
+    dest, _ = installed
+    new = extract(V2, tmp_path / "staging")
+
+    result = apply_update(tmp_path / "staging", dest, new, None, protected=("storage",))
+
+    assert result.changed == ["app/Kernel.php"]
+    assert result.added == ["app/New.php"]
+    assert result.removed == []
+    assert result.unchanged == 1
+    assert (dest / "app" / "Legacy" / "Old.php").exists()
+
+
+def test_locally_modified_file_is_replaced(tmp_path: Path, installed: tuple[Path, dict]) -> None:
+    dest, old = installed
+    (dest / "public" / "index.php").write_bytes(b"<?php // edited by hand, longer\n")
+    new = extract(V1, tmp_path / "staging")
+
+    result = apply_update(tmp_path / "staging", dest, new, old)
+
+    assert result.changed == ["public/index.php"]
+    assert (dest / "public" / "index.php").read_bytes() == V1["public/index.php"]
+
+
+def test_manifest_round_trip(tmp_path: Path, installed: tuple[Path, dict]) -> None:
+    _, manifest = installed
+    path = tmp_path / "manifest.json"
+
+    save_manifest(path, manifest)
+
+    assert load_manifest(path) == manifest
+    assert load_manifest(tmp_path / "missing.json") is None
@@ -0,0 +1,92 @@
+"""Parsing of the dpkg status database."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.packages import PackageIndex
+
+STATUS = """\
+Package: nginx
+Status: install ok installed
+Priority: optional
+Architecture: amd64
+Version: 1.24.0-2ubuntu7
+Description: small, powerful, scalable web/proxy server
+ Nginx ("engine X") is a high-performance web and reverse proxy server.
+ .
+ Package: not-a-package
+Conffiles:
+ /etc/nginx/nginx.conf 0123456789abcdef
+
+Package: php8.3-fpm
+Status: install ok half-installed
+Architecture: amd64
+Version: 8.3.6-0ubuntu0.24.04.1
+
+Package: apache2
+Status: deinstall ok config-files
+Architecture: amd64
+Version: 2.4.58-1ubuntu8
+
+Package: redis-server
+Status: deinstall ok installed
+Architecture: all
+Version: 5:7.0.15-1build2
+
+Package: curl
+Status: install ok unpacked
+Version: 8.5.0-2ubuntu10
+"""
+
+
+@pytest.fixture
+def status(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "status"
+    path.write_text(STATUS)
+    monkeypatch.setattr(PackageIndex, "STATUS_FILE", path)
+    PackageIndex.invalidate()
+    yield path
+    PackageIndex.invalidate()
+
+
+def test_only_installed_stanzas_count(status: Path) -> None:
+    assert PackageIndex.is_installed("nginx")
+    # Selected for removal, but still on disk
+    assert PackageIndex.is_installed("redis-server")
+    assert not PackageIndex.is_installed("php8.3-fpm")
+    assert not PackageIndex.is_installed("apache2")
+    assert not PackageIndex.is_installed("curl")
+    assert not PackageIndex.is_installed("not-a-package")
+
+
+def test_versions_and_architecture_qualified_names(status: Path) -> None:
+    assert PackageIndex.version("nginx") == "1.24.0-2ubuntu7"
+    assert PackageIndex.version("nginx:amd64") == "1.24.0-2ubuntu7"
+    assert PackageIndex.version("redis-server:all") == "5:7.0.15-1build2"
+    assert PackageIndex.version("php8.3-fpm") is None
+
+
+def test_missing_keeps_order(status: Path) -> None:
+    assert PackageIndex.missing(["curl", "nginx", "php8.3-fpm"]) == ["curl", "php8.3-fpm"]
+
+
+def test_reloads_when_status_file_changes(status: Path) -> None:
+    assert not PackageIndex.is_installed("git")
+
+    status.write_text(STATUS + "\nPackage: git\nStatus: install ok installed\nVersion: 1:2.43.0\n")
+    os.utime(status, ns=(0, 0))
+
+    assert PackageIndex.version("git") == "1:2.43.0"
+
+
+def test_missing_status_file_means_nothing_installed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(PackageIndex, "STATUS_FILE", tmp_path / "absent")
+    PackageIndex.invalidate()
+
+    assert PackageIndex.missing(["nginx"]) == ["nginx"]
@@ -0,0 +1,53 @@
+"""The panel's PHP-FPM pool and OPcache preloading."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.config import ConfigWriter
+from pelican_installer.installers.fileops import FileOps
+from pelican_installer.installers.panel import PanelInstaller
+
+
+@pytest.fixture
+def panel(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> PanelInstaller:
+    pool_dir = tmp_path / "pool.d"
+    pool_dir.mkdir()
+    (pool_dir / "www.conf").write_text("[www]\nlisten = /run/php/php8.3-fpm.sock\n")
+    panel_dir = tmp_path / "panel"
+    (panel_dir / "vendor" / "composer").mkdir(parents=True)
+    (panel_dir / "vendor" / "composer" / "autoload_classmap.php").write_text("<?php return [];\n")
+
+    monkeypatch.setattr(PanelInstaller, "PHP_FPM_POOL", pool_dir / "pelican.conf")
+    monkeypatch.setattr(PanelInstaller, "PHP_FPM_DISTRO_POOL", pool_dir / "www.conf")
+    monkeypatch.setattr(PanelInstaller, "PANEL_DIR", panel_dir)
+    monkeypatch.setattr(PanelInstaller, "OPCACHE_PRELOAD", tmp_path / "preload.php")
+    monkeypatch.setattr(
+        ConfigWriter, "_shared", ConfigWriter(FileOps.shared(), tmp_path / "pending.json")
+    )
+    return PanelInstaller()
+
+
+def test_distro_pool_is_disabled(panel: PanelInstaller) -> None:
+    distro_pool = panel.PHP_FPM_DISTRO_POOL
+    assert not panel._is_fpm_configured("nginx")
+    assert "opcache.preload" not in panel._opcache_config("nginx")
+
+    panel._configure_fpm("nginx")
+
+    assert not distro_pool.exists()
+    assert distro_pool.with_name("www.conf.disabled").read_text().startswith("[www]")
+    assert panel._is_fpm_configured("nginx")
+    assert "reload:php8.3-fpm" in panel.configs.pending()
+    assert f"opcache.preload = {panel.OPCACHE_PRELOAD}" in panel._opcache_config("nginx")
+
+
+def test_other_pools_keep_preloading_off(panel: PanelInstaller) -> None:
+    (panel.PHP_FPM_POOL.parent / "shop.conf").write_text("[shop]\n")
+
+    panel._configure_fpm("nginx")
+
+    assert (panel.PHP_FPM_POOL.parent / "shop.conf").exists()
+    assert "opcache.preload" not in panel._opcache_config("nginx")
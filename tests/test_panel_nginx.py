@@ -0,0 +1,52 @@
+"""HTTP/3 advertisement in the panel's Nginx site."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from pelican_installer.installers.panel import PanelInstaller
+from pelican_installer.utils.state import InstallState
+
+
+def locations(config: str) -> dict[str, str]:
+    """Bodies of the site's location blocks, by their match."""
+    return dict(re.findall(r"\n    location ([^{]+?) \{(.*?)\n    \}", config, re.DOTALL))
+
+
+def performance_state(runtime: str = "php-fpm") -> InstallState:
+    state = InstallState()
+    state.component = "panel"
+    state.webserver = "nginx"
+    state.runtime = runtime
+    state.protocol = "https"
+    state.profile = "performance"
+    state.microcache = True
+    state.domain = "panel.example.com"
+    return state
+
+
+@pytest.fixture
+def panel(monkeypatch: pytest.MonkeyPatch) -> PanelInstaller:
+    panel = PanelInstaller()
+    monkeypatch.setattr(panel, "_nginx_has_http3", lambda: True)
+    return panel
+
+
+@pytest.mark.parametrize("runtime", ["php-fpm", "frankenphp"])
+def test_locations_with_own_headers_advertise_http3(panel: PanelInstaller, runtime: str) -> None:
+    blocks = locations(panel._nginx_config(performance_state(runtime)))
+
+    with_headers = {match: body for match, body in blocks.items() if "add_header" in body}
+    assert "^~ /build/assets/" in with_headers
+    for match, body in with_headers.items():
+        assert f"add_header Alt-Svc '{panel.ALT_SVC}' always;" in body, match
+
+
+def test_no_advertisement_without_http3(
+    panel: PanelInstaller, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(panel, "_nginx_has_http3", lambda: False)
+
+    assert "Alt-Svc" not in panel._nginx_config(performance_state())
@@ -0,0 +1,59 @@
+"""Detection of a Certbot certificate installed into the webserver config."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.panel import PanelInstaller
+from pelican_installer.utils.state import InstallState
+
+
+@pytest.fixture
+def panel(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> PanelInstaller:
+    live = tmp_path / "letsencrypt" / "live"
+    (live / "panel.example.com").mkdir(parents=True)
+    (live / "panel.example.com" / "fullchain.pem").write_text("certificate\n")
+    monkeypatch.setattr(PanelInstaller, "LETSENCRYPT_LIVE", live)
+    monkeypatch.setattr(PanelInstaller, "NGINX_CONFIG", tmp_path / "nginx-pelican.conf")
+    monkeypatch.setattr(PanelInstaller, "APACHE_CONFIG", tmp_path / "pelican.conf")
+    monkeypatch.setattr(PanelInstaller, "APACHE_SSL_CONFIG", tmp_path / "pelican-le-ssl.conf")
+    return PanelInstaller()
+
+
+def https_state(webserver: str) -> InstallState:
+    state = InstallState()
+    state.webserver = webserver
+    state.protocol = "https"
+    state.domain = "panel.example.com"
+    return state
+
+
+def ssl_directives(panel: PanelInstaller) -> str:
+    return f"SSLCertificateFile {panel.LETSENCRYPT_LIVE}/panel.example.com/fullchain.pem\n"
+
+
+def test_apache_certificate_is_found_in_le_ssl_vhost(panel: PanelInstaller) -> None:
+    state = https_state("apache")
+    panel.APACHE_CONFIG.write_text("<VirtualHost *:80>\n</VirtualHost>\n")
+    assert not panel._is_ssl_configured(state)
+
+    panel.APACHE_SSL_CONFIG.write_text(ssl_directives(panel))
+
+    assert panel._is_ssl_configured(state)
+
+
+def test_nginx_certificate_is_found_in_site(panel: PanelInstaller) -> None:
+    state = https_state("nginx")
+    panel.NGINX_CONFIG.write_text(ssl_directives(panel))
+
+    assert panel._is_ssl_configured(state)
+
+
+def test_missing_certificate_reruns_certbot(panel: PanelInstaller) -> None:
+    state = https_state("nginx")
+    state.domain = "other.example.com"
+    panel.NGINX_CONFIG.write_text(ssl_directives(panel))
+
+    assert not panel._is_ssl_configured(state)
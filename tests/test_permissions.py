@@ -0,0 +1,65 @@
+"""Fixing owners and modes of an installed tree."""
+
+from __future__ import annotations
+
+import os
+import pwd
+import stat
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.permissions import PermissionFixer
+
+
+@pytest.fixture
+def panel(tmp_path: Path) -> Path:
+    root = tmp_path / "panel"
+    for directory in ("app", "storage/logs", "bootstrap/cache", "vendor/a/b/c"):
+        (root / directory).mkdir(parents=True)
+    (root / "app" / "Kernel.php").write_text("<?php\n")
+    (root / "storage" / "logs" / "laravel.log").write_text("")
+    (root / "vendor" / "a" / "b" / "c" / "deep.php").write_text("<?php\n")
+    (root / "public").symlink_to("app")
+    logs = root / "storage" / "logs"
+    for path in (root / "storage", logs, logs / "laravel.log"):
+        path.chmod(0o700)
+    return root
+
+
+def mode(path: Path) -> int:
+    return stat.S_IMODE(path.lstat().st_mode)
+
+
+def test_modes_apply_to_subtrees_only(panel: Path) -> None:
+    fixer = PermissionFixer(
+        os.getuid(), os.getgid(), modes={panel / "storage": 0o775, panel / "bootstrap/cache": 0o775}
+    )
+
+    changed = fixer.fix(panel)
+
+    assert changed == 4
+    assert mode(panel / "storage" / "logs" / "laravel.log") == 0o775
+    assert mode(panel / "bootstrap" / "cache") == 0o775
+    assert mode(panel / "app" / "Kernel.php") == 0o644
+    assert fixer.fix(panel) == 0
+
+
+def test_symlinks_are_not_followed(panel: Path) -> None:
+    PermissionFixer(os.getuid(), os.getgid(), modes={panel / "public": 0o700}).fix(panel)
+
+    assert mode(panel / "app") == 0o755
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="changing owners needs root")
+def test_every_entry_gets_the_owner(panel: Path) -> None:
+    user = pwd.getpwnam("nobody")
+    (panel / "app" / "Kernel.php").chmod(0o640)
+
+    changed = PermissionFixer(user.pw_uid, user.pw_gid, max_workers=2).fix(panel)
+
+    entries = [panel, *panel.rglob("*")]
+    assert changed == len(entries)
+    assert {(p.lstat().st_uid, p.lstat().st_gid) for p in entries} == {(user.pw_uid, user.pw_gid)}
+    # Without a mode for its subtree, an entry keeps its mode
+    assert mode(panel / "app" / "Kernel.php") == 0o640
@@ -0,0 +1,74 @@
+"""Precompression of static assets."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.precompress import Precompressor
+
+
+@pytest.fixture
+def public(tmp_path: Path) -> Path:
+    root = tmp_path / "public"
+    (root / "css").mkdir(parents=True)
+    (root / "css" / "app.css").write_text("body { color: #123456; }\n" * 200)
+    # Random bytes never compress
+    (root / "app.js").write_bytes(os.urandom(4096))
+    return root
+
+
+@pytest.fixture
+def precompressor(tmp_path: Path) -> Precompressor:
+    return Precompressor(max_workers=1, state_path=tmp_path / "precompress-skipped.json")
+
+
+def test_incompressible_asset_counts_as_done(public: Path, precompressor: Precompressor) -> None:
+    assert precompressor.pending(public) == 2
+
+    result = precompressor.run(public)
+
+    assert result.written == len(precompressor.encodings)
+    assert (public / "css" / "app.css.gz").exists()
+    assert not any(public.glob("app.js.*"))
+    assert precompressor.pending(public) == 0
+    assert precompressor.run(public).written == 0
+
+
+def test_changed_asset_is_compressed_again(public: Path, precompressor: Precompressor) -> None:
+    precompressor.run(public)
+    asset = public / "app.js"
+    asset.write_text("console.log('pelican');\n" * 200)
+
+    assert precompressor.pending(public) == 1
+    precompressor.run(public)
+
+    assert (public / "app.js.gz").exists()
+    assert precompressor.pending(public) == 0
+    assert not precompressor.state_path.exists()
+
+
+def test_outdated_sibling_that_no_longer_shrinks_is_removed(
+    public: Path, precompressor: Precompressor
+) -> None:
+    sibling = public / "app.js.gz"
+    sibling.write_bytes(b"old")
+    os.utime(sibling, ns=(0, 0))
+
+    precompressor.run(public)
+
+    assert not sibling.exists()
+    assert precompressor.pending(public) == 0
+
+
+def test_removed_asset_is_forgotten(public: Path, precompressor: Precompressor) -> None:
+    precompressor.run(public)
+    assert str(public / "app.js") in json.loads(precompressor.state_path.read_text())
+
+    (public / "app.js").unlink()
+    precompressor.run(public)
+
+    assert not precompressor.state_path.exists()
@@ -0,0 +1,102 @@
+"""Command execution with bounded concurrency and bounded output."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.installers.process import READ_CHUNK_SIZE, AsyncCommandRunner
+
+
+def logged_sleep(log: Path) -> list[str]:
+    """Command that logs its start and end around a short sleep."""
+    return ["sh", "-c", f"echo start >> {log}; sleep 0.2; echo end >> {log}"]
+
+
+def peak_overlap(log: Path) -> int:
+    running = peak = 0
+    for line in log.read_text().split():
+        running += 1 if line == "start" else -1
+        peak = max(peak, running)
+    return peak
+
+
+def test_concurrency_is_limited(tmp_path: Path) -> None:
+    log = tmp_path / "log"
+    runner = AsyncCommandRunner(max_concurrency=2)
+
+    async def run_all() -> None:
+        await asyncio.gather(*(runner.run(logged_sleep(log)) for _ in range(5)))
+
+    runner.run_sync(run_all())
+
+    assert peak_overlap(log) == 2
+
+
+def test_threads_share_the_limit_of_a_loop(tmp_path: Path) -> None:
+    log = tmp_path / "log"
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    runner = AsyncCommandRunner(max_concurrency=2, loop=loop)
+    try:
+        # Scheduler tasks call run_sync from their own threads
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(
+                pool.map(lambda _: runner.run_sync(runner.run(logged_sleep(log))), range(5))
+            )
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    assert [result.returncode for result in results] == [0] * 5
+    assert peak_overlap(log) == 2
+
+
+def test_streamed_output_keeps_only_the_tail() -> None:
+    lines: list[str] = []
+    runner = AsyncCommandRunner()
+    script = "for i in range(1000): print(f'line {i}')"
+
+    command = [sys.executable, "-c", script]
+
+    result = runner.run_sync(
+        runner.run(command, stream=True, line_sink=lines.append, tail_lines=10)
+    )
+
+    assert len(lines) == 1000
+    assert result.stdout == "\n".join(f"line {i}" for i in range(990, 1000))
+
+
+def test_streamed_output_keeps_last_progress_frame_and_splits_long_lines() -> None:
+    runner = AsyncCommandRunner()
+    script = (
+        "import sys\n"
+        "sys.stdout.write('10%\\r50%\\r100%\\n')\n"
+        f"sys.stdout.write('x' * {READ_CHUNK_SIZE + 10})\n"
+    )
+
+    result = runner.run_sync(runner.run([sys.executable, "-c", script], stream=True))
+
+    first, *rest = result.stdout.split("\n")
+    assert first == "100%"
+    assert len("".join(rest)) == READ_CHUNK_SIZE + 10
+    assert all(len(line) <= READ_CHUNK_SIZE for line in rest)
+
+
+def test_failure_reports_output_tail() -> None:
+    runner = AsyncCommandRunner()
+    script = "import sys\nprint('E: Unable to locate package nope')\nsys.exit(100)"
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        runner.run_sync(runner.run([sys.executable, "-c", script], stream=True))
+
+    assert error.value.returncode == 100
+    assert error.value.output == "E: Unable to locate package nope"
@@ -0,0 +1,56 @@
+"""Caching of GitHub release lookups."""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from pelican_installer.utils import releases
+
+RESPONSE = {
+    "tag_name": "v1.2.0",
+    "assets": [
+        {
+            "name": "panel.tar.gz",
+            "browser_download_url": "https://example.invalid/panel.tar.gz",
+            "digest": "sha256:" + "ab" * 32,
+        }
+    ],
+}
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> list[bool]:
+    """Fake GitHub API; each list entry is whether that request fails."""
+    outcomes: list[bool] = []
+
+    def urlopen(request, timeout):
+        if outcomes.pop(0):
+            raise OSError("connection reset")
+        return io.BytesIO(json.dumps(RESPONSE).encode())
+
+    monkeypatch.setattr(releases.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(releases, "_releases", {})
+    return outcomes
+
+
+def test_failed_lookup_is_retried(api: list[bool]) -> None:
+    api.extend([True, False])
+
+    assert releases.latest_release("pelican-dev/panel") is None
+    release = releases.latest_release("pelican-dev/panel")
+
+    assert release.tag == "v1.2.0"
+    assert release.assets["panel.tar.gz"].sha256 == "ab" * 32
+    assert api == []
+
+
+def test_successful_lookup_is_cached(api: list[bool]) -> None:
+    api.append(False)
+
+    first = releases.latest_release("pelican-dev/panel")
+
+    assert releases.latest_release("pelican-dev/panel") is first
+    assert releases.latest_release_tag("pelican-dev/panel") == "v1.2.0"
@@ -0,0 +1,147 @@
+"""Dependency and resource aware scheduling of installer tasks."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pelican_installer.installers.scheduler import (
+    APT_LOCK,
+    NETWORK,
+    InstallTask,
+    TaskScheduler,
+    report_progress,
+)
+
+
+class Recorder:
+    """Tasks that log when they start and finish."""
+
+    def __init__(self):
+        self.events: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def task(self, name: str, *after: str, duration: float = 0.05, **kwargs) -> InstallTask:
+        def run() -> None:
+            self._log("start", name)
+            time.sleep(duration)
+            self._log("end", name)
+
+        return InstallTask(name=name, label=name, run=run, after=after, **kwargs)
+
+    def _log(self, event: str, name: str) -> None:
+        with self._lock:
+            self.events.append((event, name))
+
+    def index(self, event: str, name: str) -> int:
+        return self.events.index((event, name))
+
+    def ran(self) -> set[str]:
+        return {name for event, name in self.events if event == "end"}
+
+    def peak(self, names: set[str]) -> int:
+        """Most tasks of names running at the same time."""
+        running = peak = 0
+        for event, name in self.events:
+            if name in names:
+                running += 1 if event == "start" else -1
+                peak = max(peak, running)
+        return peak
+
+
+def test_dependencies_run_first_and_independent_tasks_overlap() -> None:
+    recorder = Recorder()
+    tasks = [
+        recorder.task("deps.packages"),
+        recorder.task("panel.download"),
+        recorder.task("panel.composer", "deps.packages", "panel.download"),
+    ]
+
+    TaskScheduler(tasks).run()
+
+    assert recorder.peak({"deps.packages", "panel.download"}) == 2
+    for dep in ("deps.packages", "panel.download"):
+        assert recorder.index("end", dep) < recorder.index("start", "panel.composer")
+
+
+def test_dependencies_outside_the_schedule_count_as_done() -> None:
+    recorder = Recorder()
+
+    TaskScheduler([recorder.task("wings.docker", "deps.docker")]).run()
+
+    assert recorder.ran() == {"wings.docker"}
+
+
+def test_cycles_and_duplicates_are_rejected() -> None:
+    recorder = Recorder()
+    with pytest.raises(ValueError, match="cycle"):
+        TaskScheduler([recorder.task("a", "c"), recorder.task("b", "a"), recorder.task("c", "b")])
+    with pytest.raises(ValueError, match="Duplicate"):
+        TaskScheduler([recorder.task("a"), recorder.task("a")])
+
+
+def test_resource_limits_exclude_tasks() -> None:
+    recorder = Recorder()
+    apt = {f"apt{i}" for i in range(3)}
+    network = {f"net{i}" for i in range(5)}
+    tasks = [recorder.task(name, resources=frozenset({APT_LOCK})) for name in sorted(apt)]
+    tasks += [recorder.task(name, resources=frozenset({NETWORK})) for name in sorted(network)]
+
+    TaskScheduler(tasks, max_workers=8, resource_limits={APT_LOCK: 1, NETWORK: 2}).run()
+
+    assert recorder.peak(apt) == 1
+    assert recorder.peak(network) == 2
+    assert recorder.ran() == apt | network
+
+
+def test_failure_stops_dependents_and_waits_for_running_tasks() -> None:
+    recorder = Recorder()
+
+    def fail() -> None:
+        raise RuntimeError("composer failed")
+
+    tasks = [
+        InstallTask(name="panel.composer", label="Composer", run=fail),
+        recorder.task("panel.download", duration=0.2),
+        recorder.task("panel.optimize", "panel.composer"),
+    ]
+
+    with pytest.raises(RuntimeError, match="composer failed"):
+        TaskScheduler(tasks).run()
+
+    assert recorder.ran() == {"panel.download"}
+
+
+def test_converge_skips_satisfied_tasks_unless_upstream_ran() -> None:
+    recorder = Recorder()
+    tasks = [
+        recorder.task("panel.download", satisfied=lambda: False),
+        recorder.task("panel.composer", "panel.download", satisfied=lambda: True),
+        recorder.task("panel.fpm", satisfied=lambda: True),
+    ]
+    scheduler = TaskScheduler(tasks, converge=True)
+
+    scheduler.run()
+
+    assert recorder.ran() == {"panel.download", "panel.composer"}
+    assert scheduler.skipped == ["panel.fpm"]
+
+
+def test_reported_progress_reaches_on_update() -> None:
+    updates: list[tuple[int, list[str]]] = []
+
+    def run() -> None:
+        report_progress(0.5, "12 MB of 24 MB")
+
+    scheduler = TaskScheduler(
+        [InstallTask(name="wings.download", label="Downloading", run=run)],
+        on_update=lambda progress, active: updates.append(
+            (progress, [task.label for task in active])
+        ),
+    )
+    scheduler.run()
+
+    assert (50, ["Downloading (12 MB of 24 MB)"]) in updates
+    assert updates[-1] == (100, [])
@@ -0,0 +1,38 @@
+"""Detection of packages apt can install."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.system import SystemDetector
+
+POLICIES = {
+    "redis-server": "redis-server:\n  Installed: (none)\n  Candidate: 5:7.0.15-1build2\n",
+    # Known from an old list, but no source provides it
+    "valkey-server": "valkey-server:\n  Installed: (none)\n  Candidate: (none)\n",
+}
+
+
+@pytest.fixture(autouse=True)
+def apt_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """apt-cache stand-in answering policy queries from POLICIES."""
+    for package, policy in POLICIES.items():
+        (tmp_path / package).write_text(policy)
+    script = tmp_path / "bin" / "apt-cache"
+    script.parent.mkdir()
+    # Unknown packages print nothing, like apt-cache policy does
+    script.write_text(f'#!/bin/sh\ncat "{tmp_path}/$2" 2>/dev/null\nexit 0\n')
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+
+
+def test_package_with_candidate_is_available() -> None:
+    assert SystemDetector.is_package_available("redis-server")
+
+
+@pytest.mark.parametrize("package", ["valkey-server", "keydb-server"])
+def test_package_without_candidate_is_unavailable(package: str) -> None:
+    assert not SystemDetector.is_package_available(package)
@@ -0,0 +1,61 @@
+"""Snapshots of Composer vendor directories."""
+
+from __future__ import annotations
+
+import os
+import pwd
+from pathlib import Path
+
+import pytest
+
+from pelican_installer.utils.vendor import VendorCache
+
+
+@pytest.fixture
+def vendor(tmp_path: Path) -> Path:
+    vendor_dir = tmp_path / "panel" / "vendor"
+    (vendor_dir / "composer").mkdir(parents=True)
+    (vendor_dir / "autoload.php").write_text("<?php // autoload\n")
+    (vendor_dir / "composer" / "autoload_classmap.php").write_text("<?php return [];\n")
+    (vendor_dir / "bin").mkdir()
+    (vendor_dir / "bin" / "artisan").symlink_to("../composer/autoload_classmap.php")
+    (vendor_dir / ".installed").write_text("lock-hash\n")
+    return vendor_dir
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> VendorCache:
+    return VendorCache(root=tmp_path / "cache")
+
+
+def test_restore_copies_snapshot_without_sharing_inodes(vendor: Path, cache: VendorCache) -> None:
+    key = cache.key("lock-hash", "8.3")
+    cache.save(key, vendor, exclude=(".installed",))
+    (vendor / "autoload.php").write_text("<?php // changed\n")
+
+    assert cache.restore(key, vendor, exclude=(".installed",))
+
+    assert (vendor / "autoload.php").read_text() == "<?php // autoload\n"
+    assert not (vendor / ".installed").exists()
+    assert os.readlink(vendor / "bin" / "artisan") == "../composer/autoload_classmap.php"
+    snapshot = cache.root / key / "autoload.php"
+    assert snapshot.stat().st_ino != (vendor / "autoload.php").stat().st_ino
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="changing owners needs root")
+def test_restore_hands_tree_to_owner(vendor: Path, cache: VendorCache) -> None:
+    user = pwd.getpwnam("nobody")
+    key = cache.key("lock-hash", "8.3")
+    cache.save(key, vendor)
+
+    cache.restore(key, vendor, owner="nobody")
+
+    paths = [vendor, *vendor.rglob("*")]
+    assert {(p.lstat().st_uid, p.lstat().st_gid) for p in paths} == {(user.pw_uid, user.pw_gid)}
+    # The snapshot itself stays with its owner
+    assert (cache.root / key / "composer").stat().st_uid == os.geteuid()
+
+
+def test_restore_without_snapshot(vendor: Path, cache: VendorCache) -> None:
+    assert not cache.restore(cache.key("other", "8.3"), vendor)
+    assert (vendor / "autoload.php").exists()